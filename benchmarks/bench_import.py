@@ -0,0 +1,57 @@
+"""
+Measure the time of ``import xrfit`` in fresh interpreters.
+
+Run with ``python benchmarks/bench_import.py [repeat]``, which prints the best
+and median time of ``repeat`` imports, and the modules importing xrfit loads
+that take longest according to ``python -X importtime``.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parents[1] / "src"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC), *sys.path])}
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, env=env
+    )
+
+
+def import_time() -> float:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import xrfit\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    return float(_run("-c", code).stdout)
+
+
+def slowest_modules(n: int = 10) -> list:
+    """Find the `n` modules with the largest cumulative import time, in µs."""
+    times = []
+    for line in _run("-X", "importtime", "-c", "import xrfit").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append((int(cumulative), name.strip()))
+    return sorted(times, reverse=True)[:n]
+
+
+def main(repeat: int = 5) -> None:
+    times = [import_time() for _ in range(repeat)]
+    print(
+        f"import xrfit : best {min(times):.3f} s, "
+        f"median {statistics.median(times):.3f} s of {repeat}"
+    )
+    for cumulative, name in slowest_modules():
+        print(f"{name:>40} : {cumulative / 1e6:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
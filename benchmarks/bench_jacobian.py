@@ -0,0 +1,78 @@
+"""
+Compare fits of a map with analytic and finite difference Jacobians.
+
+Run with ``python benchmarks/bench_jacobian.py [size]``, which fits a map of
+``size x size`` pixels of four Voigt peaks on a linear background.
+"""
+
+import sys
+import time
+
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+import xrfit  # noqa: F401
+
+
+def voigt_map(size: int, n_peaks: int = 4, n_points: int = 1000) -> tuple:
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, n_points)
+    model = lf.models.LinearModel()
+    for i in range(n_peaks):
+        model = model + lf.models.VoigtModel(prefix=f"p{i}")
+    params = model.make_params(slope=0.0, intercept=0.1)
+    centers = np.linspace(-6, 6, n_peaks)
+    for i, center in enumerate(centers):
+        params[f"p{i}amplitude"].set(value=1.0, min=0)
+        params[f"p{i}center"].set(value=center, min=center - 1, max=center + 1)
+        params[f"p{i}sigma"].set(value=0.4, min=0.01, max=2)
+
+    sigma = np.linspace(0.2, 0.6, size * size)
+    data = (
+        np.stack(
+            [
+                model.eval(
+                    x=x,
+                    slope=0.01,
+                    intercept=0.1,
+                    **{f"p{i}amplitude": 1.0 + 0.5 * i for i in range(n_peaks)},
+                    **{f"p{i}center": c + 0.2 for i, c in enumerate(centers)},
+                    **{f"p{i}sigma": s for i in range(n_peaks)},
+                    **{f"p{i}gamma": s for i in range(n_peaks)},
+                )
+                for s in sigma
+            ]
+        )
+        + rng.normal(size=(sigma.size, n_points)) * 0.01
+    )
+    data = xr.DataArray(
+        data.reshape(size, size, n_points),
+        coords={"y": np.arange(size), "z": np.arange(size), "x": x},
+        dims=("y", "z", "x"),
+    )
+    seeds = np.empty((size, size), dtype=object)
+    for index in np.ndindex(seeds.shape):
+        seeds[index] = params.copy()
+    return model, data, xr.DataArray(seeds, dims=("y", "z"))
+
+
+def main(size: int = 10) -> None:
+    model, data, params = voigt_map(size)
+    for label, kws in [
+        ("finite differences", {"fit_kws": {"Dfun": None}}),
+        ("analytic", {}),
+    ]:
+        start = time.perf_counter()
+        result = data.fit(model=model, params=params, **kws)
+        elapsed = time.perf_counter() - start
+        nfev = int(result.assess.fit_stats("nfev").sum())
+        rsquared = float(result.assess.fit_stats("rsquared").mean())
+        print(
+            f"{label:>20} : {elapsed:8.2f} s, nfev {nfev:7d}, "
+            f"mean rsquared {rsquared:.6f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,161 @@
+"""Synthetic data and the benchmarked entry points of every accessor."""
+
+from typing import cast
+
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+import xrfit  # noqa: F401
+
+N_PEAKS = 3
+CENTERS = np.linspace(-6, 6, N_PEAKS)
+
+
+def make_model() -> lf.Model:
+    model = lf.models.ConstantModel()
+    for i in range(N_PEAKS):
+        model = model + lf.models.LorentzianModel(prefix=f"p{i}")
+    return model
+
+
+def make_params(model: lf.Model) -> lf.Parameters:
+    params = model.make_params(c=0.0)
+    for i, center in enumerate(CENTERS):
+        params[f"p{i}amplitude"].set(value=1.0, min=0)
+        params[f"p{i}center"].set(value=center, min=center - 2, max=center + 2)
+        params[f"p{i}sigma"].set(value=0.5, min=0.01, max=3)
+    return params
+
+
+def make_data(layout: str, size: int, n_points: int = 1000) -> xr.DataArray:
+    """
+    Peaks drifting smoothly over a map, with the layouts of the tests.
+
+    "1d" is a single spectrum, "2d" a line of ``size`` spectra along y, as in
+    test_fit_2d.py, and "3d" a map of ``size x size`` spectra, as in
+    test_fit_3d.py.
+    """
+    shape = {"1d": (), "2d": (size,), "3d": (size, size)}[layout]
+    dims = ("y", "z")[: len(shape)]
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, n_points)
+    grid = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing="ij")
+    drift = sum(grid, np.zeros(shape))
+    data = np.zeros((*shape, n_points))
+    for i, center in enumerate(CENTERS):
+        offset = (center + 0.5 * drift)[..., None]
+        sigma = (0.4 + 0.1 * i + 0.1 * np.abs(drift))[..., None]
+        data += (1.0 + 0.5 * i) * sigma / np.pi / ((x - offset) ** 2 + sigma**2)
+    data += 0.05 + rng.normal(size=data.shape) * 0.01
+    return xr.DataArray(
+        data,
+        coords={
+            **{dim: np.arange(n) for dim, n in zip(dims, shape, strict=True)},
+            "x": x,
+        },
+        dims=(*dims, "x"),
+    )
+
+
+def make_seeds(data: xr.DataArray, params: lf.Parameters) -> xr.DataArray:
+    template = data.isel(x=0, drop=True)
+    seeds = np.empty(template.shape, dtype=object)
+    for index in np.ndindex(seeds.shape):
+        seeds[index] = params.copy()
+    return xr.DataArray(seeds, coords=template.coords, dims=template.dims)
+
+
+class Context:
+    """The data of one layout and size, with a fit result shared by the cases."""
+
+    def __init__(self, layout: str, size: int, n_points: int = 1000) -> None:
+        self.layout = layout
+        self.size = size
+        self.model = make_model()
+        self.data = make_data(layout, size, n_points)
+        self.seeds = make_seeds(self.data, make_params(self.model))
+        self.result: xr.DataArray | None = None
+
+    @property
+    def n_pixels(self) -> int:
+        return int(np.prod(self.data.shape[:-1]))
+
+    def fitted(self) -> xr.DataArray:
+        if self.result is None:
+            self.result = cast(
+                "xr.DataArray", self.data.fit(model=self.model, params=self.seeds)
+            )
+        return self.result
+
+
+def _display(ctx: Context) -> None:
+    """Update latency of the display window while stepping through pixels."""
+    from qtpy.QtWidgets import QApplication
+
+    from xrfit.window import MainWindow
+
+    result = ctx.fitted()
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow(result)
+    try:
+        for i in range(min(result.shape[0], 20)):
+            window.sliders[0].setValue(i)
+            window._redraw()
+            app.processEvents()
+    finally:
+        window.close()
+
+
+# name: (layouts, function of the context)
+CASES = {
+    "guess": (["1d", "2d", "3d"], lambda ctx: ctx.data.fit.guess(model=ctx.model)),
+    "fit": (
+        ["1d", "2d", "3d"],
+        lambda ctx: ctx.data.fit(model=ctx.model, params=ctx.seeds),
+    ),
+    "fit_lean": (
+        ["2d", "3d"],
+        lambda ctx: ctx.data.fit(model=ctx.model, params=ctx.seeds, lean=True),
+    ),
+    "fit_batched": (
+        ["2d", "3d"],
+        lambda ctx: ctx.data.fit(
+            model=ctx.model, params=ctx.seeds, method="batched_lm"
+        ),
+    ),
+    "fit.pyramid": (
+        ["3d"],
+        lambda ctx: ctx.data.fit.pyramid(model=ctx.model, params=ctx.seeds),
+    ),
+    "fit_with_corr": (
+        ["2d", "3d"],
+        lambda ctx: ctx.data.fit.fit_with_corr(model=ctx.model, params=ctx.seeds),
+    ),
+    "params.get": (["2d", "3d"], lambda ctx: ctx.fitted().params.get("center")),
+    "params.sort": (["2d", "3d"], lambda ctx: ctx.fitted().params.sort("center")),
+    "params.smoothen": (
+        ["2d", "3d"],
+        lambda ctx: ctx.fitted().params.smoothen("center", 1),
+    ),
+    "assess.fit_stats": (
+        ["2d", "3d"],
+        lambda ctx: ctx.fitted().assess.summary(refresh=True),
+    ),
+    "get_arr": (["2d", "3d"], lambda ctx: ctx.fitted().get_arr("best_fit")),
+    "bin": (
+        ["2d", "3d"],
+        lambda ctx: ctx.data.bin(method="mean", boundary="pad", x=2, y=2),
+    ),
+    "display": (["2d", "3d"], _display),
+}
+
+# cases working on a fit result, which is computed before they are timed
+FITTED = [
+    "params.get",
+    "params.sort",
+    "params.smoothen",
+    "assess.fit_stats",
+    "get_arr",
+    "display",
+]
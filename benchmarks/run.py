@@ -0,0 +1,195 @@
+"""
+Measure wall time and peak memory of the accessors on synthetic maps.
+
+Run from the repository root, e.g.::
+
+    python benchmarks/run.py --sizes 10 30 100 300
+    python benchmarks/run.py --cases fit get_arr --layouts 3d
+    python benchmarks/run.py --compare results/a.json results/b.json
+
+Results are written to ``benchmarks/results/<version>-<commit>.json``, so that
+runs of different versions can be compared with ``--compare``.
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cases import CASES, FITTED, Context
+
+RESULTS = Path(__file__).parent / "results"
+
+
+def _version() -> str:
+    try:
+        return importlib.metadata.version("xrfit")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(func, ctx: Context, repeat: int, memory: bool) -> dict:
+    """Best wall time of `repeat` calls, and the peak memory of another call."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ctx)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func(ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"time": min(times), "peak_memory": peak}
+
+
+def run(
+    cases: list,
+    layouts: list,
+    sizes: list,
+    n_points: int,
+    repeat: int,
+    memory: bool,
+) -> list:
+    results = []
+    for layout in layouts:
+        for size in sizes if layout != "1d" else [1]:
+            ctx = Context(layout, size, n_points)
+            for name in cases:
+                case_layouts, func = CASES[name]
+                if layout not in case_layouts:
+                    continue
+                if name in FITTED:
+                    ctx.fitted()
+                record = {
+                    "case": name,
+                    "layout": layout,
+                    "size": size,
+                    "pixels": ctx.n_pixels,
+                    "points": n_points,
+                    **measure(func, ctx, repeat, memory),
+                }
+                results.append(record)
+                peak = record["peak_memory"]
+                print(
+                    f"{name:>18} {layout} {size:>4} ({ctx.n_pixels:>6} px) : "
+                    f"{record['time']:9.3f} s"
+                    + ("" if peak is None else f", peak {peak / 2**20:9.1f} MiB"),
+                    flush=True,
+                )
+    return results
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> None:
+    """Print the ratio of wall times and peak memory between two runs."""
+    old, new = (json.loads(Path(path).read_text()) for path in [old_path, new_path])
+    print(f"{old['version']} ({old['commit']}) -> {new['version']} ({new['commit']})")
+
+    def key(record):
+        return record["case"], record["layout"], record["size"], record["points"]
+
+    before = {key(record): record for record in old["results"]}
+    for record in new["results"]:
+        if key(record) not in before:
+            continue
+        previous = before[key(record)]
+        ratio = record["time"] / previous["time"]
+        line = (
+            f"{record['case']:>18} {record['layout']} {record['size']:>4} : "
+            f"{previous['time']:9.3f} s -> {record['time']:9.3f} s ({ratio:5.2f}x)"
+        )
+        if record["peak_memory"] and previous["peak_memory"]:
+            line += f", memory {record['peak_memory'] / previous['peak_memory']:5.2f}x"
+        if ratio > threshold:
+            line += "  <- slower"
+        print(line)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    parser.add_argument(
+        "--layouts", nargs="+", default=["1d", "2d", "3d"], choices=["1d", "2d", "3d"]
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 30])
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory runs"
+    )
+    parser.add_argument("--output", help="result file, by default in results/")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="time ratio above which --compare flags a case",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        old_path, new_path = args.compare
+        compare(old_path, new_path, args.threshold)
+        return
+
+    results = run(
+        args.cases,
+        args.layouts,
+        args.sizes,
+        args.points,
+        args.repeat,
+        not args.no_memory,
+    )
+    version, commit = _version(), _commit()
+    output = Path(args.output or RESULTS / f"{version}-{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "version": version,
+                "commit": commit,
+                "date": datetime.datetime.now(datetime.UTC).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "packages": {
+                    name: importlib.metadata.version(name)
+                    for name in ["numpy", "scipy", "xarray", "lmfit"]
+                },
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,37 @@
-from xrfit.arr import ArrAccessor
-from xrfit.assess import AccessAccessor
+import importlib
+
+from xrfit.arr import ArrAccessor, ArrDatasetAccessor
+from xrfit.assess import AccessAccessor, AccessDatasetAccessor
 from xrfit.bin import BinAccessor
 from xrfit.display import DisplayAccessor
 from xrfit.fit import FitAccessor
-from xrfit.modelresult import ModelResultWrapper
-from xrfit.params import ParamsAccessor
+from xrfit.params import ParamsAccessor, ParamsDatasetAccessor
+from xrfit.result import FitResultAccessor
+from xrfit.storage import open_result
+from xrfit.telemetry import Telemetry
+
+# Qt and OpenGL are only imported on first use
+_LAZY = {"ModelResultWrapper": "xrfit.modelresult"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "AccessAccessor",
+    "AccessDatasetAccessor",
     "ArrAccessor",
+    "ArrDatasetAccessor",
     "BinAccessor",
     "DisplayAccessor",
     "FitAccessor",
+    "FitResultAccessor",
     "ModelResultWrapper",
     "ParamsAccessor",
+    "ParamsDatasetAccessor",
+    "Telemetry",
+    "open_result",
 ]
@@ -1,15 +1,124 @@
-from typing import Literal
+import weakref
+from typing import Any, Literal
 
 import lmfit as lf
 import numpy as np
 import numpy.typing as npt
 import xarray as xr
 
-from xrfit.base import DataArrayAccessor
+from xrfit.base import DataArrayAccessor, DatasetAccessor
+from xrfit.kernels import _eval
+from xrfit.lineshapes import _is_supported
+from xrfit.result import _Evaluator
+
+# evaluated curves by ModelResult, with the parameter values they were evaluated at
+_CURVES: weakref.WeakKeyDictionary[lf.model.ModelResult, tuple] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _param_key(model_result: lf.model.ModelResult) -> tuple:
+    # constrained values follow from their expression, which is cheaper to compare
+    # than to evaluate
+    return tuple(par.expr or par.value for par in model_result.params.values())
+
+
+def _batchable(model_result: lf.model.ModelResult) -> bool:
+    return list(model_result.userkws) == ["x"] and _is_supported(model_result.model)
+
+
+def _eval_batch(model_results: list, keys: list) -> list:
+    """Evaluate ModelResults sharing a model and x axis in one broadcast call."""
+    model = model_results[0].model
+    args = {
+        f"{component.prefix}{name}"
+        for component in model.components
+        for name in component._param_root_names
+    }
+    values = {}
+    for i, (name, par) in enumerate(model_results[0].params.items()):
+        if name not in args:
+            continue
+        if par.expr:
+            column = [model_result.params[name].value for model_result in model_results]
+        else:
+            column = [key[i] for key in keys]
+        values[name] = np.array(column)[:, None]
+    x = np.asarray(model_results[0].userkws["x"])
+    return list(_eval(model, values, x))
+
+
+def _components(model_result: lf.model.ModelResult) -> dict:
+    """`lmfit.model.ModelResult.eval_components` through `xrfit.kernels._eval`."""
+    if not _batchable(model_result):
+        return model_result.eval_components()
+    values = {name: par.value for name, par in model_result.params.items()}
+    x = np.asarray(model_result.userkws["x"])
+    # keyed as lmfit does, by prefix or else by the name of the lineshape
+    return {
+        component.prefix or component._name: _eval(component, values, x)
+        for component in model_result.model.components
+    }
+
+
+def _best_fits(model_results: list) -> list:
+    """
+    Evaluate ModelResults at their current parameter values.
+
+    Curves are cached per ModelResult and re-evaluated only when a parameter value
+    changed. Pixels sharing a model and x axis with built-in lineshapes are
+    evaluated together, see `xrfit.kernels._eval`.
+    """
+    curves = [None] * len(model_results)
+    groups: dict[tuple, list] = {}
+    for i, model_result in enumerate(model_results):
+        key = _param_key(model_result)
+        cached = _CURVES.get(model_result)
+        if cached is not None and cached[0] == key:
+            curves[i] = cached[1]
+            continue
+        if _batchable(model_result):
+            group = (model_result.model.name, tuple(model_result.params))
+            groups.setdefault(group, []).append((i, key))
+        else:
+            curves[i] = model_result.eval()
+            _CURVES[model_result] = (key, curves[i])
+
+    for members in groups.values():
+        group_results = [model_results[i] for i, _ in members]
+        keys = [key for _, key in members]
+        x = group_results[0].userkws["x"]
+        if not all(
+            np.array_equal(model_result.userkws["x"], x)
+            for model_result in group_results
+        ):
+            evaluated = [model_result.eval() for model_result in group_results]
+        else:
+            evaluated = _eval_batch(group_results, keys)
+        for (i, key), model_result, curve in zip(
+            members, group_results, evaluated, strict=True
+        ):
+            curves[i] = curve
+            _CURVES[model_result] = (key, curve)
+    return curves
+
+
+def _eval_rows(
+    values: np.ndarray,
+    x: np.ndarray,
+    model: lf.Model,
+    param_names: list,
+) -> np.ndarray:
+    """Evaluate a supported model for parameter values of shape (..., param)."""
+    return _eval(
+        model,
+        {name: values[..., i, None] for i, name in enumerate(param_names)},
+        x,
+    )
 
 
 def _get_arr(
-    model_result: lf.model.ModelResult,
+    model_results: np.ndarray,
     attr_name: Literal[
         "best_fit",
         "init_fit",
@@ -17,37 +126,103 @@ def _get_arr(
         "data",
     ] = "best_fit",
 ) -> npt.NDArray[np.float64]:
-    # since parameter value might have changed, we re-evaluate the model just in case
-    best_fit = model_result.eval()
-    data = model_result.data
+    """Stack an attribute of an object array of ModelResults along a last axis."""
+    flat = list(np.asarray(model_results).ravel())
     if attr_name == "best_fit":
-        return best_fit
-    if attr_name == "init_fit":
-        return model_result.init_fit
-    if attr_name == "data":
-        return data
-    if attr_name == "residual":
-        return data - best_fit  # Consistent with convention used in lmfit 1.3.3
-    raise ValueError(
-        f"Invalid attr_name: {attr_name} (must be one of 'best_fit', 'init_fit', 'residual', 'data')"
-    )
+        # since parameter values might have changed, the model is re-evaluated
+        arrs = _best_fits(flat)
+    elif attr_name == "init_fit":
+        arrs = [model_result.init_fit for model_result in flat]
+    elif attr_name == "data":
+        arrs = [model_result.data for model_result in flat]
+    elif attr_name == "residual":
+        # Consistent with convention used in lmfit 1.3.3
+        arrs = [
+            model_result.data - best_fit
+            for model_result, best_fit in zip(flat, _best_fits(flat), strict=True)
+        ]
+    else:
+        raise ValueError(
+            f"Invalid attr_name: {attr_name} (must be one of 'best_fit', 'init_fit', 'residual', 'data')"
+        )
+    if not arrs:
+        return np.empty((*np.shape(model_results), 0))
+    return np.stack(arrs).reshape(*np.shape(model_results), -1)
 
 
 @xr.register_dataarray_accessor("get_arr")
 class ArrAccessor(DataArrayAccessor):
     def _get_x(self):
-        return self._obj[0].item().userkws["x"]
+        if self._obj.chunks is not None:
+            # lazy fit results carry the x axis, see FitAccessor.__call__
+            return self._obj.attrs["x"]
+        return self._obj.values.flat[0].userkws["x"]
 
     def __call__(
         self,
         attr_name: Literal["best_fit", "init_fit", "residual", "data"] = "best_fit",
         new_dim_name: str = "x",
     ) -> xr.DataArray:
+        x = self._get_x()
+        dask_kws: dict[str, Any] = {}
+        if self._obj.chunks is not None:
+            dask_kws = {
+                "output_dtypes": [float],
+                "dask_gufunc_kwargs": {"output_sizes": {new_dim_name: len(x)}},
+            }
         return xr.apply_ufunc(
             _get_arr,
             self._obj,
             output_core_dims=[[new_dim_name]],
             kwargs={"attr_name": attr_name},
-            vectorize=True,
             dask="parallelized",
-        ).assign_coords(coords={new_dim_name: self._get_x()})
+            **dask_kws,
+        ).assign_coords(coords={new_dim_name: x})
+
+
+@xr.register_dataset_accessor("get_arr")
+class ArrDatasetAccessor(DatasetAccessor):
+    def __call__(
+        self,
+        attr_name: Literal["best_fit", "init_fit", "residual", "data"] = "best_fit",
+        new_dim_name: str = "x",
+    ) -> xr.DataArray:
+        core_dim = self._obj.attrs["input_core_dims"]
+        x = self._obj[core_dim].values
+        if attr_name == "data":
+            arr = self._obj["data"]
+        elif attr_name in ["best_fit", "init_fit", "residual"]:
+            model = self._obj.attrs["model"]
+            if _is_supported(model):
+                # all pixels at once
+                func = _eval_rows
+                kwargs = {
+                    "x": x,
+                    "model": model,
+                    "param_names": list(self._obj["param"].values),
+                }
+            else:
+                func = _Evaluator(self._obj)
+                kwargs = {"x": x}
+            arr = xr.apply_ufunc(
+                func,
+                self._obj["init_value" if attr_name == "init_fit" else "value"],
+                input_core_dims=[["param"]],
+                output_core_dims=[[core_dim]],
+                kwargs=kwargs,
+                vectorize=func is not _eval_rows,
+                dask="parallelized",
+                output_dtypes=[float],
+                dask_gufunc_kwargs={"output_sizes": {core_dim: len(x)}},
+            ).assign_coords(coords={core_dim: x})
+            if attr_name == "residual":
+                arr = self._obj["data"] - arr
+        else:
+            raise ValueError(
+                f"Invalid attr_name: {attr_name} (must be one of 'best_fit', 'init_fit', 'residual', 'data')"
+            )
+        arr = arr.drop_vars(["param", "expr"], errors="ignore")
+        arr = arr.transpose(..., core_dim)
+        if new_dim_name != core_dim:
+            arr = arr.rename({core_dim: new_dim_name})
+        return arr
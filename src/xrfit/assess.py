@@ -5,9 +5,158 @@ import xarray as xr
 
 from xrfit.base import DataArrayAccessor
 
+_STAT_DTYPES = {
+    "ci_out": object,
+    "message": object,
+    "success": bool,
+    "aborted": bool,
+    "ndata": int,
+    "nfev": int,
+    "nfree": int,
+    "nvarys": int,
+    "ier": int,
+}
+
+
+_STAT_NAMES = Literal[
+    "aic",
+    "bic",
+    "chisqr",
+    "ci_out",
+    "redchi",
+    "rsquared",
+    "success",
+    "aborted",
+    "ndata",
+    "nfev",
+    "nfree",
+    "nvarys",
+    "ier",
+    "message",
+    "fit_max",
+]
+
+
+def _get_stat(model_result, attr_name: str):
+    if attr_name == "fit_max":
+        return model_result.best_fit.max()
+    return getattr(model_result, attr_name)
+
+
+def _summary_columns(
+    model_results: np.ndarray,
+    attr_names: list,
+    dtypes: list,
+) -> tuple | np.ndarray:
+    """Collect several statistics of an object array of ModelResults at once."""
+    shape = np.shape(model_results)
+    columns = [np.empty(shape, dtype=object) for _ in attr_names]
+    missing = [False] * len(attr_names)
+    for index, model_result in np.ndenumerate(model_results):
+        for i, attr_name in enumerate(attr_names):
+            try:
+                columns[i][index] = _get_stat(model_result, attr_name)
+            except AttributeError:
+                columns[i][index] = np.nan
+                missing[i] = True
+    columns = tuple(
+        column
+        if dtype is object
+        else column.astype(float if is_missing and dtype is not float else dtype)
+        for column, dtype, is_missing in zip(columns, dtypes, missing, strict=True)
+    )
+    # apply_ufunc expects a bare array for a single output
+    return columns if len(columns) > 1 else columns[0]
+
 
 @xr.register_dataarray_accessor("assess")
 class AccessAccessor(DataArrayAccessor):
+    """
+    Assess an array of ModelResults.
+
+    The statistics collected by `summary` are cached on the accessor, i.e. on the
+    array, and reused by `fit_stats`, `best_fit_stat` and `best_fit_max` as long
+    as the array holds the same ModelResults. After refitting ModelResults of the
+    array in place, pass ``refresh=True``. Statistics of dask-backed arrays are
+    not cached.
+    """
+
+    def __init__(self, xarr: xr.DataArray) -> None:
+        super().__init__(xarr)
+        self._summary: dict[str, xr.DataArray] = {}
+        self._cached_results: list = []
+
+    def _results(self) -> list | None:
+        """Return the objects the statistics are cached for, or None to not cache."""
+        if self._obj.chunks is not None:
+            return None
+        return list(self._obj.values.flat)
+
+    def _collect(self, attr_names: list) -> dict:
+        dtypes = [_STAT_DTYPES.get(attr_name, float) for attr_name in attr_names]
+        columns = xr.apply_ufunc(
+            _summary_columns,
+            self._obj,
+            kwargs={"attr_names": attr_names, "dtypes": dtypes},
+            output_core_dims=[[] for _ in attr_names],
+            dask="parallelized",
+            output_dtypes=dtypes,
+        )
+        if len(attr_names) == 1:
+            columns = (columns,)
+        return dict(zip(attr_names, columns, strict=True))
+
+    def summary(
+        self,
+        attr_names: list[_STAT_NAMES] | None = None,
+        refresh: bool = False,
+    ) -> xr.Dataset:
+        """
+        Collect fit statistics of all pixels in a single pass.
+
+        Parameters
+        ----------
+        attr_names : list of str, optional
+            The ModelResult attributes to collect, by default aic, bic, chisqr,
+            redchi, rsquared, success and nfev. "fit_max" is the maximum of the
+            best fit.
+        refresh : bool, optional
+            Collect again statistics that were cached, by default False.
+
+        Returns
+        -------
+        xr.Dataset
+            A variable of numeric dtype, where possible, for each statistic.
+        """
+        if attr_names is None:
+            attr_names = [
+                "aic",
+                "bic",
+                "chisqr",
+                "redchi",
+                "rsquared",
+                "success",
+                "nfev",
+            ]
+        results = self._results()
+        if results is None:
+            return xr.Dataset(self._collect(list(attr_names)))
+        # the cached results are kept alive, so that their ids are not reused
+        if (
+            refresh
+            or len(results) != len(self._cached_results)
+            or any(
+                result is not cached
+                for result, cached in zip(results, self._cached_results, strict=True)
+            )
+        ):
+            self._summary.clear()
+            self._cached_results = results
+        pending = [name for name in attr_names if name not in self._summary]
+        if pending:
+            self._summary.update(self._collect(pending))
+        return xr.Dataset({name: self._summary[name] for name in attr_names})
+
     def fit_stats(
         self,
         attr_name: Literal[
@@ -27,37 +176,12 @@ class AccessAccessor(DataArrayAccessor):
             "message",
         ] = "rsquared",
     ) -> xr.DataArray:
-        def get_attr_safe(x, attr_name):
-            try:
-                return getattr(x, attr_name)
-            except AttributeError:
-                return np.nan
-
-        return xr.apply_ufunc(
-            get_attr_safe,
-            self._obj,
-            input_core_dims=[[]],
-            kwargs={"attr_name": attr_name},
-            vectorize=True,
-            dask="parallelized",
-        )
+        return self.summary([attr_name])[attr_name]
 
     def fit_max(
         self,
     ):
-        def get_fit_safe(x):
-            try:
-                return x.best_fit.max()
-            except AttributeError:
-                return np.nan
-
-        return xr.apply_ufunc(
-            get_fit_safe,
-            self._obj,
-            input_core_dims=[[]],
-            vectorize=True,
-            dask="parallelized",
-        )
+        return self.summary(["fit_max"])["fit_max"]
 
     def best_fit_max(
         self,
@@ -76,9 +200,37 @@ class AccessAccessor(DataArrayAccessor):
             "rsquared",
         ] = "rsquared",
     ) -> dict:
-        darr = self.fit_stats(attr_name)
+        darr = self.summary([attr_name])[attr_name]
         if attr_name in ["aic", "bic", "chisqr", "redchi"]:
             idx = np.unravel_index(darr.values.argmin(), darr.shape)
         if attr_name in ["rsquared"]:
             idx = np.unravel_index(darr.values.argmax(), darr.shape)
         return dict(zip(darr.dims, idx, strict=False))
+
+
+@xr.register_dataset_accessor("assess")
+class AccessDatasetAccessor(AccessAccessor):
+    """Assess a columnar fit result Dataset, see `FitAccessor`."""
+
+    def _results(self) -> list | None:
+        # the columns are read as they are
+        return None
+
+    def _collect(self, attr_names: list) -> dict:
+        columns = {}
+        for attr_name in attr_names:
+            if attr_name == "fit_max":
+                core_dim = self._obj.attrs["input_core_dims"]
+                columns[attr_name] = self._obj.get_arr(
+                    "best_fit", new_dim_name=core_dim
+                ).max(core_dim)
+            else:
+                columns[attr_name] = self._obj[attr_name]
+        return columns
+
+    def fit_stats(
+        self,
+        attr_name: str = "rsquared",
+    ) -> xr.DataArray:
+        """Read a fit statistic column, one of `xrfit.result._FIT_STATS`."""
+        return self._obj[attr_name]
@@ -4,3 +4,8 @@ import xarray as xr
 class DataArrayAccessor:
     def __init__(self, xarr: xr.DataArray) -> None:
         self._obj = xarr
+
+
+class DatasetAccessor:
+    def __init__(self, ds: xr.Dataset) -> None:
+        self._obj = ds
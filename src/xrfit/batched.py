@@ -0,0 +1,391 @@
+import lmfit as lf
+import numpy as np
+
+from xrfit.kernels import _eval
+from xrfit.lineshapes import _gradient
+
+
+def _to_internal(value, vmin, vmax):
+    """Minuit-style transformation of bounded values, as done by lmfit."""
+    lower = np.isfinite(vmin)
+    upper = np.isfinite(vmax)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        both = np.arcsin(np.clip(2 * (value - vmin) / (vmax - vmin) - 1, -1, 1))
+        lower_only = np.sqrt(np.maximum((value - vmin + 1.0) ** 2 - 1, 0))
+        upper_only = np.sqrt(np.maximum((vmax - value + 1.0) ** 2 - 1, 0))
+    return np.select(
+        [lower & upper, lower, upper], [both, lower_only, upper_only], value
+    )
+
+
+def _to_external(internal, vmin, vmax):
+    lower = np.isfinite(vmin)
+    upper = np.isfinite(vmax)
+    with np.errstate(invalid="ignore"):
+        both = vmin + (np.sin(internal) + 1) * (vmax - vmin) / 2.0
+        lower_only = vmin - 1.0 + np.sqrt(internal**2 + 1)
+        upper_only = vmax + 1 - np.sqrt(internal**2 + 1)
+    return np.select(
+        [lower & upper, lower, upper], [both, lower_only, upper_only], internal
+    )
+
+
+def _scale_gradient(internal, vmin, vmax):
+    lower = np.isfinite(vmin)
+    upper = np.isfinite(vmax)
+    with np.errstate(invalid="ignore"):
+        both = np.cos(internal) * (vmax - vmin) / 2.0
+        lower_only = internal / np.sqrt(internal**2 + 1)
+    return np.select(
+        [lower & upper, lower, upper], [both, lower_only, -lower_only], 1.0
+    )
+
+
+def _eval_exprs(
+    values: dict,
+    exprs: dict,
+) -> dict:
+    """
+    Evaluate constraint expressions for many parameter sets at once.
+
+    Expressions that do not broadcast over arrays (e.g. using the builtin `max`)
+    are evaluated pixel by pixel.
+    """
+    interpreter = lf.Parameters()._asteval
+    values = dict(values)
+    pending = dict(exprs)
+    n_pixels = len(next(iter(values.values())))
+    while pending:
+        resolved = {}
+        for name, expr in pending.items():
+            interpreter.symtable.update(values)
+            interpreter.error = []
+            out = interpreter.eval(expr, show_errors=False)
+            if not interpreter.error and np.shape(out) in [(n_pixels,), ()]:
+                resolved[name] = np.broadcast_to(out, (n_pixels,)).astype(float)
+                continue
+            out = np.empty(n_pixels)
+            for i in range(n_pixels):
+                interpreter.symtable.update({k: v[i] for k, v in values.items()})
+                interpreter.error = []
+                out[i] = interpreter.eval(expr, show_errors=False)
+                if interpreter.error:
+                    break
+            else:
+                resolved[name] = out
+        if not resolved:
+            raise ValueError(f"Can not evaluate expressions {pending}.")
+        values.update(resolved)
+        for name in resolved:
+            pending.pop(name)
+    return values
+
+
+class _Problem:
+    """Residuals and Jacobians of a block of pixels for the batched solver."""
+
+    def __init__(
+        self,
+        model: lf.Model,
+        data: np.ndarray,
+        x: np.ndarray,
+        weights: np.ndarray | None,
+        names: list,
+        exprs: list,
+        vmin: np.ndarray,
+        vmax: np.ndarray,
+    ) -> None:
+        self.model = model
+        self.data = data
+        self.x = x
+        self.weights = weights
+        self.free = [name for name, expr in zip(names, exprs, strict=True) if not expr]
+        arg_names = set(_arg_names(model))
+        # only the constraints that enter the lineshapes are needed while fitting
+        self.exprs = {
+            name: expr
+            for name, expr in zip(names, exprs, strict=True)
+            if expr and name in arg_names
+        }
+        self.vmin = vmin
+        self.vmax = vmax
+        # the lineshapes are differentiated analytically unless constraints
+        # enter them, which are differenced like the whole residual
+        self.analytic = not self.exprs
+        self.jacobian_nfev = 0 if self.analytic else len(self.free)
+
+    def values(self, internal, rows) -> dict:
+        external = _to_external(internal, self.vmin[rows], self.vmax[rows])
+        values = {name: external[:, i] for i, name in enumerate(self.free)}
+        return _eval_exprs(values, self.exprs) if self.exprs else values
+
+    def curve(self, internal, rows) -> np.ndarray:
+        values = self.values(internal, rows)
+        return _eval(
+            self.model, {name: value[:, None] for name, value in values.items()}, self.x
+        )
+
+    def residual(self, internal, rows) -> np.ndarray:
+        residual = self.curve(internal, rows) - self.data[rows]
+        if self.weights is not None:
+            residual *= self.weights[rows]
+        return residual
+
+    def jacobian(self, internal, residual, rows) -> np.ndarray:
+        """Jacobian in the internal parameter space, of shape (rows, x, free)."""
+        if self.analytic:
+            return self._analytic_jacobian(internal, rows)
+        n_rows, n_free = internal.shape
+        # relative steps, bounded below for parameters starting at (almost) zero
+        step = 1.49012e-8 * np.maximum(np.abs(internal), 1e-3)
+        shifted = internal[:, None, :] + step[:, None, :] * np.eye(n_free)
+        shifted_residual = self.residual(
+            shifted.reshape(-1, n_free), np.repeat(rows, n_free)
+        ).reshape(n_rows, n_free, -1)
+        return ((shifted_residual - residual[:, None, :]) / step[:, :, None]).swapaxes(
+            1, 2
+        )
+
+    def _analytic_jacobian(self, internal, rows) -> np.ndarray:
+        values = self.values(internal, rows)
+        _, grad = _gradient(
+            self.model, {name: value[:, None] for name, value in values.items()}, self.x
+        )
+        shape = (len(rows), np.size(self.x))
+        jacobian = (
+            np.stack(
+                [np.broadcast_to(grad.get(name, 0.0), shape) for name in self.free],
+                axis=2,
+            )
+            * _scale_gradient(internal, self.vmin[rows], self.vmax[rows])[:, None, :]
+        )
+        if self.weights is not None:
+            jacobian *= self.weights[rows][:, :, None]
+        return jacobian
+
+
+def _arg_names(model: lf.Model) -> list:
+    if isinstance(model, lf.model.CompositeModel):
+        return _arg_names(model.left) + _arg_names(model.right)
+    return [f"{model.prefix}{name}" for name in model._param_root_names]
+
+
+def _solve(A, g, vary, lam, diag):
+    """Damped Gauss-Newton step for each pixel, holding fixed parameters."""
+    fixed = ~vary
+    A = np.where(fixed[:, :, None] | fixed[:, None, :], 0.0, A)
+    diag = np.where(diag > 0, diag, 1.0)
+    A = A + (lam[:, None] * diag + fixed)[:, :, None] * np.eye(A.shape[-1])
+    return np.linalg.solve(A, np.where(fixed, 0.0, -g)[..., None])[..., 0]
+
+
+def _batched_lm(
+    model: lf.Model,
+    data: np.ndarray,
+    x: np.ndarray,
+    value: np.ndarray,
+    vmin: np.ndarray,
+    vmax: np.ndarray,
+    vary: np.ndarray,
+    names: list,
+    exprs: list,
+    weights: np.ndarray | None = None,
+    max_nfev: int | None = None,
+    ftol: float = 1.5e-8,
+    xtol: float = 1.5e-8,
+    batch_size: int = 1024,
+) -> tuple:
+    """
+    Levenberg-Marquardt fit of many pixels at once.
+
+    Parameters
+    ----------
+    model : lf.Model
+        Model tree of supported lineshapes, see `xrfit.lineshapes._is_supported`.
+    data : np.ndarray
+        Data of shape (pixels, len(x)).
+    x : np.ndarray
+        The independent variable.
+    value, vmin, vmax, vary : np.ndarray
+        Initial values, bounds and vary flags of shape (pixels, len(names)).
+    names : list
+        Parameter names.
+    exprs : list
+        Constraint expression of each parameter, empty for free parameters.
+    weights : np.ndarray or None, optional
+        Weights multiplying the residual, of the same shape as `data`.
+    max_nfev : int or None, optional
+        Maximum number of function evaluations per pixel. By default
+        ``2000 * (nvarys + 1)``, as lmfit's leastsq.
+    ftol, xtol : float, optional
+        Relative tolerances on the chi-square and on the parameters.
+    batch_size : int, optional
+        Number of pixels solved together, which bounds the memory footprint.
+
+    Returns
+    -------
+    tuple
+        Columns in the order of `xrfit.result._PARAM_ATTRS` and
+        `xrfit.result._FIT_STATS`, with the pixels along the first axis.
+    """
+    free = [i for i, expr in enumerate(exprs) if not expr]
+    blocks = [
+        _batched_lm_block(
+            model,
+            data[rows],
+            x,
+            value[rows],
+            vmin[rows],
+            vmax[rows],
+            vary[rows],
+            names,
+            exprs,
+            free,
+            None if weights is None else weights[rows],
+            max_nfev,
+            ftol,
+            xtol,
+        )
+        for rows in np.array_split(
+            np.arange(len(data)), max(1, int(np.ceil(len(data) / batch_size)))
+        )
+    ]
+    return tuple(np.concatenate(column) for column in zip(*blocks, strict=True))
+
+
+def _batched_lm_block(
+    model,
+    data,
+    x,
+    value,
+    vmin,
+    vmax,
+    vary,
+    names,
+    exprs,
+    free,
+    weights,
+    max_nfev,
+    ftol,
+    xtol,
+):
+    n_pixels = len(data)
+    vary = vary[:, free]
+    problem = _Problem(
+        model, data, x, weights, names, exprs, vmin[:, free], vmax[:, free]
+    )
+    nvarys = vary.sum(axis=1)
+    if max_nfev is None:
+        max_nfev = 2000 * (nvarys + 1)
+    max_nfev = np.broadcast_to(max_nfev, (n_pixels,))
+
+    rows = np.arange(n_pixels)
+    internal = _to_internal(value[:, free], problem.vmin, problem.vmax)
+    residual = problem.residual(internal, rows)
+    chisqr = (residual**2).sum(axis=1)
+    nfev = np.ones(n_pixels, dtype=int)
+    success = np.zeros(n_pixels, dtype=bool)
+    lam = np.full(n_pixels, 1e-3)
+    # as MINPACK, damp with the largest curvature seen so far of each parameter
+    diag = np.zeros(internal.shape)
+
+    active = rows
+    jacobian = problem.jacobian(internal, residual, rows)
+    nfev += problem.jacobian_nfev
+    while active.size:
+        A = np.einsum("nki,nkj->nij", jacobian, jacobian)
+        g = np.einsum("nki,nk->ni", jacobian, residual[active])
+        diag[active] = np.maximum(diag[active], np.einsum("nii->ni", A))
+
+        # converged once even the undamped Gauss-Newton step promises no
+        # relative decrease of the chi-square beyond ftol, or barely moves
+        newton = _solve(A, g, vary[active], np.full(len(active), 1e-12), diag[active])
+        converged = (-(g * newton).sum(axis=1) <= ftol * chisqr[active]) | (
+            np.abs(newton).max(axis=1, initial=0.0)
+            <= xtol * (np.abs(internal[active]).max(axis=1, initial=0.0) + xtol)
+        )
+        success[active[converged]] = True
+        keep = ~converged
+        active, jacobian, A, g = active[keep], jacobian[keep], A[keep], g[keep]
+        if not active.size:
+            break
+
+        step = _solve(A, g, vary[active], lam[active], diag[active])
+        trial = internal[active] + step
+        trial_residual = problem.residual(trial, active)
+        trial_chisqr = (trial_residual**2).sum(axis=1)
+        nfev[active] += 1
+
+        better = trial_chisqr < chisqr[active]
+        accepted = active[better]
+        internal[accepted] = trial[better]
+        residual[accepted] = trial_residual[better]
+        chisqr[accepted] = trial_chisqr[better]
+        lam[active] = np.where(better, lam[active] / 10, lam[active] * 10)
+
+        # no step along the gradient decreases the chi-square any further,
+        # before the convergence criteria are met: the pixel did not converge
+        stuck = lam[active] > 1e16
+        done = stuck | (nfev[active] >= max_nfev[active])
+        # the Jacobian is only refreshed for pixels which took a step
+        keep = ~done
+        refresh = better[keep]
+        jacobian = jacobian[keep]
+        active = active[keep]
+        if refresh.any():
+            jacobian[refresh] = problem.jacobian(
+                internal[active[refresh]], residual[active[refresh]], active[refresh]
+            )
+            nfev[active[refresh]] += problem.jacobian_nfev
+
+    # uncertainties from the Jacobian in the external parameter space
+    jacobian = (
+        problem.jacobian(internal, residual, rows)
+        / _scale_gradient(internal, problem.vmin, problem.vmax)[:, None, :]
+    )
+    ndata = np.full(n_pixels, data.shape[1])
+    nfree = ndata - nvarys
+    redchi = chisqr / np.maximum(1, nfree)
+    A = np.einsum("nki,nkj->nij", jacobian, jacobian)
+    A = np.where(vary[:, :, None] & vary[:, None, :], A, 0.0)
+    with np.errstate(invalid="ignore"):
+        covar = np.linalg.pinv(A) * redchi[:, None, None]
+        free_stderr = np.where(vary, np.sqrt(np.einsum("nii->ni", covar)), np.nan)
+
+    values = _eval_exprs(
+        problem.values(internal, rows),
+        {name: expr for name, expr in zip(names, exprs, strict=True) if expr},
+    )
+    init_values = _eval_exprs(
+        {name: value[:, i] for i, name in enumerate(names) if not exprs[i]},
+        {name: expr for name, expr in zip(names, exprs, strict=True) if expr},
+    )
+    stderr = np.full(value.shape, np.nan)
+    stderr[:, free] = free_stderr
+    full_vary = np.zeros(value.shape, dtype=bool)
+    full_vary[:, free] = vary
+
+    # evaluated rather than unweighted from the residual, for zero weights
+    best_fit = problem.curve(internal, rows)
+    sstot = ((data - data.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    rsquared = 1.0 - ((data - best_fit) ** 2).sum(axis=1) / np.maximum(1e-15, sstot)
+    chisqr = np.maximum(chisqr, 1.0e-250 * ndata)
+    neg2_log_likel = ndata * np.log(chisqr / ndata)
+    return (
+        np.stack([values[name] for name in names], axis=1),
+        stderr,
+        vmin,
+        vmax,
+        full_vary,
+        np.stack([init_values[name] for name in names], axis=1),
+        neg2_log_likel + 2 * nvarys,
+        neg2_log_likel + np.log(ndata) * nvarys,
+        chisqr,
+        redchi,
+        rsquared,
+        success,
+        nfev,
+        ndata,
+        nfree,
+        nvarys,
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 import numpy as np
 import xarray as xr
 
@@ -6,14 +8,74 @@ from xrfit.base import DataArrayAccessor
 
 @xr.register_dataarray_accessor("bin")
 class BinAccessor(DataArrayAccessor):
-    def __call__(self, **dim_multipliers):
-        dim_dict = {}
+    def __call__(
+        self,
+        method: Literal["interp", "mean", "sum"] = "interp",
+        boundary: Literal["trim", "pad", "exact"] = "trim",
+        weights: xr.DataArray | bool = False,
+        **dim_multipliers,
+    ) -> xr.DataArray | tuple:
+        """
+        Downsample the data by the given factor along each dimension.
 
-        # Loop over the passed dimensions and apply the interpolation multiplier
-        for dim, multiplier in dim_multipliers.items():
+        Parameters
+        ----------
+        method : {"interp", "mean", "sum"}, optional
+            "interp" interpolates onto a coarser evenly spaced grid spanning the
+            same range. "mean" and "sum" reduce blocks of ``multiplier`` points,
+            with coordinates at the centers of the blocks. Block reduction is
+            lazy for dask-backed data. By default "interp".
+        boundary : {"trim", "pad", "exact"}, optional
+            How block reduction handles a size that is not a multiple of the
+            multiplier. "trim" drops the remainder, "pad" reduces it into a
+            smaller last bin and "exact" raises. By default "trim".
+        weights : xr.DataArray or bool, optional
+            Fit weights, i.e. inverse uncertainties, of the points. If given, or
+            True for unit weights, the weights of the bins are propagated and
+            returned as well, to be passed on as ``fit(weights=...)``. Only for
+            block reduction. By default False.
+        **dim_multipliers
+            Binning factor for each dimension.
+
+        Returns
+        -------
+        xr.DataArray or tuple
+            The binned data, and the weights of the bins if `weights` is given.
+        """
+        for dim in dim_multipliers:
             if dim not in self._obj.dims:
                 raise ValueError(f"Dimension '{dim}' not found in the DataArray.")
+        if method == "interp":
+            if weights is not False:
+                raise ValueError("weights are only propagated by block reduction.")
+            return self._interp(dim_multipliers)
+        if method not in ["mean", "sum"]:
+            raise ValueError("method must be 'interp', 'mean' or 'sum'.")
+
+        window = {dim: int(multiplier) for dim, multiplier in dim_multipliers.items()}
+        binned = getattr(
+            self._obj.coarsen(window, boundary=boundary, coord_func="mean"), method
+        )()
+        if weights is False:
+            return binned
 
+        # the variance of a bin is the sum of the variances of its points
+        valid = self._obj.notnull().astype(float)
+        if weights is True:
+            variance = valid
+        else:
+            variance = (1 / weights**2).where(self._obj.notnull())
+        variance = variance.coarsen(window, boundary=boundary, coord_func="mean").sum()
+        if method == "mean":
+            count = valid.coarsen(window, boundary=boundary, coord_func="mean").sum()
+            return binned, count / np.sqrt(variance)
+        return binned, 1 / np.sqrt(variance)
+
+    def _interp(self, dim_multipliers: dict) -> xr.DataArray:
+        dim_dict = {}
+
+        # Loop over the passed dimensions and apply the interpolation multiplier
+        for dim, multiplier in dim_multipliers.items():
             # Get the current coordinate values for this dimension
             current_coord = self._obj[dim].values
 
@@ -28,4 +90,4 @@ class BinAccessor(DataArrayAccessor):
             dim_dict[dim] = new_dim
 
         # Perform the interpolation with the constructed dim_dict
-        return self._obj.interp(**dim_dict)
+        return self._obj.interp(dim_dict)
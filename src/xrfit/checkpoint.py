@@ -0,0 +1,212 @@
+import os
+import time
+from pathlib import Path
+
+import lmfit as lf
+import numpy as np
+
+from xrfit.result import _DTYPES, _FIT_STATS, _PARAM_ATTRS, _columns
+
+
+class _Checkpoint:
+    """
+    Keep the columns of completed pixels and flush them to a directory.
+
+    A directory holds one or more stages, e.g. the initial fit and the
+    correlated refit of `fit_with_corr`, with files prefixed by the stage name.
+    The columns of a stage are preallocated ``.npy`` files which are opened as
+    memory maps, so that a flush only writes the rows of the pixels completed
+    since the previous one. Those rows are committed by replacing the small
+    ``<stage>.n_done.npy`` with a temporary file holding the number of completed
+    pixels, so that a crash during a flush never leaves a corrupt checkpoint
+    behind: rows past that number are not marked done and are fitted again.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The checkpoint directory, created if it does not exist.
+    every : int, optional
+        Flush after this many newly completed pixels, by default 100.
+    interval : float, optional
+        Flush when this many seconds passed since the last flush, by default 60.
+    resume : bool, optional
+        Load the pixels completed by a previous run from `path`, if it exists.
+        Otherwise the checkpoint files of a previous run are overwritten.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        every: int = 100,
+        interval: float = 60.0,
+        resume: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.every = every
+        self.interval = interval
+        if self.path.exists() and not self.path.is_dir():
+            raise ValueError(f"Checkpoint {self.path} is not a directory.")
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            for file in self.path.glob("*.npy"):
+                file.unlink()
+        # small arrays, e.g. the parameter names, which are replaced as a whole
+        self.arrays: dict[str, np.ndarray] = {}
+        # memory maps of the columns of every stage
+        self._columns: dict[str, dict[str, np.memmap]] = {}
+        self._done: dict[str, np.ndarray] = {}
+        self._order: dict[str, np.ndarray] = {}
+        # number of completed pixels of each stage, the next position in `order`
+        self._n_done: dict[str, int] = {}
+        # columns of the pixels completed since the last flush, by stage and index
+        self._rows: dict[str, dict[int, list]] = {}
+        for file in self.path.glob("*.npy"):
+            key = file.name.removesuffix(".npy")
+            attr = key.partition(".")[2]
+            if attr not in _PARAM_ATTRS + _FIT_STATS + ["order"]:
+                self.arrays[key] = np.load(file)
+        for key in list(self.arrays):
+            if key.endswith(".n_done"):
+                self._open(key.removesuffix(".n_done"))
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.npy"
+
+    def _replace(self, key: str, value) -> None:
+        """Write a small array to a temporary file and move it in place."""
+        value = np.asarray(value)
+        tmp = self.path / f"{key}.npy.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, value)
+        os.replace(tmp, self._file(key))
+        self.arrays[key] = value
+
+    def _open(self, name: str) -> None:
+        """Map the columns of a stored stage and mark its committed pixels."""
+        self._columns[name] = {
+            attr: np.load(self._file(f"{name}.{attr}"), mmap_mode="r+")
+            for attr in [*_PARAM_ATTRS, *_FIT_STATS, "order"]
+        }
+        n_done = int(self.arrays[f"{name}.n_done"])
+        order = np.array(self._columns[name]["order"])
+        stale = order >= n_done
+        if stale.any():
+            # rows written after the last commit are fitted again
+            order[stale] = -1
+            self._columns[name]["order"][:] = order
+            self._columns[name]["order"].flush()
+        self._order[name] = order
+        self._done[name] = order >= 0
+        self._n_done[name] = n_done
+        self._rows[name] = {}
+
+    def stage(
+        self,
+        name: str,
+        n_pixels: int,
+        param_names: list,
+        exprs: list,
+    ) -> None:
+        """Start or resume a stage of `n_pixels` pixels with `param_names`."""
+        if name in self._columns:
+            if self._done[name].shape != (n_pixels,) or list(
+                self.arrays[f"{name}.param_names"]
+            ) != list(param_names):
+                raise ValueError(
+                    f"Checkpoint {self.path} does not match the data and model."
+                )
+            return
+        n_params = len(param_names)
+        for attr in _PARAM_ATTRS:
+            column = np.lib.format.open_memmap(
+                self._file(f"{name}.{attr}"),
+                mode="w+",
+                dtype=_DTYPES.get(attr, float),
+                shape=(n_pixels, n_params),
+            )
+            column[:] = np.nan
+        for stat in _FIT_STATS:
+            np.lib.format.open_memmap(
+                self._file(f"{name}.{stat}"),
+                mode="w+",
+                dtype=_DTYPES.get(stat, float),
+                shape=(n_pixels,),
+            )
+        order = np.lib.format.open_memmap(
+            self._file(f"{name}.order"), mode="w+", dtype=int, shape=(n_pixels,)
+        )
+        order[:] = -1
+        order.flush()
+        self._replace(f"{name}.param_names", np.array(param_names, dtype=str))
+        self._replace(f"{name}.expr", np.array(exprs, dtype=str))
+        self._replace(f"{name}.n_done", 0)
+        self._open(name)
+
+    def param_names(self, name: str) -> tuple[list, list]:
+        """Parameter names and their constraint expressions."""
+        return (
+            [str(param) for param in self.arrays[f"{name}.param_names"]],
+            [str(expr) for expr in self.arrays[f"{name}.expr"]],
+        )
+
+    def done(self, name: str) -> np.ndarray:
+        return self._done[name]
+
+    def order(self, name: str) -> np.ndarray:
+        """Position of each pixel in the order it was completed, -1 if not yet."""
+        return self._order[name]
+
+    def columns(self, name: str) -> tuple:
+        """Return the stored columns in the layout of `xrfit.result._columns`."""
+        self.flush()
+        return tuple(
+            np.array(self._columns[name][attr]) for attr in _PARAM_ATTRS + _FIT_STATS
+        )
+
+    def record(
+        self,
+        name: str,
+        index: int,
+        model_result: lf.model.ModelResult,
+    ) -> None:
+        """Store the result of the flat pixel `index`, flushing if it is due."""
+        param_names = list(self.arrays[f"{name}.param_names"])
+        self._rows[name][index] = list(_columns(model_result, param_names))
+        done = self._done[name]
+        if not done[index]:
+            self._order[name][index] = self._n_done[name]
+            self._n_done[name] += 1
+            done[index] = True
+        self._pending += 1
+        if (
+            self._pending >= self.every
+            or time.monotonic() - self._last_flush >= self.interval
+        ):
+            self.flush()
+
+    def set(self, key: str, value) -> None:
+        self._replace(key, value)
+
+    def get(self, key: str):
+        return self.arrays.get(key)
+
+    def flush(self) -> None:
+        """Write the pixels completed since the last flush and commit them."""
+        for name, rows in self._rows.items():
+            if not rows:
+                continue
+            indices = np.fromiter(rows, dtype=int, count=len(rows))
+            columns = self._columns[name]
+            for attr, values in zip(
+                _PARAM_ATTRS + _FIT_STATS, zip(*rows.values(), strict=True), strict=True
+            ):
+                columns[attr][indices] = np.stack(values)
+            columns["order"][indices] = self._order[name][indices]
+            for column in columns.values():
+                column.flush()
+            self._replace(f"{name}.n_done", self._n_done[name])
+            rows.clear()
+        self._pending = 0
+        self._last_flush = time.monotonic()
@@ -0,0 +1,145 @@
+import importlib
+import io
+import marshal
+import os
+import pickle
+import types
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import lmfit as lf
+
+
+def _noop(*args, **kws):
+    return None
+
+
+def _restore_function(code, module, name, defaults, kwdefaults, cells, model):
+    closure = tuple(
+        types.CellType(model if is_model else value) for is_model, value in cells
+    )
+    func = types.FunctionType(
+        marshal.loads(code),
+        vars(importlib.import_module(module)),
+        name,
+        defaults,
+        closure or None,
+    )
+    func.__kwdefaults__ = kwdefaults
+    return func
+
+
+def _restore_model(cls, state, func):
+    model = cls.__new__(cls)
+    model.__dict__.update(state)
+    # CompositeModel only carries a placeholder function
+    model.func = _noop if func is None else _restore_function(*func, model)
+    return model
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickler that can handle lmfit models defined with local functions.
+
+    Built-in models such as ConstantModel or SplineModel define their function
+    in ``__init__``. It is sent by its code, defaults and closure, the model
+    itself standing in for any cell which refers to it, and rebuilt next to the
+    rest of the state of the model, without calling its constructor again.
+    ExpressionModel is rebuilt by lmfit from its serialized state.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, lf.Model) and "<locals>" in getattr(
+            obj.func, "__qualname__", ""
+        ):
+            if isinstance(obj, lf.models.ExpressionModel):
+                # its interpreter does not pickle, lmfit rebuilds it from `expr`
+                return lf.model._buildmodel, (obj._get_state(),)
+            state = {k: v for k, v in obj.__dict__.items() if k != "func"}
+            func = None
+            if not isinstance(obj, lf.model.CompositeModel):
+                cells = [cell.cell_contents for cell in obj.func.__closure__ or ()]
+                func = (
+                    marshal.dumps(obj.func.__code__),
+                    obj.func.__module__,
+                    obj.func.__name__,
+                    obj.func.__defaults__,
+                    obj.func.__kwdefaults__,
+                    [
+                        (value is obj, None if value is obj else value)
+                        for value in cells
+                    ],
+                )
+            return _restore_model, (type(obj), state, func)
+        return NotImplemented
+
+
+def _dumps(obj) -> bytes:
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def _run(payload: bytes) -> bytes:
+    func, args = pickle.loads(payload)
+    return _dumps(func(*args))
+
+
+def _n_workers(
+    executor: Executor | None,
+    n_workers: int | None,
+) -> int:
+    if n_workers is not None:
+        return n_workers
+    return getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+
+def _map_chunks(
+    func: Callable,
+    chunks: Sequence[tuple],
+    executor: Executor | None = None,
+    n_workers: int | None = None,
+    callback: Callable[[int, object], None] | None = None,
+) -> list:
+    """
+    Apply `func` to every tuple of arguments in `chunks` in worker processes.
+
+    Payloads are serialized in the parent so that any `concurrent.futures`
+    compatible executor can run them, including lmfit models which can not be
+    pickled by the standard library alone.
+
+    Parameters
+    ----------
+    func : Callable
+        Module level function to be called as ``func(*chunk)``.
+    chunks : Sequence of tuple
+        Arguments for each call.
+    executor : concurrent.futures.Executor or None, optional
+        Executor to submit the chunks to. If None, a `ProcessPoolExecutor` with
+        `n_workers` processes is created for this call.
+    n_workers : int or None, optional
+        Number of worker processes, by default the number of CPUs.
+    callback : Callable or None, optional
+        Called as ``callback(i, result)`` as soon as the result of the i-th
+        chunk is available, in the order of `chunks`.
+
+    Returns
+    -------
+    list
+        Results of each call, in the order of `chunks`.
+    """
+    payloads = [_dumps((func, chunk)) for chunk in chunks]
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=_n_workers(None, n_workers)) as pool:
+            return _collect(pool.map(_run, payloads), callback)
+    return _collect(executor.map(_run, payloads), callback)
+
+
+def _collect(outputs, callback) -> list:
+    results = []
+    for i, out in enumerate(outputs):
+        result = pickle.loads(out)
+        if callback is not None:
+            callback(i, result)
+        results.append(result)
+    return results
@@ -1,11 +1,41 @@
-from typing import Literal
+import copy
+import functools
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Literal, cast
 
 import lmfit as lf
 import numpy as np
 import xarray as xr
 
 from xrfit.base import DataArrayAccessor
+from xrfit.batched import _batched_lm
+from xrfit.checkpoint import _Checkpoint
+from xrfit.executor import _map_chunks, _n_workers
+from xrfit.guess import (
+    _TABLE_ATTRS,
+    _guess_columns,
+    _guess_table,
+    _params_columns,
+    _to_params_dataset,
+)
+from xrfit.jacobian import _untied, _with_jacobian
+from xrfit.lean import _footprint, _make_lean
+from xrfit.lineshapes import _is_supported
 from xrfit.params import _set_bounds
+from xrfit.result import (
+    _DTYPES,
+    _FIT_STATS,
+    _PARAM_ATTRS,
+    _columns,
+    _param_exprs,
+    _to_dataset,
+)
+from xrfit.storage import save_result
+from xrfit.telemetry import Telemetry, _print_default, _record
 
 
 def _generalized_guess(model, data, x):
@@ -38,13 +68,390 @@ def _generalized_guess(model, data, x):
     raise ValueError(f"Model {model} does not support guess().")
 
 
+def _guess_chunk(model, data, x):
+    return [_generalized_guess(model, y, x) for y in data]
+
+
+def _fit_timed(model, data, params, **kws):
+    start = time.perf_counter()
+    result = model.fit(data, params, **_untied(kws, params, kws.get("x")))
+    return _record(result, time.perf_counter() - start)
+
+
+def _fit_pixel(model, data, params, *args, **kws):
+    return model.fit(data, params, *args, **_untied(kws, params, kws.get("x")))
+
+
+def _fit_chunk(model, data, params, weights, x, kws, param_names=None):
+    if weights is None:
+        weights = [None] * len(data)
+    results = [
+        _fit_timed(model, y, p, weights=w, x=x, **kws)
+        for y, p, w in zip(data, params, weights, strict=True)
+    ]
+    if param_names is None:
+        return results
+    # ship flat columns back instead of full ModelResults
+    return [_columns(result, param_names) for result in results]
+
+
+def _fit_columns(data, params, *args, model, param_names, **kws):
+    if args:
+        kws["weights"] = args[0]
+    kws = _untied(kws, params, kws.get("x"))
+    return _columns(model.fit(data, params, **kws), param_names)
+
+
+def _batched_chunk(model, data, x, value, vmin, vmax, vary, names, exprs, weights, kws):
+    return _batched_lm(
+        model, data, x, value, vmin, vmax, vary, names, exprs, weights, **kws
+    )
+
+
+def _fit_from(
+    result: lf.model.ModelResult,
+    params: lf.Parameters,
+    kws: dict,
+    bound_kws: dict | None,
+    previous_iter_crit_val: float,
+    index_dict: dict,
+) -> tuple:
+    """
+    Refit one pixel of `fit_with_corr` from `params`, narrowing bounds if asked.
+
+    Returns the result, the criterion value to compare the next pixel against
+    and the number of function evaluations spent. The timings and the bound
+    events are recorded on the result, see `xrfit.telemetry._record`.
+    """
+    start = time.perf_counter()
+    kws = _untied(kws, params, result.userkws.get("x"))
+    if bound_kws is None:
+        result.fit(params=params, **kws)
+        _record(result, time.perf_counter() - start)
+        return result, previous_iter_crit_val, result.nfev
+    iter_max = bound_kws["iter_max"]
+    iter_tol = bound_kws["iter_tol"]
+    nfev = 0
+    events = []
+    bound_iter = 0
+    for iter_idx in range(iter_max):
+        result.fit(params=params, **kws)
+        bound_iter = iter_idx + 1
+        nfev += result.nfev
+        new_bound_ratio = (
+            bound_kws["bound_ratio"] + bound_kws["bound_ratio_inc"] * iter_idx
+        )
+        result = _set_bounds(
+            result,
+            bound_ratio=new_bound_ratio,
+            bound_tol=bound_kws["bound_tol"],
+        )
+        params = result.params
+        iter_crit_val = getattr(result, bound_kws["iter_crit"])
+        iter_crit_ratio = (iter_crit_val - previous_iter_crit_val) / iter_crit_val
+        iter_crit_ratio = np.abs(iter_crit_ratio)
+        if iter_crit_ratio < iter_tol:
+            events.append(
+                (
+                    "bound_tol_reached",
+                    {
+                        "iteration": iter_idx,
+                        "iter_crit_ratio": iter_crit_ratio,
+                        "iter_tol": iter_tol,
+                    },
+                )
+            )
+            break
+        previous_iter_crit_val = iter_crit_val
+        if iter_idx == iter_max - 1:
+            events.append(
+                (
+                    "bound_iter_max",
+                    {
+                        "iteration": iter_idx,
+                        "index_dict": index_dict,
+                        "iter_crit_ratio": iter_crit_ratio,
+                        "iter_tol": iter_tol,
+                        "bound_ratio": new_bound_ratio,
+                    },
+                )
+            )
+    _record(result, time.perf_counter() - start, nfev, bound_iter, events)
+    return result, previous_iter_crit_val, nfev
+
+
+def _neighbors(shape: tuple) -> np.ndarray:
+    """Flat indices of the face neighbors of every pixel, -1 outside the grid."""
+    index = np.arange(int(np.prod(shape))).reshape(shape)
+    neighbors = []
+    for axis in range(len(shape)):
+        for shift in [-1, 1]:
+            neighbor = np.full(shape, -1)
+            src = [slice(None)] * len(shape)
+            dst = [slice(None)] * len(shape)
+            src[axis] = slice(max(shift, 0), shape[axis] + min(shift, 0))
+            dst[axis] = slice(max(-shift, 0), shape[axis] + min(-shift, 0))
+            neighbor[tuple(dst)] = index[tuple(src)]
+            neighbors.append(neighbor.reshape(-1))
+    return np.stack(neighbors, axis=1)
+
+
+def _traversal(
+    shape: tuple,
+    start: int,
+    traversal: Literal["raster", "bfs"],
+    neighbors: np.ndarray,
+) -> list:
+    """Return the passes of flat indices in which `fit_with_corr` refits pixels."""
+    total = int(np.prod(shape))
+    if traversal == "raster":
+        return [list(range(start, -1, -1)), list(range(start + 1, total))]
+    if traversal == "bfs":
+        order = [start]
+        seen = np.zeros(total, dtype=bool)
+        seen[start] = True
+        queue = deque([start])
+        while queue:
+            for neighbor in neighbors[queue.popleft()]:
+                if neighbor >= 0 and not seen[neighbor]:
+                    seen[neighbor] = True
+                    order.append(neighbor)
+                    queue.append(neighbor)
+        return [order]
+    raise ValueError("traversal must be 'raster' or 'bfs'.")
+
+
+def _seed(
+    results: list,
+    previous: int,
+    neighbors: np.ndarray,
+    fitted_at: np.ndarray,
+    seed: Literal["previous", "neighbor", "mean", "best"],
+    iter_crit: str,
+) -> lf.Parameters:
+    """Pick the starting parameters of a pixel from the refitted pixels."""
+    neighbors = neighbors[neighbors >= 0]
+    neighbors = neighbors[fitted_at[neighbors] >= 0]
+    if seed == "previous" or len(neighbors) == 0:
+        return results[previous].params
+    latest = neighbors[np.argmax(fitted_at[neighbors])]
+    if seed == "neighbor":
+        return results[latest].params
+    if seed == "best":
+        crit = np.array([getattr(results[i], iter_crit) for i in neighbors])
+        best = np.argmax(crit) if iter_crit == "rsquared" else np.argmin(crit)
+        return results[neighbors[best]].params
+    if seed == "mean":
+        params = results[latest].params.copy()
+        for name, par in params.items():
+            if not par.expr:
+                par.value = np.mean([results[i].params[name].value for i in neighbors])
+        return params
+    raise ValueError("seed must be 'previous', 'neighbor', 'mean' or 'best'.")
+
+
+def _walk_chain(
+    results: list,
+    shape: tuple,
+    start: int,
+    index_dicts: list,
+    kws: dict,
+    bound_kws: dict | None,
+    traversal: Literal["raster", "bfs"] = "raster",
+    seed: Literal["previous", "neighbor", "mean", "best"] = "previous",
+    iter_crit: str = "rsquared",
+    fitted_at: np.ndarray | list | None = None,
+    callback: Callable[[int, lf.model.ModelResult], None] | None = None,
+) -> tuple:
+    """
+    Refit a grid of pixels of shape `shape`, starting from the flat index `start`.
+
+    The default raster traversal walks backwards and then forwards from
+    `start`, seeding each pixel with the parameters of the pixel refitted
+    before it. Pixels with a non-negative `fitted_at` were refitted by a
+    previous run and are skipped. `callback` is called with the position and
+    result of every refitted pixel. Returns the refitted results and the total
+    number of function evaluations.
+    """
+    results = list(results)
+    neighbors = _neighbors(shape)
+    fitted_at = np.full(len(results), -1) if fitted_at is None else np.array(fitted_at)
+    n_fitted = int(fitted_at.max(initial=-1)) + 1
+    nfev = 0
+    for order in _traversal(shape, start, traversal, neighbors):
+        previous = start
+        previous_iter_crit_val = 0
+        for i in order:
+            if fitted_at[i] >= 0:
+                previous = i
+                continue
+            params = _seed(results, previous, neighbors[i], fitted_at, seed, iter_crit)
+            results[i], previous_iter_crit_val, pixel_nfev = _fit_from(
+                results[i],
+                params,
+                kws,
+                bound_kws,
+                previous_iter_crit_val,
+                index_dicts[i],
+            )
+            nfev += pixel_nfev
+            fitted_at[i] = n_fitted
+            n_fitted += 1
+            previous = i
+            if callback is not None:
+                callback(i, results[i])
+    return results, nfev
+
+
+def _walk_chains(chains, kws, bound_kws, traversal, seed, iter_crit):
+    return [
+        _walk_chain(
+            results,
+            shape,
+            start,
+            index_dicts,
+            kws,
+            bound_kws,
+            traversal,
+            seed,
+            iter_crit,
+            fitted_at,
+        )
+        for results, shape, start, index_dicts, fitted_at in chains
+    ]
+
+
 @xr.register_dataarray_accessor("fit")
 class FitAccessor(DataArrayAccessor):
+    def _other_dims(self, input_core_dims: str) -> list:
+        return [dim for dim in self._obj.dims if dim != input_core_dims]
+
+    def _stack(
+        self,
+        darr: xr.DataArray,
+        input_core_dims: str,
+    ) -> np.ndarray:
+        """Broadcast `darr` against the data and flatten all non-core dims."""
+        dims = self._other_dims(input_core_dims)
+        if input_core_dims in darr.dims:
+            darr = darr.broadcast_like(self._obj).transpose(*dims, input_core_dims)
+            return darr.values.reshape(-1, self._obj.sizes[input_core_dims])
+        template = self._obj.isel({input_core_dims: 0}, drop=True)
+        return darr.broadcast_like(template).transpose(*dims).values.reshape(-1)
+
+    def _unstack(
+        self,
+        values: list,
+        input_core_dims: str,
+    ) -> xr.DataArray:
+        """Put flattened per-pixel objects back on the non-core dims of the data."""
+        dims = self._other_dims(input_core_dims)
+        out = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            out[i] = value
+        return xr.DataArray(
+            out.reshape([self._obj.sizes[dim] for dim in dims]),
+            coords={
+                name: coord
+                for name, coord in self._obj.coords.items()
+                if input_core_dims not in coord.dims
+            },
+            dims=dims,
+        )
+
+    def _split(
+        self,
+        input_core_dims: str,
+        executor: Executor | None,
+        n_workers: int | None,
+    ) -> list:
+        """Split the flattened pixel index into chunks for the workers."""
+        n_pixels = int(
+            np.prod([self._obj.sizes[d] for d in self._other_dims(input_core_dims)])
+        )
+        n_chunks = min(n_pixels, 4 * _n_workers(executor, n_workers))
+        return np.array_split(np.arange(n_pixels), n_chunks)
+
+    def _rechunk(
+        self,
+        darr: xr.DataArray,
+        input_core_dims: str,
+    ) -> xr.DataArray:
+        """Merge the chunks of the core dim, as required by dask="parallelized"."""
+        if darr.chunks is None or input_core_dims not in darr.dims:
+            return darr
+        return darr.chunk({input_core_dims: -1})
+
+    def _chunk_like(
+        self,
+        darr: xr.DataArray,
+    ) -> xr.DataArray:
+        """Chunk an object DataArray like lazy data, as dask can not guess it."""
+        if self._obj.chunks is None or darr.chunks is not None:
+            return darr
+        return darr.chunk({dim: self._obj.chunksizes[dim] for dim in darr.dims})
+
+    def _first_params(
+        self,
+        model: lf.model.Model,
+        params: xr.DataArray | xr.Dataset | None,
+        input_core_dims: str,
+    ) -> lf.Parameters:
+        """
+        Parameters of the first pixel, before fitting.
+
+        Lazy and columnar results need the parameter names before any pixel is
+        fitted. They are taken from the guess of a single pixel.
+        """
+        x = getattr(self._obj, input_core_dims).values
+        first = dict.fromkeys(self._other_dims(input_core_dims), 0)
+        if isinstance(params, xr.Dataset):
+            return params.fit.parameters(
+                {dim: 0 for dim in params["value"].dims if dim in first}
+            )
+        first_params = _generalized_guess(model, self._obj.isel(first).values, x)
+        if params is not None:
+            first_params.update(
+                params.isel({dim: 0 for dim in params.dims if dim in first}).item()
+            )
+        return first_params
+
+    def _to_dataset(
+        self,
+        columns: tuple,
+        param_names: list,
+        exprs: list,
+        model: lf.model.Model,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+    ) -> xr.Dataset:
+        dims = self._other_dims(input_core_dims)
+        ds = _to_dataset(
+            columns,
+            coords=dict(self._obj.coords),
+            dims=dims,
+            param_names=param_names,
+            exprs=exprs,
+            data=self._obj.variable,
+            model=model,
+            input_core_dims=input_core_dims,
+        )
+        if weights is not None:
+            ds["weights"] = (
+                weights
+                if isinstance(weights, xr.DataArray)
+                else xr.DataArray(weights, dims=[input_core_dims])
+            )
+        return ds
+
     def guess(
         self,
         model: lf.model.Model,
         input_core_dims: str = "x",
-    ) -> xr.DataArray:
+        executor: Executor | None = None,
+        n_workers: int | None = None,
+        output: Literal["parameters", "dataset"] = "parameters",
+    ) -> xr.DataArray | xr.Dataset:
         """
         Generate initial guess for the model parameters.
 
@@ -52,19 +459,53 @@ class FitAccessor(DataArrayAccessor):
             The model for which to generate the initial guess.
         input_core_dims : str, optional
             The dimension name in the xarray object to be used as input for the model's guess function. Default is "x".
+        executor : concurrent.futures.Executor or None, optional
+            Executor used to run the guesses in chunks of pixels. Default is None.
+        n_workers : int or None, optional
+            Number of worker processes. If given without `executor`, a process pool
+            is created for this call. Default is None, which runs serially.
+        output : {"parameters", "dataset"}, optional
+            "parameters" returns an object DataArray of lmfit Parameters.
+            "dataset" returns a parameter table with `value`, `min`, `max` and
+            `vary` arrays along a `param` coordinate. Built-in peak, constant and
+            polynomial models are guessed for all pixels at once, and Parameters
+            are only built on request through ``ds.fit``. The executor is not used
+            for this output. Default is "parameters".
 
         Returns
         -------
-        xr.DataArray
+        xr.DataArray or xr.Dataset
             An xarray DataArray containing the initial guess for the model parameters.
 
         Notes
         -----
         This method uses `xr.apply_ufunc` to apply the model's guess function to the data
         """
+        if output == "dataset":
+            return self._guess_dataset(model, input_core_dims)
+        return self._guess_parameters(model, input_core_dims, executor, n_workers)
+
+    def _guess_parameters(
+        self,
+        model: lf.model.Model,
+        input_core_dims: str,
+        executor: Executor | None,
+        n_workers: int | None,
+    ) -> xr.DataArray:
+        if executor is not None or n_workers is not None:
+            x = getattr(self._obj, input_core_dims).values
+            data = self._stack(self._obj, input_core_dims)
+            chunks = [
+                (model, data[idx], x)
+                for idx in self._split(input_core_dims, executor, n_workers)
+            ]
+            guesses = _map_chunks(_guess_chunk, chunks, executor, n_workers)
+            return self._unstack(
+                [params for chunk in guesses for params in chunk], input_core_dims
+            )
         return xr.apply_ufunc(
             lambda data, x: _generalized_guess(model, data, x),
-            self._obj,
+            self._rechunk(self._obj, input_core_dims),
             input_core_dims=[[input_core_dims]],
             kwargs={
                 "x": getattr(self._obj, input_core_dims).values,
@@ -74,6 +515,394 @@ class FitAccessor(DataArrayAccessor):
             output_dtypes=[object],
         )
 
+    def _guess_dataset(
+        self,
+        model: lf.model.Model,
+        input_core_dims: str,
+    ) -> xr.Dataset:
+        x = getattr(self._obj, input_core_dims).values
+        first = dict.fromkeys(self._other_dims(input_core_dims), 0)
+        table = _guess_table(model, self._obj.isel(first).values[None], x)
+        param_names = list(table.keys())
+        columns = xr.apply_ufunc(
+            _guess_columns,
+            self._rechunk(self._obj, input_core_dims),
+            input_core_dims=[[input_core_dims]],
+            output_core_dims=[["param"] for _ in _TABLE_ATTRS],
+            kwargs={"x": x, "model": model, "param_names": param_names},
+            dask="parallelized",
+            output_dtypes=[_DTYPES.get(attr, float) for attr in _TABLE_ATTRS],
+            dask_gufunc_kwargs={"output_sizes": {"param": len(param_names)}},
+        )
+        return _to_params_dataset(
+            columns,
+            param_names,
+            [column["expr"] for column in table.values()],
+            model,
+            input_core_dims,
+        )
+
+    def _params_dataset(
+        self,
+        model: lf.model.Model,
+        params: xr.DataArray,
+        input_core_dims: str,
+    ) -> xr.Dataset:
+        """Convert an object DataArray of Parameters to a parameter table."""
+        first_params = params.values.flat[0]
+        param_names = list(first_params.keys())
+        columns = xr.apply_ufunc(
+            _params_columns,
+            params,
+            output_core_dims=[["param"] for _ in _TABLE_ATTRS],
+            kwargs={"param_names": param_names},
+            vectorize=True,
+            output_dtypes=[_DTYPES.get(attr, float) for attr in _TABLE_ATTRS],
+        )
+        return _to_params_dataset(
+            columns,
+            param_names,
+            [par.expr or "" for par in first_params.values()],
+            model,
+            input_core_dims,
+        )
+
+    def _guesses(
+        self,
+        model: lf.model.Model,
+        params: xr.DataArray | xr.Dataset | None,
+        input_core_dims: str,
+        executor: Executor | None,
+        n_workers: int | None,
+    ) -> xr.DataArray:
+        """Guess the Parameters of every pixel and update them with `params`."""
+        if isinstance(params, xr.Dataset):
+            return self._chunk_like(params.fit.to_parameters())
+        guesses = self._guess_parameters(model, input_core_dims, executor, n_workers)
+        if params is None:
+            return guesses
+        return self._update(guesses, self._chunk_like(params))
+
+    def _fit_checkpointed(
+        self,
+        model: lf.model.Model,
+        guesses: xr.DataArray,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+        executor: Executor | None,
+        n_workers: int | None,
+        kws: dict,
+        checkpoint: _Checkpoint,
+        telemetry: Telemetry,
+    ) -> list:
+        """
+        Fit the pixels not yet completed in `checkpoint`, recording every result.
+
+        Returns the flat list of ModelResults, with None for the pixels completed
+        by a previous run.
+        """
+        x = getattr(self._obj, input_core_dims).values
+        data = self._stack(self._obj, input_core_dims)
+        guesses = self._stack(guesses, input_core_dims)
+        stacked_weights = self._stack_weights(weights, input_core_dims)
+        checkpoint.stage(
+            "fit",
+            len(data),
+            list(guesses[0].keys()),
+            [par.expr or "" for par in guesses[0].values()],
+        )
+        todo = np.flatnonzero(~checkpoint.done("fit"))
+        results = [None] * len(data)
+
+        def record(idx, chunk_results):
+            for i, result in zip(idx, chunk_results, strict=True):
+                results[i] = result
+                telemetry.pixel(i, result)
+                checkpoint.record("fit", i, result)
+
+        def chunk(idx):
+            return (
+                model,
+                data[idx],
+                guesses[idx],
+                None if stacked_weights is None else stacked_weights[idx],
+                x,
+                kws,
+            )
+
+        if executor is not None and todo.size:
+            # chunks no larger than a flush, so that workers report back often
+            n_chunks = max(
+                4 * _n_workers(executor, n_workers),
+                int(np.ceil(todo.size / checkpoint.every)),
+            )
+            chunks = np.array_split(todo, min(todo.size, n_chunks))
+            _map_chunks(
+                _fit_chunk,
+                [chunk(idx) for idx in chunks],
+                executor,
+                n_workers,
+                callback=lambda i, chunk_results: record(chunks[i], chunk_results),
+            )
+        else:
+            for i in todo:
+                record([i], _fit_chunk(*chunk([i])))
+        checkpoint.flush()
+        return results
+
+    def _checkpointed_output(
+        self,
+        results: list,
+        checkpoint: _Checkpoint,
+        stage: str,
+        model: lf.model.Model,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+        output: Literal["modelresult", "dataset"],
+    ) -> xr.DataArray | xr.Dataset:
+        """Assemble the output from fitted results and the checkpointed columns."""
+        dims = self._other_dims(input_core_dims)
+        shape = [self._obj.sizes[dim] for dim in dims]
+        ds = self._to_dataset(
+            tuple(
+                column.reshape(*shape, *column.shape[1:])
+                for column in checkpoint.columns(stage)
+            ),
+            *checkpoint.param_names(stage),
+            model,
+            weights,
+            input_core_dims,
+        )
+        if output == "dataset":
+            return ds
+        return self._unstack(
+            [
+                result
+                if result is not None
+                else ds.fit.modelresult(
+                    dict(zip(dims, np.unravel_index(i, shape), strict=True))
+                )
+                for i, result in enumerate(results)
+            ],
+            input_core_dims,
+        )
+
+    def _refit(
+        self,
+        model: lf.model.Model,
+        params: xr.DataArray | xr.Dataset | None,
+        where: xr.DataArray | Callable,
+        previous: xr.DataArray,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+        executor: Executor | None,
+        n_workers: int | None,
+        kws: dict,
+        telemetry: Telemetry,
+    ) -> xr.DataArray:
+        """
+        Fit the pixels selected by `where` and reuse `previous` everywhere else.
+
+        The refit pixels are seeded from `params` where given, and otherwise from
+        the Parameters of their previous ModelResults.
+        """
+        if callable(where):
+            where = where(previous)
+        mask = self._stack(where, input_core_dims).astype(bool)
+        results = list(self._stack(previous, input_core_dims))
+        todo = np.flatnonzero(mask)
+
+        if isinstance(params, xr.Dataset):
+            params = params.fit.to_parameters()
+        seeds = None if params is None else self._stack(params, input_core_dims)
+        guesses = np.empty(todo.size, dtype=object)
+        for j, i in enumerate(todo):
+            guesses[j] = results[i].params.copy()
+            if seeds is not None:
+                guesses[j].update(seeds[i])
+
+        x = getattr(self._obj, input_core_dims).values
+        data = self._stack(self._obj, input_core_dims)[todo]
+        stacked_weights = self._stack_weights(weights, input_core_dims)
+        if stacked_weights is not None:
+            stacked_weights = stacked_weights[todo]
+
+        def record(idx, chunk_results):
+            for j, result in zip(idx, chunk_results, strict=True):
+                results[todo[j]] = result
+                telemetry.pixel(todo[j], result)
+
+        start = time.perf_counter()
+        with telemetry.stage("fit", todo.size):
+            if executor is not None and todo.size:
+                chunks = np.array_split(
+                    np.arange(todo.size),
+                    min(todo.size, 4 * _n_workers(executor, n_workers)),
+                )
+                _map_chunks(
+                    _fit_chunk,
+                    [
+                        (
+                            model,
+                            data[idx],
+                            guesses[idx],
+                            None if stacked_weights is None else stacked_weights[idx],
+                            x,
+                            kws,
+                        )
+                        for idx in chunks
+                    ],
+                    executor,
+                    n_workers,
+                    callback=lambda k, chunk_results: record(chunks[k], chunk_results),
+                )
+            else:
+                for j in range(todo.size):
+                    record(
+                        [j],
+                        _fit_chunk(
+                            model,
+                            data[[j]],
+                            guesses[[j]],
+                            None if stacked_weights is None else stacked_weights[[j]],
+                            x,
+                            kws,
+                        ),
+                    )
+        elapsed = time.perf_counter() - start
+
+        n_reused = len(results) - todo.size
+        saved = elapsed / todo.size * n_reused if todo.size else 0.0
+        telemetry.emit(
+            "refit_done",
+            n_refit=int(todo.size),
+            n_pixels=len(results),
+            time=elapsed,
+            saved=saved,
+        )
+        with telemetry.stage("assemble"):
+            fit_results = self._unstack(results, input_core_dims)
+        fit_results.attrs.update(
+            {
+                "n_refit": int(todo.size),
+                "n_reused": n_reused,
+                "refit_time": elapsed,
+                "time_saved": saved,
+            }
+        )
+        return fit_results
+
+    def _stack_weights(
+        self,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+    ) -> np.ndarray | None:
+        if weights is None:
+            return None
+        return self._stack(
+            weights
+            if isinstance(weights, xr.DataArray)
+            else xr.DataArray(weights, dims=[input_core_dims]),
+            input_core_dims,
+        )
+
+    def _fit_batched(
+        self,
+        model: lf.model.Model,
+        table: xr.Dataset,
+        weights: xr.DataArray | np.ndarray | None,
+        input_core_dims: str,
+        output: Literal["modelresult", "dataset"],
+        executor: Executor | None,
+        n_workers: int | None,
+        **kws,
+    ) -> xr.DataArray | xr.Dataset:
+        """Fit all pixels together with the vectorized Levenberg-Marquardt solver."""
+        if not _is_supported(model):
+            raise ValueError(
+                "method='batched_lm' only supports sums and products of built-in "
+                "Lorentzian, Gaussian, Voigt, linear and constant models."
+            )
+        x = getattr(self._obj, input_core_dims).values
+        data = self._stack(self._obj, input_core_dims)
+        stacked_weights = self._stack_weights(weights, input_core_dims)
+        names = list(table["param"].values)
+        exprs = [str(expr) for expr in table["expr"].values]
+        dims = self._other_dims(input_core_dims)
+        template = self._obj.isel({input_core_dims: 0}, drop=True)
+        table = {
+            attr: table[attr]
+            .broadcast_like(template)
+            .transpose(*dims, "param")
+            .values.reshape(-1, len(names))
+            for attr in _TABLE_ATTRS
+        }
+
+        def chunk(idx):
+            return (
+                model,
+                data[idx],
+                x,
+                *(table[attr][idx] for attr in _TABLE_ATTRS),
+                names,
+                exprs,
+                None if stacked_weights is None else stacked_weights[idx],
+                kws,
+            )
+
+        if executor is not None or n_workers is not None:
+            blocks = _map_chunks(
+                _batched_chunk,
+                [
+                    chunk(idx)
+                    for idx in self._split(input_core_dims, executor, n_workers)
+                ],
+                executor,
+                n_workers,
+            )
+            columns = tuple(
+                np.concatenate(column) for column in zip(*blocks, strict=True)
+            )
+        else:
+            columns = _batched_chunk(*chunk(slice(None)))
+        shape = [self._obj.sizes[dim] for dim in self._other_dims(input_core_dims)]
+        columns = tuple(column.reshape(*shape, *column.shape[1:]) for column in columns)
+        ds = self._to_dataset(columns, names, exprs, model, weights, input_core_dims)
+        return ds if output == "dataset" else ds.fit.to_dataarray()
+
+    def _lean(
+        self,
+        fit_results: xr.DataArray,
+        input_core_dims: str,
+        telemetry: Telemetry,
+    ) -> None:
+        """Make the ModelResults of a fit of this data lean in place."""
+        values = fit_results.values
+        before = _footprint(list(values.flat))
+        x = np.array(getattr(self._obj, input_core_dims).values)
+        x.flags.writeable = False
+        # a read-only view, the data itself stays writeable
+        data = self._obj.transpose(*fit_results.dims, input_core_dims).values.view()
+        data.flags.writeable = False
+        for index in np.ndindex(values.shape):
+            _make_lean(values[index], x, data[index])
+        telemetry.emit("lean", before=before, after=_footprint(list(values.flat)))
+
+    def memory_report(self) -> dict:
+        """
+        Report the bytes per pixel held by a DataArray of ModelResults.
+
+        Buffers shared between pixels, such as the x axis of lean results or
+        the data they view, are counted once and spread over all pixels.
+
+        Returns
+        -------
+        dict
+            Bytes per pixel of the "x" axis, the "data" and weights, the stored
+            "curves" (`best_fit`, `init_fit` and `residual`) and their "total".
+        """
+        return _footprint(list(self._obj.values.flat))
+
     def _update(
         self,
         params: xr.DataArray,
@@ -110,10 +939,21 @@ class FitAccessor(DataArrayAccessor):
     def __call__(
         self,
         model: lf.model.Model,
-        params: xr.DataArray | None = None,
+        params: xr.DataArray | xr.Dataset | None = None,
         input_core_dims: str = "x",
+        executor: Executor | None = None,
+        n_workers: int | None = None,
+        output: Literal["modelresult", "dataset"] = "modelresult",
+        checkpoint: str | os.PathLike | None = None,
+        checkpoint_every: int = 100,
+        checkpoint_interval: float = 60.0,
+        resume: bool = False,
+        where: xr.DataArray | Callable | None = None,
+        previous: xr.DataArray | None = None,
+        telemetry: Telemetry | None = None,
+        lean: bool = False,
         **kws,
-    ) -> lf.model.ModelResult:
+    ) -> xr.DataArray | xr.Dataset:
         """
         Call method to fit a model to the data.
 
@@ -121,39 +961,595 @@ class FitAccessor(DataArrayAccessor):
         ----------
         model : lf.model.Model
             The model to be fitted.
-        params : xr.DataArray or None, optional
+        params : xr.DataArray or xr.Dataset or None, optional
             The parameters for the model. If None, parameters will be guessed.
+            A parameter table, as returned by ``guess(output="dataset")`` or by a
+            fit with ``output="dataset"``, is used as is instead of a guess.
         input_core_dims : str, optional
             The dimension name for the input data, by default "x".
+        executor : concurrent.futures.Executor or None, optional
+            Executor used to fit chunks of pixels in parallel, by default None.
+        n_workers : int or None, optional
+            Number of worker processes. If given without `executor`, a process pool
+            is created for this call. By default None, which fits serially.
+        output : {"modelresult", "dataset"}, optional
+            "modelresult" returns an object DataArray of lmfit ModelResults.
+            "dataset" returns a columnar Dataset with one array per parameter
+            attribute and fit statistic along a `param` coordinate, from which
+            ModelResults are only rebuilt on request through ``ds.fit``.
+            By default "modelresult".
+        checkpoint : str or os.PathLike or None, optional
+            Directory to which the parameters and fit statistics of completed
+            pixels are flushed, so that a crashed run can be resumed. Every flush
+            only writes the pixels completed since the previous one. Not
+            supported for dask-backed data. By default None.
+        checkpoint_every : int, optional
+            Flush the checkpoint after this many completed pixels, by default 100.
+        checkpoint_interval : float, optional
+            Flush the checkpoint after this many seconds, by default 60.
+        resume : bool, optional
+            Skip the pixels already completed in `checkpoint`. Their ModelResults
+            are rebuilt from the stored columns. By default False.
+        where : xr.DataArray or callable or None, optional
+            Refit only the pixels where this boolean array is True, reusing the
+            ModelResults of `previous` everywhere else. A callable is passed
+            `previous` and returns the mask, e.g.
+            ``lambda r: r.assess.fit_stats("rsquared") < 0.9``. The refit pixels
+            are seeded from `params`, or from their previous Parameters. Not
+            supported for dask-backed data, batched_lm or checkpoints. The
+            result has the attributes `n_refit`, `n_reused`, `refit_time` in
+            seconds and `time_saved`, the seconds the reused pixels would have
+            taken at the mean refit time. By default None, which fits every
+            pixel.
+        previous : xr.DataArray or None, optional
+            DataArray of ModelResults from an earlier fit of the same data,
+            required with `where`.
+        telemetry : xrfit.telemetry.Telemetry or None, optional
+            Records the wall time and number of function evaluations of every
+            pixel and the time of every stage, and passes the events of the fit
+            on to its callbacks. With ``output="dataset"`` the pixels are fitted
+            as ModelResults, which carry the timings, and converted afterwards.
+            Per-pixel wall times are not recorded for batched_lm. Not supported
+            for dask-backed data. By default None.
+        lean : bool, optional
+            Keep the ModelResults small: all pixels reference one read-only copy
+            of the x axis and read-only views into the data, instead of copies
+            of their own, and `best_fit`, `init_fit` and `residual` are
+            evaluated when accessed instead of stored. The data must then not
+            be modified in place. The bytes per pixel before and after are
+            reported, see `memory_report`. Only for ``output="modelresult"``
+            and numpy-backed data. By default False.
+        **kws
+            Passed on to `lmfit.Model.fit`. ``method="batched_lm"`` instead fits
+            all pixels together with a vectorized Levenberg-Marquardt solver,
+            which supports sums and products of the built-in Lorentzian,
+            Gaussian, Voigt, linear and constant models. It accepts the
+            `max_nfev`, `ftol`, `xtol` and `batch_size` keywords. Uncertainties
+            of constrained parameters are not propagated by this solver.
+            Models made only of the built-ins supported by this solver are fit
+            by "leastsq" and "least_squares" with their analytic Jacobian. Pass
+            ``fit_kws={"Dfun": None}`` for finite differences instead, which
+            are also used for pixels whose components start out identical.
 
         Returns
         -------
-        xr.DataArray
+        xr.DataArray or xr.Dataset
             The result of the model fitting.
 
         """
-        guesses = self.guess(model, input_core_dims)
-        guesses = self._update(guesses, params) if params is not None else guesses
+        if executor is None and n_workers is not None:
+            # share one pool between the guess and the fit
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                return self.__call__(
+                    model=model,
+                    params=params,
+                    input_core_dims=input_core_dims,
+                    executor=pool,
+                    n_workers=n_workers,
+                    output=output,
+                    checkpoint=checkpoint,
+                    checkpoint_every=checkpoint_every,
+                    checkpoint_interval=checkpoint_interval,
+                    resume=resume,
+                    where=where,
+                    previous=previous,
+                    telemetry=telemetry,
+                    lean=lean,
+                    **kws,
+                )
+        if lean:
+            if output != "modelresult" or self._obj.chunks is not None:
+                raise ValueError(
+                    "lean only applies to ModelResults of numpy-backed data."
+                )
+            if telemetry is None:
+                telemetry = Telemetry()
+            fit_results = self.__call__(
+                model=model,
+                params=params,
+                input_core_dims=input_core_dims,
+                executor=executor,
+                n_workers=n_workers,
+                checkpoint=checkpoint,
+                checkpoint_every=checkpoint_every,
+                checkpoint_interval=checkpoint_interval,
+                resume=resume,
+                where=where,
+                previous=previous,
+                telemetry=telemetry,
+                **kws,
+            )
+            fit_results = cast("xr.DataArray", fit_results)
+            with telemetry.stage("assemble"):
+                self._lean(fit_results, input_core_dims, telemetry)
+            return fit_results
+        if telemetry is None:
+            telemetry = Telemetry()
+        else:
+            if self._obj.chunks is not None:
+                raise ValueError("telemetry is not supported for dask-backed data.")
+            if (
+                output == "dataset"
+                and where is None
+                and checkpoint is None
+                and kws.get("method") != "batched_lm"
+            ):
+                # the timings travel on the ModelResults
+                fit_results = self.__call__(
+                    model=model,
+                    params=params,
+                    input_core_dims=input_core_dims,
+                    executor=executor,
+                    n_workers=n_workers,
+                    telemetry=telemetry,
+                    **kws,
+                )
+                with telemetry.stage("assemble"):
+                    return fit_results.fit.to_dataset(input_core_dims)
+            telemetry._allocate(self._obj.isel({input_core_dims: 0}, drop=True))
+        x = getattr(self._obj, input_core_dims).values
+        weights = kws.pop("weights", None)
+        kws = _with_jacobian(model, kws)
+        if where is not None:
+            if previous is None:
+                raise ValueError("where requires the previous ModelResults.")
+            if (
+                self._obj.chunks is not None
+                or checkpoint is not None
+                or kws.get("method") == "batched_lm"
+            ):
+                raise ValueError(
+                    "where is not supported for dask-backed data, batched_lm or "
+                    "checkpoints."
+                )
+            fit_results = self._refit(
+                model,
+                params,
+                where,
+                previous,
+                weights,
+                input_core_dims,
+                executor,
+                n_workers,
+                kws,
+                telemetry,
+            )
+            if output == "dataset":
+                with telemetry.stage("assemble"):
+                    table = fit_results.fit.to_dataset(input_core_dims)
+                table.attrs.update(fit_results.attrs)
+                return table
+            return fit_results
+        if checkpoint is not None and (
+            self._obj.chunks is not None or kws.get("method") == "batched_lm"
+        ):
+            raise ValueError(
+                "checkpoint is not supported for dask-backed data or batched_lm."
+            )
+        if kws.get("method") == "batched_lm":
+            kws.pop("method")
+            with telemetry.stage("guess"):
+                if isinstance(params, xr.Dataset):
+                    table = params
+                elif params is None:
+                    table = self._guess_dataset(model, input_core_dims)
+                else:
+                    table = self._params_dataset(
+                        model,
+                        self._update(
+                            self._guess_parameters(
+                                model, input_core_dims, executor, n_workers
+                            ),
+                            params,
+                        ),
+                        input_core_dims,
+                    )
+            with telemetry.stage("fit"):
+                ds = self._fit_batched(
+                    model,
+                    table,
+                    weights,
+                    input_core_dims,
+                    "dataset",
+                    executor,
+                    n_workers,
+                    **kws,
+                )
+            # all pixels are iterated together, without a wall time of their own
+            telemetry._add(slice(None), np.nan, ds["nfev"].values.reshape(-1), 0)
+            if output == "dataset":
+                return ds
+            with telemetry.stage("assemble"):
+                return ds.fit.to_dataarray()
+        with telemetry.stage("guess"):
+            guesses = self._guesses(model, params, input_core_dims, executor, n_workers)
+        n_pixels = int(
+            np.prod([self._obj.sizes[d] for d in self._other_dims(input_core_dims)])
+        )
+        if checkpoint is not None:
+            checkpoint = _Checkpoint(
+                checkpoint, checkpoint_every, checkpoint_interval, resume
+            )
+            with telemetry.stage("fit", n_pixels):
+                results = self._fit_checkpointed(
+                    model,
+                    guesses,
+                    weights,
+                    input_core_dims,
+                    executor,
+                    n_workers,
+                    kws,
+                    checkpoint,
+                    telemetry,
+                )
+            with telemetry.stage("assemble"):
+                return self._checkpointed_output(
+                    results, checkpoint, "fit", model, weights, input_core_dims, output
+                )
+        first_params = (
+            self._first_params(model, params, input_core_dims)
+            if output == "dataset" or self._obj.chunks is not None
+            else {}
+        )
+        param_names = list(first_params.keys())
+        exprs = [par.expr or "" for par in first_params.values()]
+
+        if executor is not None or n_workers is not None:
+            data = self._stack(self._obj, input_core_dims)
+            guesses = self._stack(guesses, input_core_dims)
+            stacked_weights = self._stack_weights(weights, input_core_dims)
+            split = self._split(input_core_dims, executor, n_workers)
+            chunks = [
+                (
+                    model,
+                    data[idx],
+                    guesses[idx],
+                    None if stacked_weights is None else stacked_weights[idx],
+                    x,
+                    kws,
+                    param_names if output == "dataset" else None,
+                )
+                for idx in split
+            ]
 
-        args = [kws.pop(name) for name in ["weights"] if name in kws]
+            def record(k, chunk_results):
+                if output != "dataset":
+                    for i, result in zip(split[k], chunk_results, strict=True):
+                        telemetry.pixel(i, result)
+
+            with telemetry.stage("fit", n_pixels):
+                results = _map_chunks(
+                    _fit_chunk, chunks, executor, n_workers, callback=record
+                )
+            results = [result for chunk in results for result in chunk]
+            with telemetry.stage("assemble"):
+                if output != "dataset":
+                    return self._unstack(results, input_core_dims)
+                shape = [
+                    self._obj.sizes[dim] for dim in self._other_dims(input_core_dims)
+                ]
+                columns = tuple(
+                    np.stack(column).reshape(*shape, *np.shape(column[0]))
+                    for column in zip(*results, strict=True)
+                )
+                return self._to_dataset(
+                    columns, param_names, exprs, model, weights, input_core_dims
+                )
+
+        args = [] if weights is None else [self._rechunk(weights, input_core_dims)]
         input_core_dims_new = [
             [input_core_dims],
             [],
             *[[input_core_dims] for _ in args],
         ]
-        return xr.apply_ufunc(
-            model.fit,
-            self._obj,
-            guesses,
-            *args,
-            input_core_dims=input_core_dims_new,
-            kwargs={
-                "x": getattr(self._obj, input_core_dims).values,
-                **kws,
-            },
-            vectorize=True,
-            dask="parallelized",
+        if output == "dataset":
+            with telemetry.stage("fit"):
+                columns = xr.apply_ufunc(
+                    _fit_columns,
+                    self._rechunk(self._obj, input_core_dims),
+                    guesses,
+                    *args,
+                    input_core_dims=input_core_dims_new,
+                    output_core_dims=[["param"] for _ in _PARAM_ATTRS]
+                    + [[] for _ in _FIT_STATS],
+                    kwargs={
+                        "model": model,
+                        "param_names": param_names,
+                        "x": x,
+                        **kws,
+                    },
+                    vectorize=True,
+                    dask="parallelized",
+                    output_dtypes=[
+                        _DTYPES.get(name, float) for name in _PARAM_ATTRS + _FIT_STATS
+                    ],
+                    dask_gufunc_kwargs={"output_sizes": {"param": len(param_names)}},
+                )
+            with telemetry.stage("assemble"):
+                return self._to_dataset(
+                    tuple(column.data for column in columns),
+                    param_names,
+                    exprs,
+                    model,
+                    weights,
+                    input_core_dims,
+                )
+
+        fit_pixel: Callable = functools.partial(_fit_pixel, model)
+        if self._obj.chunks is None:
+            # vectorize walks the pixels in the order of the flat index
+            index = iter(range(n_pixels))
+
+            def fit_pixel(*args, **kws):
+                result = _fit_timed(model, *args, **kws)
+                telemetry.pixel(next(index), result)
+                return result
+
+        with telemetry.stage("fit", n_pixels if self._obj.chunks is None else None):
+            fit_results = xr.apply_ufunc(
+                fit_pixel,
+                self._rechunk(self._obj, input_core_dims),
+                guesses,
+                *args,
+                input_core_dims=input_core_dims_new,
+                kwargs={
+                    "x": x,
+                    **kws,
+                },
+                vectorize=True,
+                dask="parallelized",
+                output_dtypes=[object],
+            )
+        if fit_results.chunks is not None:
+            fit_results.attrs.update({"param_names": list(first_params.keys()), "x": x})
+        return fit_results
+
+    def to_dataset(
+        self,
+        input_core_dims: str = "x",
+    ) -> xr.Dataset:
+        """
+        Convert a DataArray of ModelResults into a columnar fit result Dataset.
+
+        Parameters
+        ----------
+        input_core_dims : str, optional
+            The dimension name for the x axis of the fits, by default "x".
+
+        Returns
+        -------
+        xr.Dataset
+            The same layout as ``__call__(..., output="dataset")``.
+        """
+        results = self._obj.values
+        first = results.flat[0]
+        param_names = list(first.params.keys())
+        rows = [_columns(result, param_names) for result in results.flat]
+        columns = tuple(
+            np.stack(column).reshape(*results.shape, *np.shape(column[0]))
+            for column in zip(*rows, strict=True)
+        )
+        x = first.userkws["x"]
+        ds = _to_dataset(
+            columns,
+            coords={**self._obj.coords, input_core_dims: x},
+            dims=list(self._obj.dims),
+            param_names=param_names,
+            exprs=_param_exprs(first, param_names),
+            data=xr.Variable(
+                [*self._obj.dims, input_core_dims],
+                np.stack([result.data for result in results.flat]).reshape(
+                    *results.shape, len(x)
+                ),
+            ),
+            model=first.model,
+            input_core_dims=input_core_dims,
         )
+        if first.weights is not None:
+            ds["weights"] = (
+                [*self._obj.dims, input_core_dims],
+                np.stack([result.weights for result in results.flat]).reshape(
+                    *results.shape, len(x)
+                ),
+            )
+        return ds
+
+    def save(
+        self,
+        path: str | os.PathLike,
+        input_core_dims: str = "x",
+        **kwargs,
+    ) -> None:
+        """
+        Write a DataArray of ModelResults to netCDF or Zarr.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Destination file, or Zarr store if it ends in ".zarr".
+        input_core_dims : str, optional
+            The dimension name for the x axis of the fits, by default "x".
+        **kwargs
+            Passed on to `xr.Dataset.to_netcdf` or `xr.Dataset.to_zarr`.
+
+        Notes
+        -----
+        The columnar layout of `to_dataset` is stored, with the model described
+        as JSON. Open it with `xrfit.open_result`.
+        """
+        save_result(self.to_dataset(input_core_dims), path, **kwargs)
+
+    def _resample(
+        self,
+        table: xr.Dataset,
+        target: xr.DataArray,
+        dims: list,
+    ) -> xr.Dataset:
+        """
+        Carry a parameter table over to the grid of `target` along `dims`.
+
+        Values are interpolated linearly between the pixels of `table`, and
+        bounds, vary and values beyond its outermost pixels are taken from the
+        nearest pixel.
+        """
+        coords = {dim: target[dim].values for dim in dims}
+        nearest = table[_TABLE_ATTRS].sel(coords, method="nearest")
+        nearest = nearest.assign_coords({dim: target[dim] for dim in dims})
+        if all(table.sizes[dim] > 1 for dim in dims):
+            value = table["value"].interp(coords)
+            nearest["value"] = value.fillna(nearest["value"])
+        return nearest
+
+    def pyramid(
+        self,
+        model: lf.model.Model,
+        params: xr.DataArray | xr.Dataset | None = None,
+        levels: int = 3,
+        factor: int = 2,
+        dims: list | None = None,
+        input_core_dims: str = "x",
+        output: Literal["modelresult", "dataset"] = "modelresult",
+        telemetry: Telemetry | None = None,
+        lean: bool = False,
+        **kws,
+    ) -> xr.DataArray | xr.Dataset:
+        """
+        Fit coarse to fine, seeding each level from the fit of the coarser one.
+
+        The data is binned by ``factor ** (levels - 1)`` along `dims` with
+        ``bin(method="mean")`` and fit, the fitted parameters are interpolated
+        onto the grid of the next finer level to seed its fit, and so on up to
+        the full resolution. Most pixels then start close to their optimum.
+        When every pixel would otherwise start from the same `params`, this
+        takes fewer function evaluations in total than a direct fit, the
+        coarse levels included. Pixels which are guessed already start close
+        to their optimum, so that the coarse levels add to the total instead.
+
+        Parameters
+        ----------
+        model : lf.model.Model
+            The model to be fitted.
+        params : xr.DataArray or xr.Dataset or None, optional
+            The parameters of the coarsest level, see `__call__`. Parameters on
+            the full grid are taken from the nearest pixel. If None, parameters
+            are guessed.
+        levels : int, optional
+            Number of resolutions fitted, by default 3.
+        factor : int, optional
+            Binning factor between consecutive levels, by default 2.
+        dims : list or None, optional
+            The dimensions binned, by default all but `input_core_dims`.
+        input_core_dims : str, optional
+            The dimension name for the input data, by default "x".
+        output : {"modelresult", "dataset"}, optional
+            Output of the full resolution fit, see `__call__`.
+        telemetry : xrfit.telemetry.Telemetry or None, optional
+            Records the pixels of the full resolution fit, see `__call__`. The
+            coarser levels are timed together as the "pyramid" stage.
+            By default None.
+        lean : bool, optional
+            Return lean ModelResults of the full resolution fit, see
+            `__call__`. By default False.
+        **kws
+            Passed on to `__call__` at every level. Weights are binned along
+            with the data.
+
+        Returns
+        -------
+        xr.DataArray or xr.Dataset
+            The result of the full resolution fit. Unless it is lazy, its
+            `level_nfev` attribute lists the function evaluations of every
+            level from the coarsest to the full resolution, and `nfev` their
+            total.
+        """
+        if dims is None:
+            dims = self._other_dims(input_core_dims)
+        weights = kws.pop("weights", None)
+        if weights is not None and not isinstance(weights, xr.DataArray):
+            weights = xr.DataArray(weights, dims=[input_core_dims])
+
+        events = Telemetry() if telemetry is None else telemetry
+        table = params
+        level_nfev = []
+        for level in range(levels - 1, 0, -1):
+            window = {
+                dim: min(factor**level, self._obj.sizes[dim])
+                for dim in dims
+                if self._obj.sizes[dim] > 1
+            }
+            level_kws = dict(kws)
+            if weights is None:
+                binned = self._obj.bin(method="mean", boundary="pad", **window)
+            else:
+                binned, level_kws["weights"] = self._obj.bin(
+                    method="mean", boundary="pad", weights=weights, **window
+                )
+            if isinstance(table, xr.Dataset):
+                table = self._resample(table, binned, dims)
+            elif table is not None:
+                table = table.sel(
+                    {dim: binned[dim].values for dim in dims if dim in table.dims},
+                    method="nearest",
+                ).assign_coords({dim: binned[dim] for dim in dims if dim in table.dims})
+            with events.stage("pyramid"):
+                table = binned.fit(
+                    model=model,
+                    params=table,
+                    input_core_dims=input_core_dims,
+                    output="dataset",
+                    **level_kws,
+                )
+            level_nfev.append(int(table["nfev"].sum()))
+            events.emit(
+                "pyramid_level",
+                level=level,
+                n_pixels=table["nfev"].size,
+                nfev=level_nfev[-1],
+            )
+        if isinstance(table, xr.Dataset):
+            table = self._resample(table, self._obj, dims)
+        if weights is not None:
+            kws["weights"] = weights
+        fit_results = self.__call__(
+            model=model,
+            params=table,
+            input_core_dims=input_core_dims,
+            output=output,
+            telemetry=telemetry,
+            lean=lean,
+            **kws,
+        )
+        if isinstance(fit_results, xr.Dataset):
+            if fit_results.chunks:
+                return fit_results
+            nfev = fit_results["nfev"]
+        else:
+            if fit_results.chunks is not None:
+                return fit_results
+            nfev = fit_results.assess.fit_stats("nfev")
+        level_nfev.append(int(nfev.sum()))
+        fit_results.attrs.update({"level_nfev": level_nfev, "nfev": sum(level_nfev)})
+        return fit_results
 
     def fit_with_corr(
         self,
@@ -168,6 +1564,18 @@ class FitAccessor(DataArrayAccessor):
         iter_max: int = 100,
         iter_crit: Literal["rsquared", "chisqr", "redchi"] = "rsquared",
         iter_tol: float = 0.001,
+        along: str | None = None,
+        traversal: Literal["raster", "bfs"] = "raster",
+        seed: Literal["previous", "neighbor", "mean", "best"] = "previous",
+        raster_baseline: bool = False,
+        executor: Executor | None = None,
+        n_workers: int | None = None,
+        checkpoint: str | os.PathLike | None = None,
+        checkpoint_every: int = 100,
+        checkpoint_interval: float = 60.0,
+        resume: bool = False,
+        telemetry: Telemetry | None = None,
+        lean: bool = False,
         **kws,
     ) -> xr.DataArray:
         """
@@ -181,18 +1589,154 @@ class FitAccessor(DataArrayAccessor):
             The starting index for the fit.
         input_core_dims : str, optional
             The dimension name for the input data, by default "x".
+        along : str or None, optional
+            Dimension along which the parameters are correlated. If given, every
+            1D line along `along` is an independent chain, walked backwards and
+            forwards from the index of `along` in `start_dict`, and the chains
+            can run in parallel. By default None, which walks the whole
+            flattened grid as one chain.
+        traversal : {"raster", "bfs"}, optional
+            Order in which the pixels of a chain are refitted. "raster" walks the
+            flattened grid backwards and then forwards from the start index.
+            "bfs" walks outwards from the start index in breadth-first order over
+            the N-D grid, so that every pixel has a refitted face neighbor.
+            By default "raster".
+        seed : {"previous", "neighbor", "mean", "best"}, optional
+            Starting parameters of each pixel. "previous" takes the pixel refitted
+            just before in the traversal, which at row boundaries may be far away.
+            "neighbor" takes the most recently refitted face neighbor, "mean" the
+            mean values of all refitted face neighbors and "best" the refitted
+            face neighbor with the best `iter_crit`. By default "previous".
+        raster_baseline : bool, optional
+            Also walk copies of the initial fit in raster order with the
+            "previous" seed, to report the function evaluations saved by
+            `traversal` and `seed`. The baseline costs as much as a refit in
+            raster order, its results are discarded. By default False.
+        executor : concurrent.futures.Executor or None, optional
+            Executor used to run the chains, and the initial fit, in parallel.
+            By default None.
+        n_workers : int or None, optional
+            Number of worker processes. If given without `executor`, a process pool
+            is created for this call. By default None, which runs serially.
+        checkpoint : str or os.PathLike or None, optional
+            Directory to which the initial fit and the refitted pixels are
+            flushed, together with the start index. By default None.
+        checkpoint_every : int, optional
+            Flush the checkpoint after this many completed pixels, by default 100.
+        checkpoint_interval : float, optional
+            Flush the checkpoint after this many seconds, by default 60.
+        resume : bool, optional
+            Pick up the initial fit and the traversal where the run writing
+            `checkpoint` stopped. By default False.
+        telemetry : xrfit.telemetry.Telemetry or None, optional
+            Records every pixel of the initial fit and of the correlated refits,
+            with the number of bound iterations, and receives the messages of
+            this method as events. See `__call__`. By default None.
+        lean : bool, optional
+            Return lean ModelResults, see `__call__`. By default False.
 
         Returns
         -------
         xr.DataArray
-            The result of the model fitting with correlated parameters.
+            The result of the model fitting with correlated parameters. The total
+            number of function evaluations of the correlated refits is stored in
+            its `nfev` attribute, to compare traversals and seeds. With
+            `raster_baseline`, the `raster_nfev` attribute holds that of the
+            raster baseline and `nfev_saved` the difference. Lazy results
+            of dask-backed data are computed before the refits, which update the
+            ModelResults in place.
         """
-        fit_results = self.__call__(
-            model=model,
-            params=params,
-            input_core_dims=input_core_dims,
-            **kws,
+        if executor is None and n_workers is not None:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                return self.fit_with_corr(
+                    model=model,
+                    params=params,
+                    input_core_dims=input_core_dims,
+                    start_dict=start_dict,
+                    set_bound=set_bound,
+                    bound_ratio=bound_ratio,
+                    bound_ratio_inc=bound_ratio_inc,
+                    bound_tol=bound_tol,
+                    iter_max=iter_max,
+                    iter_crit=iter_crit,
+                    iter_tol=iter_tol,
+                    along=along,
+                    traversal=traversal,
+                    seed=seed,
+                    raster_baseline=raster_baseline,
+                    executor=pool,
+                    n_workers=n_workers,
+                    checkpoint=checkpoint,
+                    checkpoint_every=checkpoint_every,
+                    checkpoint_interval=checkpoint_interval,
+                    resume=resume,
+                    telemetry=telemetry,
+                    lean=lean,
+                    **kws,
+                )
+        if lean and self._obj.chunks is not None:
+            raise ValueError("lean only applies to ModelResults of numpy-backed data.")
+        if set_bound and iter_max < 1:
+            raise ValueError("iter_max must be at least 1.")
+        # without telemetry only the messages of the start estimate and the
+        # bound iterations are printed, and it is only passed on to the initial
+        # fit if asked for, as it does not support dask
+        events = (
+            Telemetry(callbacks=[_print_default]) if telemetry is None else telemetry
         )
+        if telemetry is not None:
+            telemetry._allocate(self._obj.isel({input_core_dims: 0}, drop=True))
+        if checkpoint is None:
+            fit_results = self.__call__(
+                model=model,
+                params=params,
+                input_core_dims=input_core_dims,
+                executor=executor,
+                n_workers=n_workers,
+                telemetry=telemetry,
+                **kws,
+            )
+        else:
+            checkpoint = _Checkpoint(
+                checkpoint, checkpoint_every, checkpoint_interval, resume
+            )
+            fit_kws = dict(kws)
+            weights = fit_kws.pop("weights", None)
+            with events.stage("guess"):
+                guesses = self._guesses(
+                    model, params, input_core_dims, executor, n_workers
+                )
+            with events.stage("fit", guesses.size):
+                results = self._fit_checkpointed(
+                    model,
+                    guesses,
+                    weights,
+                    input_core_dims,
+                    executor,
+                    n_workers,
+                    fit_kws,
+                    checkpoint,
+                    events,
+                )
+            with events.stage("assemble"):
+                fit_results = self._checkpointed_output(
+                    results,
+                    checkpoint,
+                    "fit",
+                    model,
+                    weights,
+                    input_core_dims,
+                    "modelresult",
+                )
+            if checkpoint.get("corr.start") is not None:
+                start_dict = dict(
+                    zip(fit_results.dims, checkpoint.get("corr.start"), strict=True)
+                )
+        fit_results = cast("xr.DataArray", fit_results)
+        if fit_results.chunks is not None:
+            # the refits are written into the ModelResults, which have to be in
+            # memory to be returned
+            fit_results = fit_results.compute()
         dims = fit_results.dims
         if not isinstance(start_dict, dict):
             if start_dict == "stat":
@@ -201,118 +1745,200 @@ class FitAccessor(DataArrayAccessor):
                 start_dict = fit_results.assess.best_fit_max()
             else:
                 raise ValueError("Invalid value for start_dict.")
-            print("⚡️ No initial coords provided for fit_with_corr")
-            print("⚡️ Estimate used :", start_dict)
-        if isinstance(start_dict, dict):
-            start_tuple = tuple(start_dict.values())
-        else:
+            events.emit("start_estimated", start=start_dict)
+        if not isinstance(start_dict, dict):
             raise TypeError("start_dict must be a dictionary.")
-        dims_tuple = tuple(fit_results.sizes[dim] for dim in dims)
-        start_idx = np.ravel_multi_index(start_tuple, dims_tuple)
-        total_idx = np.prod(dims_tuple)
-        # if bound_ratio is not None:
-        # fit_results = fit_results.params.set_bounds(bound_ratio=bound_ratio)
-        previous_params = fit_results.params.parse().isel(start_dict).item()
-        previous_iter_crit_val = 0
-        for idx in range(start_idx, -1, -1):
-            indices = np.unravel_index(idx, dims_tuple)
-            index_dict = dict(zip(dims, indices, strict=False))
-            single_fit_result = fit_results.isel(index_dict).item()
-
-            if set_bound:
-                for iter_idx in range(iter_max):
-                    single_fit_result.fit(params=previous_params, **kws)
-                    new_bound_ratio = bound_ratio + bound_ratio_inc * iter_idx
-                    single_fit_result = _set_bounds(
-                        single_fit_result,
-                        bound_ratio=new_bound_ratio,
-                        bound_tol=bound_tol,
-                    )
-                    previous_params = single_fit_result.params
-                    fit_results[index_dict] = single_fit_result
-                    iter_crit_val = getattr(single_fit_result, iter_crit)
-                    iter_crit_ratio = (
-                        iter_crit_val - previous_iter_crit_val
-                    ) / iter_crit_val
-                    iter_crit_ratio = np.abs(iter_crit_ratio)
-                    if iter_crit_ratio < iter_tol:
-                        print(
-                            "⚡️ iter_bound tol reached at iter : ",
-                            iter_idx,
-                            "iter_crit_ratio : ",
-                            iter_crit_ratio,
-                            "iter_tol : ",
-                            iter_tol,
-                        )
-                        break
-                    previous_iter_crit_val = iter_crit_val
-                    if iter_idx == iter_max - 1:
-                        print(
-                            "⚠️ iter_max reached at iter : ",
-                            iter_idx,
-                            "for idx : ",
-                            index_dict,
-                            "iter_crit_ratio : ",
-                            iter_crit_ratio,
-                            "iter_tol : ",
-                            iter_tol,
-                            "max_bound : ",
-                            new_bound_ratio,
-                        )
-            else:
-                single_fit_result.fit(params=previous_params, **kws)
-                fit_results[index_dict] = single_fit_result
-                previous_params = single_fit_result.params
+        if along is not None and along not in dims:
+            raise ValueError(f"along must be one of the dims {dims}.")
+        bound_kws = (
+            {
+                "bound_ratio": bound_ratio,
+                "bound_ratio_inc": bound_ratio_inc,
+                "bound_tol": bound_tol,
+                "iter_max": iter_max,
+                "iter_crit": iter_crit,
+                "iter_tol": iter_tol,
+            }
+            if set_bound
+            else None
+        )
 
-        previous_iter_crit_val = 0
-        previous_params = fit_results.params.parse().isel(start_dict).item()
-        for idx in range(start_idx + 1, total_idx):
-            indices = np.unravel_index(idx, dims_tuple)
-            index_dict = dict(zip(dims, indices, strict=False))
-            single_fit_result = fit_results.isel(index_dict).item()
-            if set_bound:
-                for iter_idx in range(iter_max):
-                    single_fit_result.fit(params=previous_params, **kws)
-                    new_bound_ratio = bound_ratio + bound_ratio_inc * iter_idx
-                    single_fit_result = _set_bounds(
-                        single_fit_result,
-                        bound_ratio=new_bound_ratio,
-                        bound_tol=bound_tol,
+        values = fit_results.values
+        fitted_at = None
+        if checkpoint is not None:
+            checkpoint.set("corr.start", [start_dict[dim] for dim in dims])
+            fitted_at = self._resume_corr(
+                fit_results, checkpoint, model, input_core_dims, kws
+            )
+
+        chains = []
+        for indices, shape, start in self._chains(fit_results, start_dict, along):
+            chains.append(
+                (
+                    [values[index] for index in indices],
+                    shape,
+                    start,
+                    [dict(zip(dims, index, strict=True)) for index in indices],
+                    None
+                    if fitted_at is None
+                    else [fitted_at[index] for index in indices],
+                )
+            )
+
+        def record(chain, i, result):
+            index = np.ravel_multi_index(tuple(chain[3][i].values()), values.shape)
+            events.pixel(index, result)
+            if checkpoint is not None:
+                checkpoint.record("corr", index, result)
+
+        walk_kws = (kws, bound_kws, traversal, seed, iter_crit)
+        if executor is not None:
+            n_chunks = min(len(chains), 4 * _n_workers(executor, n_workers))
+            chunks = np.array_split(np.arange(len(chains)), n_chunks)
+        is_raster = traversal == "raster" and seed == "previous"
+        if raster_baseline and not is_raster:
+            raster_kws = (kws, bound_kws, "raster", "previous", iter_crit)
+            with events.stage("raster_baseline"):
+                # on copies, as the refits update the ModelResults in place
+                if executor is not None:
+                    baseline = _map_chunks(
+                        _walk_chains,
+                        [([chains[i] for i in idx], *raster_kws) for idx in chunks],
+                        executor,
+                        n_workers,
                     )
-                    previous_params = single_fit_result.params
-                    fit_results[index_dict] = single_fit_result
-                    iter_crit_val = getattr(single_fit_result, iter_crit)
-                    iter_crit_ratio = (
-                        iter_crit_val - previous_iter_crit_val
-                    ) / iter_crit_val
-                    iter_crit_ratio = np.abs(iter_crit_ratio)
-                    if iter_crit_ratio < iter_tol:
-                        print(
-                            "⚡️ iter_bound tol reached at iter : ",
-                            iter_idx,
-                            "iter_crit_ratio : ",
-                            iter_crit_ratio,
-                            "iter_tol : ",
-                            iter_tol,
-                        )
-                        break
-                    previous_iter_crit_val = iter_crit_val
-                    if iter_idx == iter_max - 1:
-                        print(
-                            "⚠️ iter_max reached at iter : ",
-                            iter_idx,
-                            "for idx : ",
-                            index_dict,
-                            "iter_crit_ratio : ",
-                            iter_crit_ratio,
-                            "iter_tol : ",
-                            iter_tol,
-                            "max_bound : ",
-                            new_bound_ratio,
-                        )
-            else:
-                single_fit_result.fit(params=previous_params, **kws)
-                fit_results[index_dict] = single_fit_result
-                previous_params = single_fit_result.params
+                    baseline = [chain for chunk in baseline for chain in chunk]
+                else:
+                    baseline = _walk_chains(copy.deepcopy(chains), *raster_kws)
+            raster_nfev = sum(chain_nfev for _, chain_nfev in baseline)
 
+        n_todo = values.size if fitted_at is None else int((fitted_at < 0).sum())
+        with events.stage("corr", n_todo):
+            if executor is not None:
+
+                def record_chunk(k, walked_chunk):
+                    for i, (results, _) in zip(chunks[k], walked_chunk, strict=True):
+                        for j, result in enumerate(results):
+                            record(chains[i], j, result)
+
+                walked = _map_chunks(
+                    _walk_chains,
+                    [([chains[i] for i in idx], *walk_kws) for idx in chunks],
+                    executor,
+                    n_workers,
+                    callback=record_chunk,
+                )
+                walked = [chain for chunk in walked for chain in chunk]
+            else:
+                walked = []
+                for chain in chains:
+                    results, shape, start, index_dicts, chain_fitted_at = chain
+                    walked.append(
+                        _walk_chain(
+                            results,
+                            shape,
+                            start,
+                            index_dicts,
+                            kws,
+                            bound_kws,
+                            traversal,
+                            seed,
+                            iter_crit,
+                            fitted_at=chain_fitted_at,
+                            callback=functools.partial(record, chain),
+                        )
+                    )
+        if checkpoint is not None:
+            checkpoint.flush()
+        nfev = 0
+        for chain, (results, chain_nfev) in zip(chains, walked, strict=True):
+            for index_dict, result in zip(chain[3], results, strict=True):
+                values[tuple(index_dict.values())] = result
+            nfev += chain_nfev
+        # a new array, as the statistics cached by the accessors of the old one
+        # are stale after the refits in place
+        fit_results = fit_results.copy(deep=False)
+        fit_results.attrs["nfev"] = nfev
+        if raster_baseline:
+            if is_raster:
+                raster_nfev = nfev
+            fit_results.attrs["raster_nfev"] = raster_nfev
+            fit_results.attrs["nfev_saved"] = raster_nfev - nfev
+            events.emit(
+                "corr_done",
+                nfev=nfev,
+                raster_nfev=raster_nfev,
+                saved=raster_nfev - nfev,
+            )
+        else:
+            events.emit("corr_done", nfev=nfev)
+        if lean:
+            with events.stage("assemble"):
+                self._lean(fit_results, input_core_dims, events)
         return fit_results
+
+    def _resume_corr(
+        self,
+        fit_results: xr.DataArray,
+        checkpoint: _Checkpoint,
+        model: lf.model.Model,
+        input_core_dims: str,
+        kws: dict,
+    ) -> np.ndarray:
+        """
+        Put the pixels refitted by a previous run of `fit_with_corr` back in place.
+
+        Returns the order in which the pixels were refitted, -1 for the pending.
+        """
+        values = fit_results.values
+        first = values.flat[0]
+        param_names = list(first.params.keys())
+        checkpoint.stage(
+            "corr", values.size, param_names, _param_exprs(first, param_names)
+        )
+        done = checkpoint.done("corr")
+        if done.any():
+            fit_kws = dict(kws)
+            ds = self._checkpointed_output(
+                [None] * values.size,
+                checkpoint,
+                "corr",
+                model,
+                fit_kws.pop("weights", None),
+                input_core_dims,
+                "dataset",
+            )
+            for i in np.flatnonzero(done):
+                index = np.unravel_index(i, values.shape)
+                values[index] = ds.fit.modelresult(
+                    dict(zip(fit_results.dims, index, strict=True))
+                )
+        return checkpoint.order("corr").reshape(values.shape)
+
+    def _chains(
+        self,
+        fit_results: xr.DataArray,
+        start_dict: dict,
+        along: str | None,
+    ) -> list:
+        """
+        Index tuples, grid shape and flat start index of each chain of `fit_with_corr`.
+
+        Without `along`, the whole grid is a single chain.
+        """
+        dims = fit_results.dims
+        shape = fit_results.shape
+        if along is None:
+            start = int(
+                np.ravel_multi_index(tuple(start_dict[dim] for dim in dims), shape)
+            )
+            return [(list(np.ndindex(*shape)), shape, start)]
+        axis = dims.index(along)
+        other_shape = [
+            size for dim, size in zip(dims, shape, strict=True) if dim != along
+        ]
+        chains = []
+        for other in np.ndindex(*other_shape):
+            indices = [(*other[:axis], i, *other[axis:]) for i in range(shape[axis])]
+            chains.append((indices, (shape[axis],), int(start_dict[along])))
+        return chains
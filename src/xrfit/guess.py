@@ -0,0 +1,175 @@
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+from xrfit.batched import _eval_exprs
+
+_TABLE_ATTRS = ["value", "min", "max", "vary"]
+# ampscale and sigscale passed to `lmfit.models.guess_from_peak` by each model
+_PEAK_SCALES = {
+    lf.models.GaussianModel: (1.0, 1.0),
+    lf.models.LorentzianModel: (1.25, 1.0),
+    lf.models.VoigtModel: (1.5, 0.65),
+    lf.models.MoffatModel: (0.5, 1.0),
+}
+
+
+def _guess_from_peak(
+    data: np.ndarray,
+    x: np.ndarray,
+    ampscale: float = 1.0,
+    sigscale: float = 1.0,
+) -> dict:
+    """Vectorized `lmfit.models.guess_from_peak` over the rows of `data`."""
+    order = np.argsort(x)
+    x = x[order]
+    data = data[:, order]
+    maxy, miny = data.max(axis=1), data.min(axis=1)
+    center = x[np.argmax(data, axis=1)]
+    height = (maxy - miny) * 3.0
+    sigma = np.full(len(data), (x.max() - x.min()) / 6.0)
+
+    above = data > ((maxy + miny) / 2.0)[:, None]
+    count = above.sum(axis=1)
+    first = x[np.argmax(above, axis=1)]
+    last = x[above.shape[1] - 1 - np.argmax(above[:, ::-1], axis=1)]
+    wide = count > 2
+    sigma = np.where(wide, (last - first) / 2.0, sigma)
+    center = np.where(wide, (above * x).sum(axis=1) / np.maximum(count, 1), center)
+    return {
+        "amplitude": height * sigma * ampscale,
+        "center": center,
+        "sigma": sigma * sigscale,
+    }
+
+
+def _leaf_values(
+    model: lf.Model,
+    data: np.ndarray,
+    x: np.ndarray,
+) -> dict | None:
+    """Guessed values by parameter root name, or None if not vectorized."""
+    cls = type(model)
+    if cls in _PEAK_SCALES:
+        return _guess_from_peak(data, x, *_PEAK_SCALES[cls])
+    if cls is lf.models.ConstantModel:
+        return {"c": data.mean(axis=1)}
+    if cls is lf.models.LinearModel:
+        slope, intercept = np.polyfit(x, data.T, 1)
+        return {"slope": slope, "intercept": intercept}
+    if cls is lf.models.QuadraticModel:
+        return dict(zip("abc", np.polyfit(x, data.T, 2), strict=True))
+    if cls is lf.models.PolynomialModel:
+        coefs = np.polyfit(x, data.T, model.poly_degree)[::-1]
+        return {f"c{i}": coef for i, coef in enumerate(coefs)}
+    return None
+
+
+def _leaf_table(
+    model: lf.Model,
+    data: np.ndarray,
+    x: np.ndarray,
+) -> dict:
+    values = _leaf_values(model, data, x)
+    if values is None:
+        # not vectorized, guess pixel by pixel
+        guesses = [model.guess(y, x=x) for y in data]
+        return {
+            name: {
+                **{
+                    attr: np.array([getattr(params[name], attr) for params in guesses])
+                    for attr in _TABLE_ATTRS
+                },
+                "expr": par.expr or "",
+            }
+            for name, par in guesses[0].items()
+        }
+
+    params = model.make_params()
+    if type(model) in _PEAK_SCALES:
+        params[f"{model.prefix}sigma"].set(min=0.0)
+    table = {
+        name: {
+            **{attr: np.full(len(data), getattr(par, attr)) for attr in _TABLE_ATTRS},
+            "expr": par.expr or "",
+        }
+        for name, par in params.items()
+    }
+    for name, value in values.items():
+        column = table[f"{model.prefix}{name}"]
+        column["value"] = np.clip(value, column["min"], column["max"])
+    return table
+
+
+def _guess_table(
+    model: lf.Model,
+    data: np.ndarray,
+    x: np.ndarray,
+) -> dict:
+    """
+    Guess the parameters of all pixels of `data` as a table of arrays.
+
+    Follows the recursion of `xrfit.fit._generalized_guess`, so that the table
+    holds the same parameters, in the same order, as its Parameters.
+    """
+    if isinstance(model, lf.model.CompositeModel):
+        table = {}
+        for component in [model.left, model.right]:
+            if component is not None:
+                table.update(_guess_table(component, data, x))
+        return table
+    if hasattr(model, "model") and hasattr(model, "op"):
+        return _guess_table(model.model, data, x)
+    if hasattr(model, "guess"):
+        return _leaf_table(model, data, x)
+    raise ValueError(f"Model {model} does not support guess().")
+
+
+def _guess_columns(
+    data: np.ndarray,
+    x: np.ndarray,
+    model: lf.Model,
+    param_names: list,
+) -> tuple:
+    """Guess for data of shape (..., len(x)) as arrays of shape (..., param)."""
+    shape = data.shape[:-1]
+    table = _guess_table(model, data.reshape(-1, data.shape[-1]), x)
+    values = _eval_exprs(
+        {name: column["value"] for name, column in table.items()},
+        {name: column["expr"] for name, column in table.items() if column["expr"]},
+    )
+    for name, column in table.items():
+        column["value"] = values[name]
+    return tuple(
+        np.stack([table[name][attr] for name in param_names], axis=-1).reshape(
+            *shape, len(param_names)
+        )
+        for attr in _TABLE_ATTRS
+    )
+
+
+def _params_columns(
+    params: lf.Parameters,
+    param_names: list,
+) -> tuple:
+    return tuple(
+        np.array([getattr(params[name], attr) for name in param_names])
+        for attr in _TABLE_ATTRS
+    )
+
+
+def _to_params_dataset(
+    columns: tuple,
+    param_names: list,
+    exprs: list,
+    model: lf.Model,
+    input_core_dims: str,
+) -> xr.Dataset:
+    """Assemble a parameter table from DataArrays of shape (..., param)."""
+    return xr.Dataset(
+        {
+            attr: column.astype(bool if attr == "vary" else float)
+            for attr, column in zip(_TABLE_ATTRS, columns, strict=True)
+        },
+        attrs={"model": model, "input_core_dims": input_core_dims},
+    ).assign_coords(param=param_names, expr=("param", exprs))
@@ -0,0 +1,109 @@
+import lmfit as lf
+import numpy as np
+
+from xrfit.lineshapes import _gradient, _is_supported
+
+# solvers of lmfit that take the Jacobian of the residual as `Dfun`
+_METHODS = ["leastsq", "least_squares"]
+
+
+def _expr_gradient(
+    params: lf.Parameters,
+    name: str,
+    memo: dict,
+) -> dict:
+    """
+    Differentiate a parameter by the variables of the fit.
+
+    Constraint expressions that are the name of another parameter are resolved
+    exactly, other expressions by a forward difference of the expression only.
+    """
+    if name in memo:
+        return memo[name]
+    par = params[name]
+    if not par.expr:
+        grad = {name: 1.0} if par.vary else {}
+    elif par.expr.strip() in params:
+        grad = _expr_gradient(params, par.expr.strip(), memo)
+    else:
+        interpreter = params._asteval
+        value = interpreter.eval(par.expr, show_errors=False)
+        grad = {}
+        for dep in par._expr_deps:
+            if dep not in params:
+                continue
+            dep_value = params[dep].value
+            step = 1.49012e-8 * max(abs(dep_value), 1e-3)
+            interpreter.symtable[dep] = dep_value + step
+            partial = (interpreter.eval(par.expr, show_errors=False) - value) / step
+            interpreter.symtable[dep] = dep_value
+            for var, d in _expr_gradient(params, dep, memo).items():
+                grad[var] = grad.get(var, 0.0) + partial * d
+    memo[name] = grad
+    return grad
+
+
+class _Jacobian:
+    """
+    Analytic Jacobian of the residual of a supported model, as lmfit's `Dfun`.
+
+    The derivatives of the lineshapes are composed through the model tree, see
+    `xrfit.lineshapes._gradient`, so that each step of the solver costs one
+    evaluation instead of one per variable.
+    """
+
+    def __init__(self, model: lf.Model) -> None:
+        self.model = model
+
+    def __call__(self, params, data, weights, x=None, **kws):
+        values = {name: par.value for name, par in params.items()}
+        _, grad = _gradient(self.model, values, x)
+        var_names = [name for name, par in params.items() if par.vary and not par.expr]
+        index = {name: i for i, name in enumerate(var_names)}
+        jac = np.zeros((np.size(x), len(var_names)))
+        memo = {}
+        for name, d in grad.items():
+            for var, factor in _expr_gradient(params, name, memo).items():
+                jac[:, index[var]] -= factor * d
+        if weights is not None:
+            jac *= np.reshape(weights, (-1, 1))
+        return jac
+
+
+def _with_jacobian(
+    model: lf.Model,
+    kws: dict,
+) -> dict:
+    """Pass the analytic Jacobian of supported models on to `lmfit.Model.fit`."""
+    if not _is_supported(model) or kws.get("method", "leastsq") not in _METHODS:
+        return kws
+    fit_kws = dict(kws.get("fit_kws") or {})
+    if "Dfun" in fit_kws or "jac" in fit_kws:
+        return kws
+    fit_kws["Dfun"] = _Jacobian(model)
+    return {**kws, "fit_kws": fit_kws}
+
+
+def _untied(
+    kws: dict,
+    params: lf.Parameters,
+    x: np.ndarray,
+) -> dict:
+    """
+    Drop the analytic Jacobian of `kws` if it has identical columns at `params`.
+
+    Identical components started from the same guess have identical columns,
+    for which the steps of MINPACK are decided by the rounding of its linear
+    algebra and differ from run to run. Such pixels are fit by finite
+    differences, as without the analytic Jacobian.
+    """
+    fit_kws = kws.get("fit_kws") or {}
+    jacobian = fit_kws.get("Dfun")
+    if not isinstance(jacobian, _Jacobian):
+        return kws
+    values = {name: par.value for name, par in params.items()}
+    _, grad = _gradient(jacobian.model, values, x)
+    if len({np.asarray(d).tobytes() for d in grad.values()}) == len(grad):
+        return kws
+    fit_kws = {key: value for key, value in fit_kws.items() if key != "Dfun"}
+    return {**kws, "fit_kws": fit_kws}
@@ -0,0 +1,184 @@
+import functools
+import operator
+import types
+
+import lmfit as lf
+import numpy as np
+
+from xrfit import lineshapes
+from xrfit.lineshapes import _lineshape
+
+# Fused evaluation of model trees. A supported tree is flattened into a postfix
+# program of lineshapes and operators, which a compiled kernel runs point by
+# point, without the temporary arrays of every lineshape and operator. Without
+# numba, or for trees with other lineshapes, `xrfit.lineshapes._eval` is used.
+# numba is only imported, and the kernel compiled, on first use.
+
+# numba.prange in the compiled copy of `_fused`, so that rows are evaluated in
+# parallel, see `_fused_kernel`
+prange = range
+
+_LORENTZIAN, _GAUSSIAN, _LINEAR, _CONSTANT = 0, 1, 2, 3
+_ADD, _SUB, _MUL, _DIV = 10, 11, 12, 13
+_CODES = {
+    lineshapes.lorentzian: _LORENTZIAN,
+    lineshapes.gaussian: _GAUSSIAN,
+    lineshapes.linear: _LINEAR,
+    lineshapes.constant: _CONSTANT,
+}
+_OP_CODES = {
+    operator.add: _ADD,
+    operator.sub: _SUB,
+    operator.mul: _MUL,
+    operator.truediv: _DIV,
+}
+# arguments of each lineshape, in the order the kernel reads them, with defaults
+_ARGS = {
+    _LORENTZIAN: {"amplitude": 1.0, "center": 0.0, "sigma": 1.0},
+    _GAUSSIAN: {"amplitude": 1.0, "center": 0.0, "sigma": 1.0},
+    _LINEAR: {"slope": 1.0, "intercept": 0.0},
+    _CONSTANT: {"c": 0.0},
+}
+
+
+def _is_fusable(model: lf.Model) -> bool:
+    """Whether the kernel can evaluate the model tree."""
+    if isinstance(model, lf.model.CompositeModel):
+        return _is_fusable(model.left) and _is_fusable(model.right)
+    return _lineshape(model) in _CODES
+
+
+def _program(model: lf.Model, names: list, defaults: list) -> list:
+    """
+    Flatten a model tree into postfix instructions ``(code, arg columns)``.
+
+    Full parameter names are collected into `names`, with the default value of
+    the lineshape argument in `defaults`.
+    """
+    if isinstance(model, lf.model.CompositeModel):
+        return [
+            *_program(model.left, names, defaults),
+            *_program(model.right, names, defaults),
+            (_OP_CODES[model.op], []),
+        ]
+    code = _CODES[_lineshape(model)]
+    columns = []
+    for arg, default in _ARGS[code].items():
+        name = f"{model.prefix}{arg}"
+        if name not in names:
+            names.append(name)
+            defaults.append(default)
+        columns.append(names.index(name))
+    return [(code, columns)]
+
+
+def _fused(codes, args, values, x, out):
+    """Evaluate a postfix program for every row of `values` at every point of `x`."""
+    tiny = 1.0e-15
+    s2pi = np.sqrt(2 * np.pi)
+    for i in prange(values.shape[0]):
+        stack = np.empty(codes.size)
+        for j in range(x.size):
+            xj = x[j]
+            top = 0
+            for k in range(codes.size):
+                code = codes[k]
+                if code == _LORENTZIAN:
+                    amplitude = values[i, args[k, 0]]
+                    sigma = values[i, args[k, 2]]
+                    u = (xj - values[i, args[k, 1]]) / max(tiny, sigma)
+                    stack[top] = amplitude / (1 + u * u) / max(tiny, np.pi * sigma)
+                    top += 1
+                elif code == _GAUSSIAN:
+                    amplitude = values[i, args[k, 0]]
+                    sigma = values[i, args[k, 2]]
+                    d = xj - values[i, args[k, 1]]
+                    stack[top] = (amplitude / max(tiny, s2pi * sigma)) * np.exp(
+                        -(d * d) / max(tiny, 2 * sigma * sigma)
+                    )
+                    top += 1
+                elif code == _LINEAR:
+                    stack[top] = values[i, args[k, 0]] * xj + values[i, args[k, 1]]
+                    top += 1
+                elif code == _CONSTANT:
+                    stack[top] = values[i, args[k, 0]]
+                    top += 1
+                else:
+                    top -= 1
+                    if code == _ADD:
+                        stack[top - 1] = stack[top - 1] + stack[top]
+                    elif code == _SUB:
+                        stack[top - 1] = stack[top - 1] - stack[top]
+                    elif code == _MUL:
+                        stack[top - 1] = stack[top - 1] * stack[top]
+                    else:
+                        stack[top - 1] = stack[top - 1] / stack[top]
+            out[i, j] = stack[0]
+
+
+@functools.cache
+def _fused_kernel():
+    """Compile `_fused` with numba, or return None if it is not installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+    # a copy of `_fused` whose globals resolve `prange` to numba's
+    fused = types.FunctionType(
+        _fused.__code__, {**_fused.__globals__, "prange": numba.prange}, "_fused"
+    )
+    return numba.njit(parallel=True, cache=True)(fused)
+
+
+def _fused_eval(
+    model: lf.Model,
+    values: dict,
+    x: np.ndarray,
+    kernel=None,
+) -> np.ndarray:
+    """Evaluate a fusable model tree like `xrfit.lineshapes._eval`."""
+    names: list[str] = []
+    defaults: list[float] = []
+    program = _program(model, names, defaults)
+    codes = np.array([code for code, _ in program], dtype=np.int64)
+    args = np.zeros((len(program), 3), dtype=np.int64)
+    for k, (_, columns) in enumerate(program):
+        args[k, : len(columns)] = columns
+
+    # one row of argument values per parameter set, defaults for missing ones
+    columns = [
+        np.asarray(values[name], dtype=float)[..., 0] if name in values else default
+        for name, default in zip(names, defaults, strict=True)
+    ]
+    shape = np.broadcast_shapes(*[np.shape(column) for column in columns])
+    table = np.stack(
+        [np.broadcast_to(column, shape).reshape(-1) for column in columns], axis=1
+    )
+
+    x = np.ascontiguousarray(x, dtype=float)
+    out = np.empty((len(table), x.size))
+    (kernel or _fused_kernel())(codes, args, table, x, out)
+    return out.reshape(*shape, x.size)
+
+
+def _eval(
+    model: lf.Model,
+    values: dict,
+    x: np.ndarray,
+) -> np.ndarray:
+    """
+    Evaluate a supported model tree for many parameter sets at once.
+
+    Uses the compiled kernel where numba is installed and the tree only has
+    lineshapes it implements, and `xrfit.lineshapes._eval` otherwise. See there
+    for the parameters.
+    """
+    if (
+        np.ndim(x) == 1
+        and _is_fusable(model)
+        and all(np.shape(value)[-1:] in [(1,), ()] for value in values.values())
+        and _fused_kernel() is not None
+    ):
+        values = {name: np.atleast_1d(value) for name, value in values.items()}
+        return _fused_eval(model, values, x)
+    return lineshapes._eval(model, values, x)
@@ -0,0 +1,108 @@
+import lmfit as lf
+import numpy as np
+
+# curves lmfit stores on every ModelResult, recomputed on demand by lean results
+_CURVES = ["best_fit", "init_fit", "residual"]
+
+
+class _LeanModelResult(lf.model.ModelResult):
+    """
+    ModelResult which evaluates its curves on demand instead of storing them.
+
+    `best_fit`, `init_fit` and `residual` are computed from the parameters, the
+    data and the independent variables whenever they are accessed. Assigning
+    them, as `lmfit.model.ModelResult.fit` does, is ignored.
+    """
+
+    @property
+    def best_fit(self):
+        return self.model.eval(params=self.params, **self.userkws)
+
+    @best_fit.setter
+    def best_fit(self, value):
+        pass
+
+    @property
+    def init_fit(self):
+        return self.model.eval(params=self.init_params, **self.userkws)
+
+    @init_fit.setter
+    def init_fit(self, value):
+        pass
+
+    @property
+    def residual(self):
+        return self.model._residual(
+            self.params, self.data, self.weights, **self.userkws
+        )
+
+    @residual.setter
+    def residual(self, value):
+        pass
+
+
+def _make_lean(
+    model_result: lf.model.ModelResult,
+    x: np.ndarray,
+    data: np.ndarray,
+) -> None:
+    """
+    Point a ModelResult at the shared `x` and `data` and drop its curves.
+
+    Arrays are only replaced where they hold the same values, so that e.g. data
+    with NaNs omitted by the fit are kept as they are.
+    """
+    if type(model_result) is lf.model.ModelResult:
+        model_result.__class__ = _LeanModelResult
+        for name in _CURVES:
+            vars(model_result).pop(name, None)
+        if getattr(model_result, "result", None) is not None:
+            # the MinimizerResult holds on to the residual of the last step
+            model_result.result.residual = None
+    userkws = model_result.userkws
+    if "x" in userkws and np.array_equal(userkws["x"], x):
+        userkws["x"] = x
+    if (
+        model_result.data is not None
+        and model_result.data.dtype == data.dtype
+        and np.array_equal(model_result.data, data)
+    ):
+        model_result.data = data
+        model_result.userargs = (data, model_result.weights)
+
+
+def _root(arr: np.ndarray) -> np.ndarray:
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+def _footprint(model_results: list) -> dict:
+    """
+    Bytes per pixel held by the arrays of ModelResults.
+
+    Every buffer is counted once, also when it is shared between pixels, e.g.
+    the x axis of lean results, or viewed by several of them, e.g. the data of
+    lean results. Its size is spread over all pixels.
+    """
+    seen = set()
+    sizes = dict.fromkeys(["x", "data", "curves"], 0)
+    for model_result in model_results:
+        arrays = {
+            "x": list(model_result.userkws.values()),
+            "data": [model_result.data, model_result.weights],
+            "curves": [vars(model_result).get(name) for name in _CURVES]
+            + [getattr(getattr(model_result, "result", None), "residual", None)],
+        }
+        for category, values in arrays.items():
+            for value in values:
+                if not isinstance(value, np.ndarray):
+                    continue
+                root = _root(value)
+                if id(root) not in seen:
+                    seen.add(id(root))
+                    sizes[category] += root.nbytes
+    n_pixels = max(len(model_results), 1)
+    report = {category: size / n_pixels for category, size in sizes.items()}
+    report["total"] = sum(report.values())
+    return report
@@ -0,0 +1,206 @@
+import operator
+
+import lmfit as lf
+import numpy as np
+from scipy.special import wofz
+
+tiny = 1.0e-15
+s2 = np.sqrt(2.0)
+s2pi = np.sqrt(2 * np.pi)
+
+
+# Broadcasting versions of the lmfit lineshapes. lmfit uses the builtin `max`
+# to guard against zero widths, which only works for scalar parameters.
+def lorentzian(x, amplitude=1.0, center=0.0, sigma=1.0):
+    return (amplitude / (1 + ((1.0 * x - center) / np.maximum(tiny, sigma)) ** 2)) / (
+        np.maximum(tiny, np.pi * sigma)
+    )
+
+
+def gaussian(x, amplitude=1.0, center=0.0, sigma=1.0):
+    return (amplitude / np.maximum(tiny, s2pi * sigma)) * np.exp(
+        -((1.0 * x - center) ** 2) / np.maximum(tiny, 2 * sigma**2)
+    )
+
+
+def voigt(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=None):
+    if gamma is None:
+        gamma = sigma
+    z = (x - center + 1j * gamma) / np.maximum(tiny, sigma * s2)
+    return amplitude * wofz(z).real / np.maximum(tiny, sigma * s2pi)
+
+
+def linear(x, slope=1.0, intercept=0.0):
+    return slope * x + intercept
+
+
+def constant(x, c=0.0):
+    return c * np.ones_like(x)
+
+
+# Derivatives of the lineshapes by each of their parameters, without the guards
+# against zero widths.
+def _lorentzian_gradient(x, amplitude=1.0, center=0.0, sigma=1.0):
+    u = (x - center) / sigma
+    shape = 1 / (np.pi * sigma * (1 + u**2))
+    return {
+        "amplitude": shape,
+        "center": amplitude * shape * 2 * u / (sigma * (1 + u**2)),
+        "sigma": amplitude * shape / sigma * (u**2 - 1) / (1 + u**2),
+    }
+
+
+def _gaussian_gradient(x, amplitude=1.0, center=0.0, sigma=1.0):
+    shape = np.exp(-((x - center) ** 2) / (2 * sigma**2)) / (s2pi * sigma)
+    return {
+        "amplitude": shape,
+        "center": amplitude * shape * (x - center) / sigma**2,
+        "sigma": amplitude * shape * ((x - center) ** 2 / sigma**3 - 1 / sigma),
+    }
+
+
+def _voigt_gradient(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=None):
+    tied = gamma is None
+    if tied:
+        gamma = sigma
+    z = (x - center + 1j * gamma) / (sigma * s2)
+    w = wofz(z)
+    # w'(z) = -2 z w(z) + 2i / sqrt(pi)
+    dw = -2 * z * w + 2j / np.sqrt(np.pi)
+    scale = amplitude / (sigma * s2pi)
+    grad = {
+        "amplitude": w.real / (sigma * s2pi),
+        "center": scale * (-dw / (sigma * s2)).real,
+        "sigma": scale * (-w.real / sigma - (dw * z).real / sigma),
+        "gamma": scale * (1j * dw / (sigma * s2)).real,
+    }
+    if tied:
+        grad["sigma"] = grad["sigma"] + grad.pop("gamma")
+    return grad
+
+
+def _linear_gradient(x, slope=1.0, intercept=0.0):
+    return {"slope": x, "intercept": np.ones_like(x)}
+
+
+def _constant_gradient(x, c=0.0):
+    return {"c": np.ones_like(x)}
+
+
+_LINESHAPES = {
+    lf.lineshapes.lorentzian: lorentzian,
+    lf.lineshapes.gaussian: gaussian,
+    lf.lineshapes.voigt: voigt,
+    lf.lineshapes.linear: linear,
+}
+_GRADIENTS = {
+    lorentzian: _lorentzian_gradient,
+    gaussian: _gaussian_gradient,
+    voigt: _voigt_gradient,
+    linear: _linear_gradient,
+    constant: _constant_gradient,
+}
+_OPERATORS = (operator.add, operator.sub, operator.mul, operator.truediv)
+
+
+def _lineshape(model: lf.Model):
+    if isinstance(model, lf.models.ConstantModel):
+        return constant
+    return _LINESHAPES.get(model.func)
+
+
+def _is_supported(model: lf.Model) -> bool:
+    """Whether the model tree only consists of supported built-in lineshapes."""
+    if isinstance(model, lf.model.CompositeModel):
+        return (
+            model.op in _OPERATORS
+            and _is_supported(model.left)
+            and _is_supported(model.right)
+        )
+    return (
+        _lineshape(model) is not None
+        and model.independent_vars == ["x"]
+        and not model.opts
+    )
+
+
+def _eval(
+    model: lf.Model,
+    values: dict,
+    x: np.ndarray,
+) -> np.ndarray:
+    """
+    Evaluate a supported model tree for many parameter sets at once.
+
+    Parameters
+    ----------
+    model : lf.Model
+        Model tree of supported lineshapes, see `_is_supported`.
+    values : dict
+        Parameter values by full parameter name, as arrays of shape (..., 1).
+    x : np.ndarray
+        The independent variable.
+
+    Returns
+    -------
+    np.ndarray
+        The model evaluated with shape (..., len(x)).
+    """
+    if isinstance(model, lf.model.CompositeModel):
+        return model.op(_eval(model.left, values, x), _eval(model.right, values, x))
+    kwargs = {
+        name: values[f"{model.prefix}{name}"]
+        for name in model._param_root_names
+        if f"{model.prefix}{name}" in values
+    }
+    return _lineshape(model)(x, **kwargs)
+
+
+def _gradient(
+    model: lf.Model,
+    values: dict,
+    x: np.ndarray,
+) -> tuple:
+    """
+    Evaluate a supported model tree and its derivatives by the chain rule.
+
+    Parameters
+    ----------
+    model : lf.Model
+        Model tree of supported lineshapes, see `_is_supported`.
+    values : dict
+        Parameter values by full parameter name.
+    x : np.ndarray
+        The independent variable.
+
+    Returns
+    -------
+    tuple
+        The model evaluated and a dict of its derivatives by the full names of
+        the parameters that enter a lineshape.
+    """
+    if isinstance(model, lf.model.CompositeModel):
+        left, left_grad = _gradient(model.left, values, x)
+        right, right_grad = _gradient(model.right, values, x)
+        if model.op is operator.add:
+            left_scale, right_scale = 1.0, 1.0
+        elif model.op is operator.sub:
+            left_scale, right_scale = 1.0, -1.0
+        elif model.op is operator.mul:
+            left_scale, right_scale = right, left
+        else:
+            left_scale, right_scale = 1 / right, -left / right**2
+        grad = {name: left_scale * d for name, d in left_grad.items()}
+        for name, d in right_grad.items():
+            grad[name] = grad.get(name, 0.0) + right_scale * d
+        return model.op(left, right), grad
+    kwargs = {
+        name: values[f"{model.prefix}{name}"]
+        for name in model._param_root_names
+        if f"{model.prefix}{name}" in values
+    }
+    lineshape = _lineshape(model)
+    grad = _GRADIENTS[lineshape](x, **kwargs)
+    return lineshape(x, **kwargs), {
+        f"{model.prefix}{name}": d for name, d in grad.items() if name in kwargs
+    }
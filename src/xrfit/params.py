@@ -1,37 +1,149 @@
+import functools
+from typing import Any
+
 import lmfit as lf
 import numpy as np
 import xarray as xr
 from scipy.ndimage import gaussian_filter
 
-from xrfit.base import DataArrayAccessor
+from xrfit.base import DataArrayAccessor, DatasetAccessor
+from xrfit.guess import _TABLE_ATTRS, _to_params_dataset
+
+
+@functools.lru_cache(maxsize=256)
+def _param_index(
+    param_names: tuple,
+    params_name: str,
+) -> dict:
+    """Full names of the parameters ending with `params_name`, by prefix."""
+    return {
+        name[: len(name) - len(params_name)]: name
+        for name in param_names
+        if name.endswith(params_name)
+    }
+
+
+def _param_columns(
+    param_names: list,
+    names: list,
+) -> tuple:
+    """
+    Build the full parameter name of each requested name and prefix.
+
+    Returns the prefixes, in order of appearance, and for each of `names` the full
+    parameter name at each prefix, None where a prefix has no such parameter.
+    """
+    indexes = [_param_index(tuple(param_names), name) for name in names]
+    prefixes = list(dict.fromkeys(prefix for index in indexes for prefix in index))
+    return prefixes, [[index.get(prefix) for prefix in prefixes] for index in indexes]
 
 
 def _get(
-    data: lf.model.ModelResult,
-    params_name: str = "center",
-    params_attr: str = "value",
-):
-    params = data.params
-    return np.array(
-        [
-            getattr(params[key], params_attr)
-            for key in params
-            if key.endswith(params_name)
-        ]
+    model_results: np.ndarray,
+    columns: list,
+    attrs: list,
+) -> np.ndarray:
+    """Collect parameter attributes of an object array of ModelResults at once."""
+    n_columns = len(columns[0]) if columns else 0
+    out = np.full(
+        (*np.shape(model_results), len(attrs), len(columns), n_columns), np.nan
     )
+    for index, model_result in np.ndenumerate(model_results):
+        params = model_result.params
+        for i, attr in enumerate(attrs):
+            for j, column in enumerate(columns):
+                for k, name in enumerate(column):
+                    if name is not None:
+                        value = getattr(params[name], attr)
+                        if value is not None:
+                            out[(*index, i, j, k)] = value
+    return out
 
 
-# TODO currently set value only.
-def _assign(
-    data: lf.model.ModelResult,
-    params_value_new: xr.DataArray,
-    params_name: str = "center",
-):
-    params = data.params
-    pars = [key for key in params if key.endswith(params_name)]
-    for i, par in enumerate(pars):
-        data.params[par].set(value=params_value_new[i], min=-np.inf, max=np.inf)
-    return data
+def _labeled(
+    arr: xr.DataArray,
+    params_name: str | list,
+    params_attr: str | list,
+    prefixes: list,
+) -> xr.DataArray | xr.Dataset:
+    """Label an array of dims (..., attr, name, params_dim) returned by `get`."""
+    arr = arr.assign_coords(param=("params_dim", prefixes))
+    if isinstance(params_attr, str):
+        arr = arr.isel(attr=0, drop=True)
+    else:
+        arr = arr.assign_coords(attr=list(params_attr))
+    if isinstance(params_name, str):
+        return arr.isel(name=0, drop=True)
+    return arr.assign_coords(name=list(params_name)).to_dataset("name")
+
+
+def _set_param(
+    par: lf.Parameter,
+    attrs: dict,
+) -> None:
+    """
+    Set value, min, max and vary of a Parameter, skipping those that are NaN.
+
+    A value outside of the bounds widens them just enough, instead of being clipped.
+    """
+    attrs = {attr: val for attr, val in attrs.items() if not np.isnan(val)}
+    if "value" in attrs:
+        attrs["min"] = np.minimum(attrs.get("min", par.min), attrs["value"])
+        attrs["max"] = np.maximum(attrs.get("max", par.max), attrs["value"])
+    if "vary" in attrs:
+        attrs["vary"] = bool(attrs["vary"])
+    par.set(**attrs)
+
+
+def _write(
+    model_results: np.ndarray,
+    names: list,
+    columns: dict,
+) -> None:
+    """
+    Push parameter attributes into the Parameters of every pixel in one pass.
+
+    Parameters
+    ----------
+    model_results : np.ndarray
+        Object array of ModelResults, changed in place.
+    names : list
+        Full parameter names, None for columns to skip.
+    columns : dict
+        Arrays of shape (..., len(names)) by attribute, see `_set_param`.
+    """
+    shape = np.shape(model_results)
+    columns = {
+        attr: np.broadcast_to(np.asarray(column, dtype=float), (*shape, len(names)))
+        for attr, column in columns.items()
+    }
+    for index, model_result in np.ndenumerate(model_results):
+        params = model_result.params
+        for j, name in enumerate(names):
+            if name is not None:
+                _set_param(
+                    params[name],
+                    {attr: column[(*index, j)] for attr, column in columns.items()},
+                )
+
+
+def _bounds(
+    value: np.ndarray,
+    vmin: np.ndarray,
+    vmax: np.ndarray,
+    vary: np.ndarray,
+    bound_ratio: float = 0.1,
+    bound_tol: float = 1e-3,
+) -> tuple:
+    """Narrow the bounds of varying parameters to a ratio around their values."""
+    small = np.abs(value) <= bound_tol
+    lower = np.where(small, -bound_tol, value - bound_ratio * np.abs(value))
+    upper = np.where(small, bound_tol, value + bound_ratio * np.abs(value))
+    vary = vary.astype(bool)
+    return (
+        np.where(vary & (vmin <= value), lower, vmin),
+        np.where(vary & (vmax >= value), upper, vmax),
+    )
 
 
 def _set_bounds(
@@ -39,17 +151,15 @@ def _set_bounds(
     bound_ratio: float = 0.1,
     bound_tol: float = 1e-3,
 ):
-    for param_name, param_value in modelresult.params.items():
-        if param_value.vary:
-            param_min = param_value - bound_ratio * abs(param_value)
-            param_max = param_value + bound_ratio * abs(param_value)
-            if np.abs(param_value) <= bound_tol:
-                param_min = -bound_tol
-                param_max = bound_tol
-            if param_value.min <= param_value:
-                modelresult.params.get(param_name).set(min=param_min)
-            if param_value.max >= param_value:
-                modelresult.params.get(param_name).set(max=param_max)
+    params = modelresult.params
+    names = list(params)
+    value, vmin, vmax, vary = (
+        np.array([getattr(params[name], attr) for name in names], dtype=float)
+        for attr in _TABLE_ATTRS
+    )
+    vmin, vmax = _bounds(value, vmin, vmax, vary, bound_ratio, bound_tol)
+    for name, lower, upper in zip(names, vmin, vmax, strict=True):
+        params[name].set(min=lower, max=upper)
     return modelresult
 
 
@@ -75,8 +185,18 @@ class ParamsAccessor(DataArrayAccessor):
     get(params_name: str = "center", params_attr: str = "value") -> xr.DataArray
         Retrieves the specified parameter.
 
-    set(params_value_new: xr.DataArray, params_name: str = "center", params_attr: str = "value") -> xr.DataArray
-        Sets the specified parameter attribute to a new value.
+    assign(params_value_new: xr.DataArray, params_name: str = "center") -> xr.DataArray
+        Sets the values of the specified parameter.
+
+    table(input_core_dims: str = "x") -> xr.Dataset
+        Collects the value, bounds and vary of all parameters as a parameter table.
+
+    update(table: xr.Dataset) -> xr.DataArray
+        Writes a parameter table back into the Parameters of every pixel.
+
+    Parameters are changed in place. `set_bounds`, `smoothen`, `sort` and
+    `assign` work on whole arrays of parameter attributes, which are written back
+    into the Parameters once.
     """
 
     def parse(
@@ -90,6 +210,44 @@ class ParamsAccessor(DataArrayAccessor):
             output_dtypes=[object],
         )
 
+    def _param_names(self) -> list:
+        return list(self._obj.values.flat[0].params)
+
+    def table(
+        self,
+        input_core_dims: str = "x",
+    ) -> xr.Dataset:
+        param_names = self._param_names()
+        arr = xr.apply_ufunc(
+            _get,
+            self._obj,
+            kwargs={"columns": [param_names], "attrs": _TABLE_ATTRS},
+            output_core_dims=[["attr", "name", "param"]],
+        ).isel(name=0)
+        first = self._obj.values.flat[0].params
+        return _to_params_dataset(
+            tuple(arr.isel(attr=i, drop=True) for i in range(len(_TABLE_ATTRS))),
+            param_names,
+            [first[name].expr or "" for name in param_names],
+            self._obj.values.flat[0].model,
+            input_core_dims,
+        )
+
+    def update(
+        self,
+        table: xr.Dataset,
+    ) -> xr.DataArray:
+        _write(
+            self._obj.values,
+            list(table["param"].values),
+            {
+                attr: table[attr].transpose(*self._obj.dims, "param").values
+                for attr in _TABLE_ATTRS
+                if attr in table
+            },
+        )
+        return self._obj
+
     def set_bounds(
         self,
         bound_ratio: float = 1.0,
@@ -97,16 +255,21 @@ class ParamsAccessor(DataArrayAccessor):
         index_dict: dict | None = None,
     ) -> xr.DataArray:
         if index_dict is None:
-            return xr.apply_ufunc(
-                _set_bounds,
-                self._obj,
-                kwargs={
-                    "bound_ratio": bound_ratio,
-                    "bound_tol": bound_tol,
-                },
-                vectorize=True,
-                dask="parallelized",
+            table = self.table()
+            vmin, vmax = _bounds(
+                table["value"].values,
+                table["min"].values,
+                table["max"].values,
+                table["vary"].values,
+                bound_ratio=bound_ratio,
+                bound_tol=bound_tol,
             )
+            _write(
+                self._obj.values,
+                list(table["param"].values),
+                {"min": vmin, "max": vmax},
+            )
+            return self._obj
         item = self._obj.isel(index_dict).item()
         index_dict = {k: self._obj.coords[k][v].item() for k, v in index_dict.items()}
         self._obj.loc[index_dict] = _set_bounds(
@@ -137,45 +300,124 @@ class ParamsAccessor(DataArrayAccessor):
     ) -> xr.DataArray:
         if params_name is None:
             params_name = ["center"]
-        param_to_sortby = self._obj.params.get(target_param_name)
-        sorted_indices = param_to_sortby.argsort(axis=-1)
-        for param_name in params_name:
-            param = self._obj.params.get(param_name)
-            sorted_param = param.isel(params_dim=sorted_indices)
-            self._obj.params.assign(sorted_param, param_name)
+        requested = list(dict.fromkeys([target_param_name, *params_name]))
+        _, columns = _param_columns(self._param_names(), requested)
+        columns = dict(zip(requested, columns, strict=True))
+        # the peaks of the target, in the order of their target values
+        n_peaks = sum(name is not None for name in columns[target_param_name])
+        values = self.get(requested)
+        order = np.argsort(values[target_param_name].values[..., :n_peaks], axis=-1)
+        names = [name for param in params_name for name in columns[param][:n_peaks]]
+        sorted_values = [
+            np.take_along_axis(values[param].values[..., :n_peaks], order, axis=-1)
+            for param in params_name
+        ]
+        _write(
+            self._obj.values,
+            names,
+            {"value": np.concatenate(sorted_values, axis=-1)},
+        )
         return self._obj
 
     def get(
         self,
-        params_name: str = "center",
-        params_attr: str = "value",
-    ) -> xr.DataArray:
-        return xr.apply_ufunc(
+        params_name: str | list = "center",
+        params_attr: str | list = "value",
+    ) -> xr.DataArray | xr.Dataset:
+        """
+        Collect parameter attributes of all pixels in a single pass.
+
+        Parameters
+        ----------
+        params_name : str or list of str, optional
+            Parameters are matched by the end of their name, e.g. "center" matches
+            "p0_center" and "p1_center". A list returns a Dataset with a variable
+            for each name.
+        params_attr : str or list of str, optional
+            "value", "stderr", "min", "max" or "vary". A list adds an "attr" dim.
+
+        Returns
+        -------
+        xr.DataArray or xr.Dataset
+            The attributes with a "params_dim" dim, labeled by the prefix of each
+            parameter in the "param" coordinate.
+        """
+        names = [params_name] if isinstance(params_name, str) else list(params_name)
+        attrs = [params_attr] if isinstance(params_attr, str) else list(params_attr)
+        if self._obj.chunks is not None:
+            # lazy fit results carry the parameter names, see FitAccessor.__call__
+            param_names = self._obj.attrs["param_names"]
+        else:
+            param_names = list(self._obj.values.flat[0].params)
+        prefixes, columns = _param_columns(param_names, names)
+        dask_kws: dict[str, Any] = {}
+        if self._obj.chunks is not None:
+            dask_kws = {
+                "dask": "parallelized",
+                "output_dtypes": [float],
+                "dask_gufunc_kwargs": {
+                    "output_sizes": {
+                        "attr": len(attrs),
+                        "name": len(names),
+                        "params_dim": len(prefixes),
+                    }
+                },
+            }
+        arr = xr.apply_ufunc(
             _get,
             self._obj,
-            kwargs={
-                "params_name": params_name,
-                "params_attr": params_attr,
-            },
-            input_core_dims=[[]],
-            output_core_dims=[["params_dim"]],
-            vectorize=True,
+            kwargs={"columns": columns, "attrs": attrs},
+            output_core_dims=[["attr", "name", "params_dim"]],
+            **dask_kws,
         )
+        return _labeled(arr, params_name, params_attr, prefixes)
 
     def assign(
         self,
-        params_value_new: xr.DataArray,
+        params_value_new: xr.DataArray | np.ndarray,
         params_name: str = "center",
         # params_attr: str = "value",
     ) -> xr.DataArray:
-        return xr.apply_ufunc(
-            _assign,
-            self._obj,
-            params_value_new,
-            kwargs={
-                "params_name": params_name,
-                # "params_attr": params_attr,
-            },
-            input_core_dims=[[], ["params_dim"]],
-            vectorize=True,
+        _, (names,) = _param_columns(self._param_names(), [params_name])
+        if isinstance(params_value_new, xr.DataArray):
+            params_value_new = params_value_new.transpose(*self._obj.dims, ...).values
+        _write(self._obj.values, names, {"value": params_value_new})
+        return self._obj
+
+
+@xr.register_dataset_accessor("params")
+class ParamsDatasetAccessor(DatasetAccessor):
+    """Handle Parameter of a columnar fit result Dataset, see `FitAccessor`."""
+
+    def get(
+        self,
+        params_name: str | list = "center",
+        params_attr: str | list = "value",
+    ) -> xr.DataArray | xr.Dataset:
+        names = [params_name] if isinstance(params_name, str) else list(params_name)
+        attrs = [params_attr] if isinstance(params_attr, str) else list(params_attr)
+        param_names = list(self._obj["param"].values)
+        prefixes, columns = _param_columns(param_names, names)
+        positions = xr.DataArray(
+            [
+                [param_names.index(name) if name is not None else 0 for name in column]
+                for column in columns
+            ],
+            dims=("name", "params_dim"),
+        )
+        found = xr.DataArray(
+            [[name is not None for name in column] for column in columns],
+            dims=("name", "params_dim"),
         )
+        arr = xr.concat(
+            [
+                self._obj[attr]
+                .drop_vars(["param", "expr"])
+                .isel(param=positions)
+                .astype(float)
+                .where(found)
+                for attr in attrs
+            ],
+            dim="attr",
+        ).transpose(..., "attr", "name", "params_dim")
+        return _labeled(arr, params_name, params_attr, prefixes)
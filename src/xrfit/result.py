@@ -0,0 +1,283 @@
+import os
+import threading
+
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+from xrfit.base import DatasetAccessor
+
+_PARAM_ATTRS = ["value", "stderr", "min", "max", "vary", "init_value"]
+_FIT_STATS = [
+    "aic",
+    "bic",
+    "chisqr",
+    "redchi",
+    "rsquared",
+    "success",
+    "nfev",
+    "ndata",
+    "nfree",
+    "nvarys",
+]
+_DTYPES = {
+    "vary": bool,
+    "success": bool,
+    "nfev": int,
+    "ndata": int,
+    "nfree": int,
+    "nvarys": int,
+}
+
+
+def _columns(
+    model_result: lf.model.ModelResult,
+    param_names: list,
+) -> tuple:
+    """Flatten a ModelResult into per-parameter arrays followed by the fit stats."""
+    params = model_result.params
+    init_params = model_result.init_params
+    columns: list = []
+    for attr in _PARAM_ATTRS:
+        column: np.ndarray = np.full(
+            len(param_names), np.nan, dtype=_DTYPES.get(attr, float)
+        )
+        for i, name in enumerate(param_names):
+            if attr == "init_value":
+                if init_params is not None and name in init_params:
+                    column[i] = init_params[name].value
+            elif name in params:
+                value = getattr(params[name], attr)
+                column[i] = np.nan if value is None else value
+        columns.append(column)
+    columns.extend(getattr(model_result, stat, np.nan) for stat in _FIT_STATS)
+    return tuple(columns)
+
+
+def _param_exprs(
+    model_result: lf.model.ModelResult,
+    param_names: list,
+) -> list:
+    params = model_result.params
+    return [(params[name].expr or "") if name in params else "" for name in param_names]
+
+
+def _to_dataset(
+    columns: tuple,
+    coords: dict,
+    dims: list,
+    param_names: list,
+    exprs: list,
+    data: xr.DataArray | xr.Variable | None,
+    model: lf.model.Model,
+    input_core_dims: str,
+) -> xr.Dataset:
+    """Assemble the columnar fit result from per-pixel columns."""
+    ds = xr.Dataset(
+        {
+            **{
+                attr: ([*dims, "param"], column)
+                for attr, column in zip(_PARAM_ATTRS, columns, strict=False)
+            },
+            **{
+                stat: (dims, column)
+                for stat, column in zip(
+                    _FIT_STATS, columns[len(_PARAM_ATTRS) :], strict=True
+                )
+            },
+        },
+        coords={
+            **coords,
+            "param": param_names,
+            "expr": ("param", exprs),
+        },
+        attrs={"model": model, "input_core_dims": input_core_dims},
+    )
+    if data is not None:
+        ds["data"] = data
+    return ds
+
+
+def _make_params(
+    model: lf.model.Model,
+    ds: xr.Dataset,
+    attr: str = "value",
+) -> lf.Parameters:
+    """Build Parameters for a single pixel of a columnar fit result."""
+    params = model.make_params()
+    for i, name in enumerate(ds["param"].values):
+        expr = str(ds["expr"].values[i])
+        if name not in params:
+            params.add(name)
+        params[name].set(expr=expr)
+        if expr:
+            continue
+        params[name].set(
+            value=ds[attr].values[i],
+            min=ds["min"].values[i],
+            max=ds["max"].values[i],
+            vary=bool(ds["vary"].values[i]),
+        )
+    return params
+
+
+class _Evaluator:
+    """Evaluate the model of a columnar fit result for rows of parameter values."""
+
+    def __init__(self, ds: xr.Dataset) -> None:
+        self.model = ds.attrs["model"]
+        first = ds.isel(dict.fromkeys(ds["success"].dims, 0))
+        self.params = _make_params(self.model, first)
+        for par in self.params.values():
+            if not par.expr:
+                par.set(min=-np.inf, max=np.inf)
+        self.param_names = list(ds["param"].values)
+        self.free = [not expr for expr in ds["expr"].values]
+        self._lock = threading.Lock()
+
+    def __call__(self, values: np.ndarray, x: np.ndarray) -> np.ndarray:
+        with self._lock:
+            for name, value, free in zip(
+                self.param_names, values, self.free, strict=True
+            ):
+                if free:
+                    self.params[name].value = value
+            return self.model.eval(self.params, x=x)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _to_modelresult(
+    ds: xr.Dataset,
+) -> lf.model.ModelResult:
+    """Rebuild the ModelResult of a single pixel of a columnar fit result."""
+    model = ds.attrs["model"]
+    x = ds[ds.attrs["input_core_dims"]].values
+    data = ds["data"].values if "data" in ds else None
+    weights = ds["weights"].values if "weights" in ds else None
+    init_params = _make_params(model, ds, "init_value")
+    params = _make_params(model, ds, "value")
+    for i, name in enumerate(ds["param"].values):
+        stderr = ds["stderr"].values[i]
+        params[name].stderr = None if np.isnan(stderr) else stderr
+
+    model_result = lf.model.ModelResult(
+        model, init_params, data=data, weights=weights, fcn_kws={"x": x}
+    )
+    model_result.params = params
+    model_result.init_values = {
+        name: par.value for name, par in init_params.items() if par.vary
+    }
+    model_result.best_values = {
+        name: par.value for name, par in params.items() if par.vary
+    }
+    model_result.var_names = [name for name, par in params.items() if par.vary]
+    model_result.init_fit = model.eval(init_params, x=x)
+    model_result.best_fit = model.eval(params, x=x)
+    if data is not None:
+        # data - model, as lmfit defines the residual
+        model_result.residual = data - model_result.best_fit
+        if weights is not None:
+            model_result.residual *= weights
+    model_result.errorbars = all(
+        params[name].stderr is not None for name in model_result.var_names
+    )
+    model_result.covar = None
+    for stat in _FIT_STATS:
+        setattr(model_result, stat, ds[stat].values.item())
+    return model_result
+
+
+@xr.register_dataset_accessor("fit")
+class FitResultAccessor(DatasetAccessor):
+    """
+    Handle a columnar fit result Dataset or parameter table.
+
+    The Dataset holds one float array per parameter attribute and fit statistic.
+    ModelResults and Parameters are only rebuilt from it when asked for.
+
+    Methods
+    -------
+    modelresult(index_dict: dict | None = None, **indexers) -> lf.model.ModelResult
+        Rebuilds the ModelResult of a single pixel.
+
+    to_dataarray() -> xr.DataArray
+        Rebuilds the ModelResults of all pixels as an object DataArray.
+
+    parameters(index_dict: dict | None = None, **indexers) -> lf.Parameters
+        Builds the Parameters of a single pixel.
+
+    to_parameters() -> xr.DataArray
+        Builds the Parameters of all pixels as an object DataArray.
+
+    save(path: str | os.PathLike, **kwargs) -> None
+        Writes the result to netCDF or Zarr, see `xrfit.open_result`.
+    """
+
+    def _other_dims(self) -> list:
+        return [dim for dim in self._obj["value"].dims if dim != "param"]
+
+    def _pixel(
+        self,
+        index_dict: dict | None,
+        indexers: dict,
+    ) -> xr.Dataset:
+        ds = self._obj.isel({**(index_dict or {}), **indexers})
+        dims = [dim for dim in ds["value"].dims if dim != "param"]
+        if dims:
+            raise ValueError(f"An index is required for each of the dims {dims}.")
+        return ds
+
+    def _map(self, func) -> xr.DataArray:
+        dims = self._other_dims()
+        shape = [self._obj.sizes[dim] for dim in dims]
+        out = np.empty(shape, dtype=object)
+        for index in np.ndindex(*shape):
+            out[index] = func(dict(zip(dims, index, strict=True)))
+        return xr.DataArray(
+            out,
+            coords={
+                name: coord
+                for name, coord in self._obj["value"].coords.items()
+                if "param" not in coord.dims
+            },
+            dims=dims,
+        )
+
+    def modelresult(
+        self,
+        index_dict: dict | None = None,
+        **indexers,
+    ) -> lf.model.ModelResult:
+        return _to_modelresult(self._pixel(index_dict, indexers))
+
+    def to_dataarray(
+        self,
+    ) -> xr.DataArray:
+        return self._map(self.modelresult)
+
+    def parameters(
+        self,
+        index_dict: dict | None = None,
+        **indexers,
+    ) -> lf.Parameters:
+        return _make_params(self._obj.attrs["model"], self._pixel(index_dict, indexers))
+
+    def to_parameters(
+        self,
+    ) -> xr.DataArray:
+        return self._map(self.parameters)
+
+    def save(
+        self,
+        path: str | os.PathLike,
+        **kwargs,
+    ) -> None:
+        from xrfit.storage import save_result
+
+        save_result(self._obj, path, **kwargs)
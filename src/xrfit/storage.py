@@ -0,0 +1,164 @@
+import functools
+import inspect
+import json
+import operator
+import os
+
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+_FORMAT_VERSION = 1
+_OPERATORS = {
+    op.__name__: op
+    for op in [operator.add, operator.sub, operator.mul, operator.truediv]
+}
+# boolean variables are stored as integers, as netCDF3 has no boolean type
+_BOOLS = ["vary", "success"]
+
+
+def _model_to_dict(model: lf.Model) -> dict:
+    """
+    Describe a model tree as plain JSON-serializable data.
+
+    Built-in models of `lmfit.models` are described by their class, so that they
+    are rebuilt with their guess functions. Other models fall back to
+    `lmfit.Model.dumps`.
+    """
+    if isinstance(model, lf.model.CompositeModel) and model.op.__name__ in _OPERATORS:
+        return {
+            "op": model.op.__name__,
+            "left": _model_to_dict(model.left),
+            "right": _model_to_dict(model.right),
+        }
+    cls = type(model)
+    if cls.__module__ == lf.models.__name__:
+        init_params = inspect.signature(cls.__init__).parameters
+        kwargs = {key: val for key, val in model.opts.items() if key in init_params}
+        if isinstance(model, lf.models.PolynomialModel):
+            kwargs["degree"] = model.poly_degree
+        description = {
+            "class": cls.__name__,
+            "prefix": model.prefix,
+            "nan_policy": model.nan_policy,
+            "kwargs": kwargs,
+            "param_hints": model.param_hints,
+        }
+        try:
+            rebuilt = _model_from_dict(json.loads(json.dumps(description)))
+        except (TypeError, ValueError):
+            rebuilt = None
+        # param_names gains derived parameters once a model is fit, compare the
+        # function arguments instead
+        if rebuilt is not None and rebuilt._param_root_names == model._param_root_names:
+            return description
+    return {"dumps": model.dumps()}
+
+
+def _model_from_dict(description: dict) -> lf.Model:
+    if "op" in description:
+        return lf.model.CompositeModel(
+            _model_from_dict(description["left"]),
+            _model_from_dict(description["right"]),
+            _OPERATORS[description["op"]],
+        )
+    if "dumps" in description:
+        return lf.Model(lambda x: x).loads(description["dumps"])
+    model = getattr(lf.models, description["class"])(
+        prefix=description["prefix"],
+        nan_policy=description["nan_policy"],
+        **description["kwargs"],
+    )
+    model.param_hints = description["param_hints"]
+    return model
+
+
+def _dumps_model(model: lf.Model) -> str:
+    return json.dumps(_model_to_dict(model))
+
+
+@functools.lru_cache(maxsize=32)
+def _loads_model(text: str) -> lf.Model:
+    """Rebuild a model once per description, results of many files share it."""
+    return _model_from_dict(json.loads(text))
+
+
+def _encode(ds: xr.Dataset) -> xr.Dataset:
+    ds = ds.copy()
+    for name in _BOOLS:
+        if name in ds:
+            ds[name] = ds[name].astype(np.int8)
+    ds.attrs = {
+        **ds.attrs,
+        "model": _dumps_model(ds.attrs["model"]),
+        "xrfit_format": _FORMAT_VERSION,
+    }
+    return ds
+
+
+def _decode(ds: xr.Dataset) -> xr.Dataset:
+    if "xrfit_format" not in ds.attrs:
+        raise ValueError("Not a fit result written by xrfit.")
+    for name in _BOOLS:
+        if name in ds:
+            ds[name] = ds[name].astype(bool)
+    ds["expr"] = ds["expr"].astype(str)
+    ds.attrs = {key: val for key, val in ds.attrs.items() if key != "xrfit_format"}
+    ds.attrs["model"] = _loads_model(ds.attrs["model"])
+    return ds
+
+
+def _is_zarr(path: str | os.PathLike) -> bool:
+    return os.fspath(path).rstrip("/").endswith(".zarr")
+
+
+def save_result(
+    ds: xr.Dataset,
+    path: str | os.PathLike,
+    **kwargs,
+) -> None:
+    """
+    Write a columnar fit result to netCDF, or to Zarr for paths ending in ".zarr".
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Fit result, as returned by ``fit(..., output="dataset")``.
+    path : str or os.PathLike
+        Destination file or Zarr store.
+    **kwargs
+        Passed on to `xr.Dataset.to_netcdf` or `xr.Dataset.to_zarr`.
+    """
+    ds = _encode(ds)
+    if _is_zarr(path):
+        ds.to_zarr(path, **kwargs)
+    else:
+        ds.to_netcdf(path, **kwargs)
+
+
+def open_result(
+    path: str | os.PathLike,
+    **kwargs,
+) -> xr.Dataset:
+    """
+    Open a fit result written by `save_result`.
+
+    Arrays are loaded lazily, so that opening is fast for any size. ModelResults
+    are only rebuilt, from the pixels accessed, through
+    ``ds.fit.modelresult(...)`` or ``ds.fit.to_dataarray()``.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File or Zarr store written by `save_result`.
+    **kwargs
+        Passed on to `xr.open_dataset` or `xr.open_zarr`.
+
+    Returns
+    -------
+    xr.Dataset
+        The columnar fit result, see ``FitAccessor.__call__``.
+    """
+    if _is_zarr(path):
+        return _decode(xr.open_zarr(path, **kwargs))
+    return _decode(xr.open_dataset(path, **kwargs))
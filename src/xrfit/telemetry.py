@@ -0,0 +1,270 @@
+import contextlib
+import time
+from collections.abc import Callable
+
+import lmfit as lf
+import numpy as np
+import xarray as xr
+
+
+def _record(
+    result: lf.model.ModelResult,
+    wall_time: float,
+    nfev: int | None = None,
+    bound_iter: int = 0,
+    events: list | None = None,
+) -> lf.model.ModelResult:
+    """
+    Attach the timings of a fit to its ModelResult.
+
+    They travel with the result from the worker processes and are taken off
+    again by `Telemetry.pixel`. `events` are ``(event, data)`` pairs emitted
+    there on behalf of the worker.
+    """
+    result._telemetry = {
+        "wall_time": wall_time,
+        "nfev": result.nfev if nfev is None else nfev,
+        "bound_iter": bound_iter,
+        "events": events or [],
+    }
+    return result
+
+
+def _message(event: str, data: dict) -> str | None:
+    """Format the line printed for an event, None for events that are not printed."""
+    if event == "start_estimated":
+        return (
+            "⚡️ No initial coords provided for fit_with_corr\n"
+            f"⚡️ Estimate used : {data['start']}"
+        )
+    if event == "bound_tol_reached":
+        parts = [
+            "⚡️ iter_bound tol reached at iter : ",
+            data["iteration"],
+            "iter_crit_ratio : ",
+            data["iter_crit_ratio"],
+            "iter_tol : ",
+            data["iter_tol"],
+        ]
+        return " ".join(str(part) for part in parts)
+    if event == "bound_iter_max":
+        parts = [
+            "⚠️ iter_max reached at iter : ",
+            data["iteration"],
+            "for idx : ",
+            data["index_dict"],
+            "iter_crit_ratio : ",
+            data["iter_crit_ratio"],
+            "iter_tol : ",
+            data["iter_tol"],
+            "max_bound : ",
+            data["bound_ratio"],
+        ]
+        return " ".join(str(part) for part in parts)
+    if event == "corr_done":
+        message = f"⚡️ fit_with_corr nfev : {data['nfev']}"
+        if "raster_nfev" in data:
+            message += f", raster : {data['raster_nfev']}, saved : {data['saved']}"
+        return message
+    if event == "refit_done":
+        return (
+            f"⚡️ Refit {data['n_refit']} of {data['n_pixels']} pixels in "
+            f"{data['time']:.2f} s, ~{data['saved']:.2f} s saved by reusing "
+            f"{data['n_pixels'] - data['n_refit']}"
+        )
+    if event == "lean":
+        return (
+            f"⚡️ lean results : {data['before']['total'] / 1024:.1f} KiB -> "
+            f"{data['after']['total'] / 1024:.1f} KiB per pixel"
+        )
+    if event == "pyramid_level":
+        return (
+            f"⚡️ pyramid level {data['level']} : {data['n_pixels']} pixels, "
+            f"nfev {data['nfev']}"
+        )
+    return None
+
+
+def _print_message(event: str, data: dict) -> None:
+    message = _message(event, data)
+    if message is not None:
+        print(message)
+
+
+# the only messages printed by `fit_with_corr` without telemetry, as before it
+# emitted events
+_PRINTED = ["start_estimated", "bound_tol_reached", "bound_iter_max"]
+
+
+def _print_default(event: str, data: dict) -> None:
+    if event in _PRINTED:
+        _print_message(event, data)
+
+
+class _Progress:
+    """Print the number of fitted pixels of a stage and the remaining time."""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self.total = None
+
+    def __call__(self, event: str, data: dict) -> None:
+        if event == "stage_start":
+            self.stage = data["stage"]
+            self.total = data.get("n_pixels")
+            self.done = 0
+            self.start = self.last = time.perf_counter()
+        elif event == "pixel" and self.total:
+            self.done += 1
+            now = time.perf_counter()
+            if now - self.last < self.interval and self.done < self.total:
+                return
+            self.last = now
+            elapsed = now - self.start
+            eta = elapsed / self.done * max(self.total - self.done, 0)
+            print(
+                f"⚡️ {self.stage} : {self.done}/{self.total} pixels, "
+                f"{elapsed:.1f} s elapsed, ETA {eta:.1f} s"
+            )
+
+
+class Telemetry:
+    """
+    Per-pixel timings of the fits of `FitAccessor` and a stream of its events.
+
+    Pass an instance as ``telemetry=`` to ``da.fit``, ``da.fit.fit_with_corr``
+    or ``da.fit.pyramid``. Afterwards `dataset` holds the wall time, the number
+    of function evaluations and the number of bound iterations of every pixel,
+    summed over the calls the instance was passed to, and `stages` the time
+    spent in the "guess", "fit", "corr" (the correlated refits of
+    `fit_with_corr`, with their bound iterations), "raster_baseline",
+    "pyramid" and "assemble" stages.
+
+    Callbacks are called as ``callback(event, data)`` with the name of the
+    event and a dict:
+
+    - "stage_start" and "stage": a stage starts, with its "n_pixels" if they
+      are fitted one by one, or ends, with its wall "time".
+    - "pixel": a pixel is fitted, with its flat "index" over the non-core
+      dims and its "wall_time", "nfev" and "bound_iter".
+    - "start_estimated", "bound_tol_reached", "bound_iter_max" and
+      "corr_done", with the "raster_nfev" and "saved" nfev of a raster
+      baseline if asked for, of `fit_with_corr`, "refit_done" of a fit with
+      ``where``, "pyramid_level" of `pyramid` and "lean" with the
+      `memory_report` of the results "before" and "after" they are made lean.
+      Without telemetry, only the first three are printed.
+
+    Parameters
+    ----------
+    callbacks : list of callable or None, optional
+        Callbacks registered from the start, by default None.
+    progress : bool, optional
+        Print the number of fitted pixels of each stage with an estimate of the
+        remaining time. By default False.
+    interval : float, optional
+        Minimum number of seconds between two progress lines, by default 1.
+    verbose : bool, optional
+        Print the messages of all of the events above. By default False.
+    """
+
+    def __init__(
+        self,
+        callbacks: list | None = None,
+        progress: bool = False,
+        interval: float = 1.0,
+        verbose: bool = False,
+    ) -> None:
+        self.callbacks: list[Callable[[str, dict], None]] = []
+        if verbose:
+            self.callbacks.append(_print_message)
+        if progress:
+            self.callbacks.append(_Progress(interval))
+        self.callbacks.extend(callbacks or [])
+        self.stages: dict[str, float] = {}
+        self._template: xr.DataArray | None = None
+
+    def register(
+        self,
+        callback: Callable[[str, dict], None],
+    ) -> Callable[[str, dict], None]:
+        """Register a callback, returned as is so that this works as a decorator."""
+        self.callbacks.append(callback)
+        return callback
+
+    def emit(self, event: str, **data) -> None:
+        """Call every callback with `event` and `data`."""
+        for callback in self.callbacks:
+            callback(event, data)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, n_pixels: int | None = None):
+        """Time a stage, adding up the time of stages of the same name."""
+        self.emit("stage_start", stage=name, n_pixels=n_pixels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            self.emit("stage", stage=name, time=elapsed)
+
+    def _allocate(self, template: xr.DataArray) -> None:
+        """Start recording pixels on the grid of `template`, unless it already is."""
+        if self._template is not None and self._template.shape == template.shape:
+            return
+        self._template = xr.DataArray(
+            np.empty(template.shape, dtype=np.uint8),
+            coords=template.coords,
+            dims=template.dims,
+        )
+        self._wall_time = np.zeros(template.size)
+        self._nfev = np.zeros(template.size, dtype=int)
+        self._bound_iter = np.zeros(template.size, dtype=int)
+
+    def _add(self, index, wall_time, nfev, bound_iter) -> None:
+        if self._template is None:
+            return
+        self._wall_time[index] += wall_time
+        self._nfev[index] += nfev
+        self._bound_iter[index] += bound_iter
+
+    def pixel(self, index: int, result: lf.model.ModelResult) -> None:
+        """Record the fit of the pixel at flat `index` and emit its events."""
+        info = result.__dict__.pop("_telemetry", None)
+        if info is None:
+            # rebuilt from a checkpoint or reused, not fitted
+            return
+        self._add(index, info["wall_time"], info["nfev"], info["bound_iter"])
+        self.emit(
+            "pixel",
+            index=index,
+            wall_time=info["wall_time"],
+            nfev=info["nfev"],
+            bound_iter=info["bound_iter"],
+        )
+        for event, data in info["events"]:
+            self.emit(event, index=index, **data)
+
+    @property
+    def dataset(self) -> xr.Dataset | None:
+        """
+        The recorded pixels, None before the first fit.
+
+        Has the data variables "wall_time" in seconds, "nfev" and "bound_iter"
+        on the non-core dims of the data, and the time of every stage as
+        ``<stage>_time`` attributes.
+        """
+        if self._template is None:
+            return None
+        shape = self._template.shape
+        return xr.Dataset(
+            {
+                name: self._template.copy(data=values.reshape(shape).copy())
+                for name, values in [
+                    ("wall_time", self._wall_time),
+                    ("nfev", self._nfev),
+                    ("bound_iter", self._bound_iter),
+                ]
+            },
+            attrs={f"{name}_time": elapsed for name, elapsed in self.stages.items()},
+        )
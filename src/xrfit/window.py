@@ -0,0 +1,577 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyqtgraph as pg
+import xarray as xr
+
+# from pyqtgraph.graphicsItems.GradientEditorItem import Gradients
+from qtpy import QtCore
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QScrollArea,
+    QSlider,
+    QVBoxLayout,
+    QWidget,
+)
+
+import xrfit
+from xrfit.arr import _components
+
+# os.environ["QT_API"] = "pyqt6"
+pg.setConfigOption("background", "w")
+pg.setConfigOption("foreground", "k")
+
+__all__ = ["xrfit"]
+
+
+class _PixelCache:
+    """
+    Bounded LRU cache of what the window shows for an index of the array.
+
+    Entries are loaded under a lock, so that the main thread and the prefetching
+    thread never evaluate ModelResults at the same time. Lazy arrays are computed
+    a whole chunk at a time, and the last `max_chunks` chunks are kept, so that
+    the fits behind a chunk run once for all of its pixels.
+    """
+
+    def __init__(
+        self,
+        xarr: xr.DataArray,
+        tolerance: float,
+        maxsize: int = 256,
+        max_chunks: int = 4,
+    ):
+        self._obj = xarr
+        self.tolerance = tolerance
+        self.maxsize = maxsize
+        self.max_chunks = max_chunks
+        self._pixels: OrderedDict[tuple, dict] = OrderedDict()
+        self._chunks: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._bounds = (
+            None
+            if xarr.chunks is None
+            else [np.cumsum([0, *sizes]) for sizes in xarr.chunks]
+        )
+        self._lock = threading.Lock()
+
+    def _model_result(self, index: tuple):
+        if self._bounds is None:
+            return self._obj.values[index]
+        block = tuple(
+            int(np.searchsorted(bounds, i, side="right")) - 1
+            for bounds, i in zip(self._bounds, index, strict=True)
+        )
+        if block in self._chunks:
+            self._chunks.move_to_end(block)
+        else:
+            self._chunks[block] = self._obj[
+                tuple(
+                    slice(bounds[k], bounds[k + 1])
+                    for bounds, k in zip(self._bounds, block, strict=True)
+                )
+            ].values
+            if len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+        return self._chunks[block][
+            tuple(
+                i - bounds[k]
+                for i, bounds, k in zip(index, self._bounds, block, strict=True)
+            )
+        ]
+
+    def _load(self, index: tuple) -> dict:
+        model_result = self._model_result(index)
+        params = []
+        for param_name, param in model_result.params.items():
+            color = (
+                "green"
+                if param.min + self.tolerance < param.value < param.max - self.tolerance
+                else "red"
+            )
+            params.append(
+                f"<b style='color:{color}'>{param_name}</b><br>Value: {param.value:.3f}<br>Min: {param.min:.3f}<br>Max: {param.max:.3f}<br>Vary: {param.vary}<br>Expr: {param.expr}<br>"
+            )
+        return {
+            "x": model_result.userkws["x"],
+            "data": model_result.data,
+            "init_fit": model_result.init_fit,
+            "best_fit": model_result.best_fit,
+            "components": _components(model_result),
+            "params": params,
+            "model_result": model_result,
+        }
+
+    def __contains__(self, index: tuple) -> bool:
+        return index in self._pixels
+
+    def get(self, index: tuple) -> dict:
+        with self._lock:
+            if index in self._pixels:
+                self._pixels.move_to_end(index)
+                return self._pixels[index]
+            pixel = self._load(index)
+            self._pixels[index] = pixel
+            if len(self._pixels) > self.maxsize:
+                self._pixels.popitem(last=False)
+            return pixel
+
+    def param_values(self, indexer: tuple = ()) -> dict:
+        """Collect the values of all parameters of a part of the array in one pass."""
+        with self._lock:
+            values = self._obj[indexer].values
+            names = list(values.flat[0].params)
+            columns = np.full((*values.shape, len(names)), np.nan)
+            for index, model_result in np.ndenumerate(values):
+                params = model_result.params
+                columns[index] = [params[name].value for name in names]
+        return {name: columns[..., i] for i, name in enumerate(names)}
+
+    def prefetch(self, indices: list) -> None:
+        for index in indices:
+            if index not in self:
+                self.get(index)
+
+
+class MainWindow(QWidget):
+    def __init__(self, xarr) -> None:
+        super().__init__()
+        self._obj = xarr
+        self.fit_stat = "rsquared"
+        self.goodness_threshold_lower = 0.8
+        self.goodness_threshold_upper = 1.5
+        self.tolerance = 1e-4
+        self.setWindowTitle("Display Manager")
+
+        # per-tick work only looks up precomputed statistics and cached pixels
+        self._stats: dict[str, np.ndarray] = {}
+        self._pixels = _PixelCache(xarr, self.tolerance)
+        self._prefetcher = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_future = None
+        # slider events arriving within a frame are drawn once
+        self._redraw_timer = QtCore.QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(16)
+        self._redraw_timer.timeout.connect(self._redraw)
+
+        main_layout = QHBoxLayout()
+        self.setLayout(main_layout)
+
+        left_layout = QVBoxLayout()
+        main_layout.addLayout(left_layout)
+
+        self.win = pg.GraphicsLayoutWidget()
+        left_layout.addWidget(self.win)
+        self.plot = self.win.addPlot(title="Fitting Result")
+        initial_index = tuple([0] * (self._obj.ndim))
+        pixel = self._pixels.get(initial_index)
+        x = pixel["x"]
+        self.x_range = (x.min(), x.max())  # Store the x-axis range
+        y_range = self._y_range(initial_index)
+        self.plot.setYRange(y_range[0], y_range[1])
+        self.data_curve = self.plot.plot(
+            x=x,
+            y=pixel["data"],
+            symbol="o",
+            pen=None,
+            symbolBrush="k",
+        )
+        self.init_curve = self.plot.plot(
+            x=x,
+            y=pixel["init_fit"],
+            pen=pg.mkPen("b", width=4),
+        )
+        self.curve = self.plot.plot(
+            x=x,
+            y=pixel["best_fit"],
+            pen=pg.mkPen("r", width=4),
+        )
+
+        self.component_curves = []
+        colors = [
+            "orange",
+            "purple",
+            "brown",
+            "pink",
+            "gray",
+            "cyan",
+            "magenta",
+        ]
+        for i, (component_name, component) in enumerate(pixel["components"].items()):
+            component_curve = self.plot.plot(
+                x=x,
+                y=component,
+                pen=pg.mkPen(colors[i], width=2, style=QtCore.Qt.PenStyle.DashLine),
+                name=component_name,
+            )
+            self.component_curves.append(component_curve)
+
+        self.fix_ylim_checkbox = QCheckBox("Fix Y-Axis Limits")
+        self.fix_ylim_checkbox.toggled.connect(self.toggle_ylim)
+        left_layout.addWidget(self.fix_ylim_checkbox)
+
+        self.sliders = []
+        self.slider_values = []
+        self.slider_labels = []
+
+        for dim in range(self._obj.ndim):
+            slider_label = QLabel(f"{self._obj.dims[dim]}: 0")
+            slider = QSlider(QtCore.Qt.Orientation.Horizontal)
+            slider.setMinimum(0)
+            slider.setMaximum(self._obj.shape[dim] - 1)
+            slider.valueChanged.connect(self.update_plot)
+            self.sliders.append(slider)
+            self.slider_values.append(0)
+            self.slider_labels.append(slider_label)
+            left_layout.addWidget(slider_label)
+            left_layout.addWidget(slider)
+
+        self._add_heatmap(left_layout, pixel)
+
+        # Add dropdown for fit_stat
+        self.fit_stat_dropdown = QComboBox()
+        self.fit_stat_dropdown.addItems(
+            [
+                "aic",
+                "bic",
+                "chisqr",
+                "ci_out",
+                "redchi",
+                "rsquared",
+                "success",
+                "aborted",
+                "ndata",
+                "nfev",
+                "nfree",
+                "nvarys",
+                "ier",
+                "message",
+            ]
+        )
+        self.fit_stat_dropdown.setCurrentText(self.fit_stat)
+        self.fit_stat_dropdown.currentTextChanged.connect(
+            lambda _: self.update_fit_stat_label()
+        )
+        left_layout.addWidget(QLabel("Fit Statistic:"))
+        left_layout.addWidget(self.fit_stat_dropdown)
+
+        # Add a label to display the current fit_stat value
+        self.fit_stat_label = QLabel("Current Fit Stat: N/A")
+        left_layout.addWidget(self.fit_stat_label)
+
+        # Add a button to apply the input values
+        self.apply_button = QPushButton("Apply")
+        self.apply_button.clicked.connect(self.apply_inputs)
+        left_layout.addWidget(self.apply_button)
+        # Add input fields for goodness_threshold_lower and goodness_threshold_upper
+        self.goodness_threshold_lower_input = QLineEdit(
+            str(self.goodness_threshold_lower)
+        )
+        self.goodness_threshold_upper_input = QLineEdit(
+            str(self.goodness_threshold_upper)
+        )
+        left_layout.addWidget(QLabel("Goodness Threshold Lower:"))
+        left_layout.addWidget(self.goodness_threshold_lower_input)
+        left_layout.addWidget(QLabel("Goodness Threshold Upper:"))
+        left_layout.addWidget(self.goodness_threshold_upper_input)
+
+        # Add parameter values at the right of the main window
+        right_layout = QVBoxLayout()
+        main_layout.addLayout(right_layout)
+
+        self.param_labels = []
+        for text in pixel["params"]:
+            param_label = QLabel(text)
+            self.param_labels.append(param_label)
+            right_layout.addWidget(param_label)
+
+        # Add a scroll area for the parameter values
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setVerticalScrollBarPolicy(
+            QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn
+        )
+        scroll_area.setHorizontalScrollBarPolicy(
+            QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        scroll_content = QWidget()
+        scroll_layout = QVBoxLayout(scroll_content)
+        for label in self.param_labels:
+            scroll_layout.addWidget(label)
+        scroll_area.setWidget(scroll_content)
+        right_layout.addWidget(scroll_area)
+
+        # Add a label to indicate if all parameters are within bounds
+        self.param_status_label = QLabel("All Parameters Within Bounds")
+        right_layout.addWidget(self.param_status_label)
+        self.update_param_status_label()
+
+    def _y_range(self, initial_index) -> tuple:
+        """
+        Estimate the y range from a sample of pixels.
+
+        Lazy arrays are only sampled at the initial index, as any other pixel may
+        compute a chunk of fits.
+        """
+        if self._obj.chunks is None and self._obj.size > 1:
+            sample = np.unravel_index(
+                np.linspace(0, self._obj.size - 1, 64).astype(int), self._obj.shape
+            )
+            indices = {initial_index, *zip(*sample, strict=True)}
+        else:
+            indices = {initial_index}
+        best_fits = np.concatenate(
+            [self._pixels.get(index)["best_fit"] for index in indices]
+        )
+        return best_fits.min() * 1.1, best_fits.max() * 1.1
+
+    def _add_heatmap(self, layout, pixel):
+        """Add an image of a statistic or parameter over two dims of the array."""
+        self._param_values = None
+        self._heatmap_key = None
+        self.heatmap = self.win.addPlot(title="Overview")
+        self.heatmap_image = pg.ImageItem(axisOrder="col-major")
+        self.heatmap_image.setColorMap(pg.colormap.get("viridis"))
+        self.heatmap.addItem(self.heatmap_image)
+        self.heatmap_marker = pg.ScatterPlotItem(
+            size=12, symbol="s", pen=pg.mkPen("r", width=2), brush=None
+        )
+        self.heatmap.addItem(self.heatmap_marker)
+        self.heatmap.scene().sigMouseClicked.connect(self._heatmap_clicked)
+
+        self.heatmap_dropdown = QComboBox()
+        self.heatmap_dropdown.addItems(
+            ["-", "rsquared", "redchi", "chisqr", "aic", "bic", "nfev", "success"]
+            + [f"param: {name}" for name in pixel["model_result"].params]
+        )
+        # lazy arrays are only computed for the overview once it is asked for
+        self.heatmap_dropdown.setCurrentText(
+            "rsquared" if self._obj.chunks is None else "-"
+        )
+        self.heatmap_dims = [QComboBox(), QComboBox()]
+        for i, dropdown in enumerate(self.heatmap_dims):
+            dropdown.addItems(["-", *self._obj.dims])
+            dropdown.setCurrentIndex(i + 1 if i < self._obj.ndim else 0)
+            dropdown.currentTextChanged.connect(lambda _: self.update_heatmap())
+        self.heatmap_dropdown.currentTextChanged.connect(
+            lambda _: self.update_heatmap()
+        )
+        layout.addWidget(QLabel("Overview:"))
+        layout.addWidget(self.heatmap_dropdown)
+        dims_layout = QHBoxLayout()
+        for dropdown in self.heatmap_dims:
+            dims_layout.addWidget(dropdown)
+        layout.addLayout(dims_layout)
+        self.update_heatmap()
+
+    def _heatmap_values(self, name, indexer) -> np.ndarray:
+        """Values of a statistic or parameter for a part of the array, as floats."""
+        if self._obj.chunks is not None:
+            # only compute the part shown
+            if name.startswith("param: "):
+                return self._pixels.param_values(indexer)[name.removeprefix("param: ")]
+            return self._obj[indexer].assess.fit_stats(name).values.astype(float)
+        if name.startswith("param: "):
+            if self._param_values is None:
+                self._param_values = self._pixels.param_values()
+            return self._param_values[name.removeprefix("param: ")][indexer]
+        return self._stat_values(name)[indexer].astype(float)
+
+    def _heatmap_axes(self) -> list:
+        """Axes of the array shown horizontally and vertically, None if unset."""
+        dims = [dropdown.currentText() for dropdown in self.heatmap_dims]
+        axes = [self._obj.dims.index(dim) if dim != "-" else None for dim in dims]
+        if axes[0] == axes[1]:
+            axes[1] = None
+        return axes
+
+    def update_heatmap(self):
+        index = tuple(self.slider_values)
+        axes = self._heatmap_axes()
+        # dims set by the sliders only
+        fixed = tuple(i for i in range(self._obj.ndim) if i not in axes)
+        key = (
+            self.heatmap_dropdown.currentText(),
+            tuple(axes),
+            tuple(index[i] for i in fixed),
+        )
+        if key[0] == "-" or self._obj.ndim == 0:
+            self._heatmap_key = None
+            self.heatmap_image.clear()
+        elif key != self._heatmap_key:
+            self._heatmap_key = key
+            image = self._heatmap_values(
+                key[0],
+                tuple(
+                    slice(None) if i in axes else index[i]
+                    for i in range(self._obj.ndim)
+                ),
+            )
+            # order the remaining dims as (horizontal, vertical), unset ones of size 1
+            remaining = sorted(axis for axis in axes if axis is not None)
+            image = np.transpose(
+                image, [remaining.index(axis) for axis in axes if axis is not None]
+            )
+            image = image.reshape(
+                [self._obj.shape[axis] if axis is not None else 1 for axis in axes]
+            )
+            finite = image[np.isfinite(image)]
+            levels = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+            self.heatmap_image.setImage(image, levels=levels)
+        self.heatmap_marker.setData(
+            [index[axes[0]] + 0.5 if axes[0] is not None else 0.5],
+            [index[axes[1]] + 0.5 if axes[1] is not None else 0.5],
+        )
+
+    def _heatmap_clicked(self, event):
+        pos = self.heatmap.vb.mapSceneToView(event.scenePos())
+        if not self.heatmap.vb.sceneBoundingRect().contains(event.scenePos()):
+            return
+        for axis, coord in zip(self._heatmap_axes(), [pos.x(), pos.y()], strict=True):
+            if axis is not None and 0 <= coord < self._obj.shape[axis]:
+                self.sliders[axis].setValue(int(coord))
+
+    def toggle_ylim(self, checked):
+        if checked:
+            y_range = self.plot.viewRange()[1]
+            self.plot.enableAutoRange("y", False)
+            self.plot.setYRange(y_range[0], y_range[1])
+        else:
+            self.plot.enableAutoRange("y", True)
+
+    def update_plot(self, value):
+        sender = self.sender()
+        for i, slider in enumerate(self.sliders):
+            if slider == sender:
+                self.slider_values[i] = value
+                self.slider_labels[i].setText(f"{self._obj.dims[i]}: {value}")
+        # not restarted while pending, so that a continuous drag still redraws
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+
+    def _redraw(self):
+        index = tuple(self.slider_values)
+        pixel = self._pixels.get(index)
+
+        x = pixel["x"]  # Update x data
+        self.curve.setData(x, pixel["best_fit"])
+        self.init_curve.setData(x, pixel["init_fit"])
+        self.data_curve.setData(x, pixel["data"])
+
+        # Update individual component plots
+        components = pixel["components"]
+        for component_curve, component_name in zip(
+            self.component_curves, components.keys(), strict=False
+        ):
+            component_curve.setData(x, components[component_name])
+
+        # Ensure the x-axis range remains visible
+        # self.plot.setXRange(*self.x_range)
+
+        # Update parameter labels
+        for param_label, text in zip(self.param_labels, pixel["params"], strict=False):
+            param_label.setText(text)
+
+        self.update_slider_label_color(index)
+        self.update_fit_stat_label(index)
+        self.update_param_status_label()
+        self.update_heatmap()
+        self._prefetch(index)
+
+    def _prefetch(self, index):
+        """Load the neighbors of `index` along every dimension in the background."""
+        neighbors = [
+            (*index[:dim], index[dim] + step, *index[dim + 1 :])
+            for dim, size in enumerate(self._obj.shape)
+            for step in [1, -1]
+            if 0 <= index[dim] + step < size
+        ]
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()
+        self._prefetch_future = self._prefetcher.submit(
+            self._pixels.prefetch, neighbors
+        )
+
+    def _stat_values(self, name) -> np.ndarray:
+        """Values of a fit statistic, collected once for the whole array."""
+        if name not in self._stats:
+            self._stats[name] = self._obj.assess.fit_stats(name).values
+        return self._stats[name]
+
+    def _stat(self, index):
+        if self._obj.chunks is None:
+            value = self._stat_values(self.fit_stat)[index]
+        else:
+            # read from the pixel, not to compute the whole array
+            value = getattr(
+                self._pixels.get(index)["model_result"], self.fit_stat, np.nan
+            )
+        return value.item() if isinstance(value, np.generic) else value
+
+    def update_slider_label_color(self, index):
+        goodness_of_fit = self._stat(index)
+        for _, label in enumerate(self.slider_labels):
+            if isinstance(goodness_of_fit, float):
+                if (
+                    self.goodness_threshold_lower
+                    <= goodness_of_fit
+                    <= self.goodness_threshold_upper
+                ):
+                    label.setStyleSheet("color: green;")
+                else:
+                    label.setStyleSheet("color: red;")
+
+    def update_fit_stat_label(self, index=None):
+        self.fit_stat = self.fit_stat_dropdown.currentText()
+        if index is None:
+            index = tuple(self.slider_values)
+        try:
+            current_fit_stat = self._stat(index)
+            self.fit_stat_label.setText(f"Current Fit Stat: {current_fit_stat}")
+        except KeyError:
+            self.fit_stat_label.setText("Current Fit Stat: N/A")
+
+    def update_param_status_label(self):
+        all_within_bounds = all("green" in label.text() for label in self.param_labels)
+        if all_within_bounds:
+            self.param_status_label.setText("All Parameters Within Bounds ✅")
+            self.param_status_label.setStyleSheet("color: green;")
+        else:
+            self.param_status_label.setText("Some Parameters Out of Bounds ❌")
+            self.param_status_label.setStyleSheet("color: red;")
+
+    def apply_inputs(self):
+        self.fit_stat = self.fit_stat_dropdown.currentText()
+        self.goodness_threshold_lower = float(
+            self.goodness_threshold_lower_input.text()
+        )
+        self.goodness_threshold_upper = float(
+            self.goodness_threshold_upper_input.text()
+        )
+        self.update_slider_label_color(tuple(self.slider_values))
+        self.update_fit_stat_label(tuple(self.slider_values))
+        self.update_param_status_label()
+
+    def closeEvent(self, event):
+        self._redraw_timer.stop()
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
+    # def display(self, return_window: bool = False):
+    #     if not QApplication.instance():
+    #         qapp = QApplication(sys.argv)
+    #     else:
+    #         qapp = QApplication.instance()  # type: ignore
+    #     qapp.setStyle("Fusion")
+
+    #     if return_window:
+    #         return self
+    #     self.show()
+    #     qapp.exec_()  # type: ignore
+    #     return None
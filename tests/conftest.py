@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+import xarray as xr
+from lmfit.models import LorentzianModel
+
+
+@pytest.fixture
+def data_array():
+    """Lorentzian peaks on a constant background, shifting along y."""
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    y = np.linspace(-5, 5, 6)
+    model = LorentzianModel()
+    return xr.DataArray(
+        np.stack([model.eval(x=x, amplitude=1, center=c, sigma=1.0) for c in y / 5]).T
+        + 0.1
+        + rng.normal(size=(x.size, y.size)) * 0.01,
+        coords={"x": x, "y": y},
+        dims=("x", "y"),
+    )
@@ -41,3 +41,31 @@ def test_get_arr_accessor():
     np.testing.assert_allclose(residual[0].values.flatten(), result.residual, rtol=1e-2)
     np.testing.assert_allclose(data[0].values.flatten(), result.data, rtol=1e-2)
     np.testing.assert_allclose(init_fit[0].values.flatten(), result.init_fit, rtol=1e-2)
+
+
+def test_get_arr_cache():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-5, 5, 100)
+    z = np.linspace(0.5, 1.5, 3)
+    model = lf.models.LorentzianModel() + lf.models.ConstantModel()
+    xarr = xr.DataArray(
+        np.stack([model.eval(x=x, amplitude=1, center=0, sigma=s, c=0.1) for s in z])
+        + rng.normal(size=(z.size, x.size)) * 0.01,
+        coords={"z": z, "x": x},
+        dims=("z", "x"),
+    )
+    result = xarr.fit(model=model)
+
+    best_fit = result.get_arr("best_fit")
+    for i in range(z.size):
+        np.testing.assert_allclose(best_fit[i], result[i].item().eval())
+    np.testing.assert_allclose(
+        result.get_arr("residual"), xarr.transpose("z", "x") - best_fit
+    )
+
+    # changing a parameter invalidates the cached curve of that pixel only
+    result[1].item().params["sigma"].value = 3.0
+    updated = result.get_arr("best_fit")
+    np.testing.assert_allclose(updated[1], result[1].item().eval())
+    assert not np.allclose(updated[1], best_fit[1])
+    np.testing.assert_allclose(updated[[0, 2]], best_fit[[0, 2]])
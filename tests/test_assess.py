@@ -31,3 +31,52 @@ def test_assess_accessor():
     assert rsquared[0].values == pytest.approx(result.rsquared, rel=1e-2)
     assert best_fit_max == {"z": 0}
     assert best_fit_stat == {"z": 0}
+
+
+def test_assess_summary():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(0, 10, 100)
+    model = lf.models.SineModel()
+    results = []
+    for amplitude in [1.0, 2.0, 3.0]:
+        y = amplitude * np.sin(x) + rng.normal(size=x.size) * 0.1
+        results.append(model.fit(y, model.guess(y, x=x), x=x))
+    xarr = xr.DataArray(results, coords={"z": [0, 1, 2]}, dims=["z"])
+
+    summary = xarr.assess.summary(["aic", "rsquared", "success", "nfev", "fit_max"])
+    assert isinstance(summary, xr.Dataset)
+    assert summary["aic"].dtype == float
+    assert summary["success"].dtype == bool
+    assert summary["nfev"].dtype == int
+    np.testing.assert_allclose(summary["aic"], [result.aic for result in results])
+    np.testing.assert_allclose(
+        summary["fit_max"], [result.best_fit.max() for result in results]
+    )
+    assert xarr.assess.best_fit_max() == {"z": 2}
+
+    # cached until refreshed
+    results[0].rsquared = 2.0
+    assert xarr.assess.best_fit_stat("rsquared") != {"z": 0}
+    xarr.assess.summary(["rsquared"], refresh=True)
+    assert xarr.assess.best_fit_stat("rsquared") == {"z": 0}
+
+
+def test_assess_summary_replaced():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(0, 10, 100)
+    model = lf.models.SineModel()
+    results = []
+    for amplitude in [1.0, 2.0, 3.0, 3.0]:
+        y = amplitude * np.sin(x) + rng.normal(size=x.size) * 0.1
+        results.append(model.fit(y, model.guess(y, x=x), x=x))
+    xarr = xr.DataArray(results[:3], coords={"z": [0, 1, 2]}, dims=["z"])
+
+    rsquared = xarr.assess.fit_stats("rsquared")
+    assert xarr.assess.best_fit_max() == {"z": 2}
+    # replacing a ModelResult invalidates the cache
+    xarr[1] = results[3]
+    np.testing.assert_allclose(
+        xarr.assess.fit_stats("rsquared"),
+        [rsquared[0], results[3].rsquared, rsquared[2]],
+    )
+    assert xarr.assess.fit_max()[1] == results[3].best_fit.max()
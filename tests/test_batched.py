@@ -0,0 +1,102 @@
+import lmfit as lf
+import numpy as np
+import pytest
+import xarray as xr
+from lmfit.models import (
+    ConstantModel,
+    ExponentialModel,
+    LorentzianModel,
+    VoigtModel,
+)
+
+from xrfit.batched import _Problem, _to_internal
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        LorentzianModel(prefix="p0_") + ConstantModel(prefix="c_"),
+        VoigtModel(prefix="p0_") + ConstantModel(prefix="c_"),
+    ],
+)
+def test_batched_lm(data_array, model):
+    expected = data_array.fit(model=model, output="dataset")
+    ds = data_array.fit(model=model, output="dataset", method="batched_lm")
+
+    assert ds["success"].all()
+    np.testing.assert_allclose(ds["value"], expected["value"], rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(ds["chisqr"], expected["chisqr"], rtol=1e-6)
+    np.testing.assert_allclose(ds["rsquared"], expected["rsquared"], rtol=1e-6)
+    np.testing.assert_allclose(ds["aic"], expected["aic"], rtol=1e-6)
+    vary = ds["vary"].values
+    np.testing.assert_allclose(
+        ds["stderr"].values[vary], expected["stderr"].values[vary], rtol=1e-3
+    )
+
+
+def test_batched_lm_modelresult(data_array):
+    model = LorentzianModel(prefix="p0_")
+    result = data_array.fit(model=model, method="batched_lm")
+
+    assert isinstance(result.isel(y=0).item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        result.params.get("center"),
+        data_array.fit(model=model).params.get("center"),
+        rtol=1e-4,
+    )
+
+
+def test_batched_lm_unsupported(data_array):
+    with pytest.raises(ValueError, match="batched_lm"):
+        data_array.fit(model=ExponentialModel(), method="batched_lm")
+
+
+def test_batched_lm_jacobian(data_array):
+    model = LorentzianModel(prefix="p0_") + ConstantModel(prefix="c_")
+    params = model.make_params(p0_amplitude=1, p0_center=0, p0_sigma=1, c_c=0)
+    params["p0_sigma"].set(min=0)
+    names = list(params)
+    data = data_array.values.T
+    x = data_array["x"].values
+    free = [name for name in names if not params[name].expr]
+    vmin = np.tile([params[name].min for name in free], (len(data), 1))
+    vmax = np.tile([params[name].max for name in free], (len(data), 1))
+    weights = np.ones_like(data)
+    weights[:, ::7] = 0.0
+    exprs = [params[name].expr or "" for name in names]
+    problem = _Problem(model, data, x, weights, names, exprs, vmin, vmax)
+    rows = np.arange(len(data))
+    internal = _to_internal(
+        np.tile([params[name].value for name in free], (len(data), 1)), vmin, vmax
+    )
+    residual = problem.residual(internal, rows)
+
+    assert problem.analytic
+    analytic = problem.jacobian(internal, residual, rows)
+    problem.analytic = False
+    numeric = problem.jacobian(internal, residual, rows)
+    np.testing.assert_allclose(analytic, numeric, atol=1e-5)
+
+
+def test_batched_lm_zero_weights(data_array):
+    model = LorentzianModel(prefix="p0_") + ConstantModel(prefix="c_")
+    weights = xr.ones_like(data_array)
+    weights[::7] = 0.0
+    expected = data_array.fit(model=model, output="dataset", weights=weights)
+    ds = data_array.fit(
+        model=model, output="dataset", weights=weights, method="batched_lm"
+    )
+
+    assert ds["success"].all()
+    np.testing.assert_allclose(ds["value"], expected["value"], rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(ds["rsquared"], expected["rsquared"], rtol=1e-6)
+
+
+def test_batched_lm_stalled(data_array):
+    model = LorentzianModel(prefix="p0_")
+    # no step can meet tolerances of zero, every pixel stalls
+    ds = data_array.fit(
+        model=model, output="dataset", method="batched_lm", ftol=0.0, xtol=0.0
+    )
+    assert not ds["success"].any()
+    assert np.isfinite(ds["value"]).all()
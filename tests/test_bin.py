@@ -28,3 +28,43 @@ def test_bin_accessor():
     assert binned_da.isel(x=-1, y=-1).values == pytest.approx(
         da.isel(x=-1, y=-1).values, rel=1e-2
     )
+
+
+def test_bin_mean():
+    rng = np.random.default_rng(seed=0)
+    data = rng.random((10, 21))
+    coords = {"x": np.arange(10.0), "y": np.arange(21.0)}
+    da = xr.DataArray(data, coords=coords, dims=["x", "y"])
+
+    binned = da.bin(method="mean", x=2, y=3)
+    assert binned.sizes == {"x": 5, "y": 7}
+    np.testing.assert_allclose(binned["x"], np.arange(5) * 2 + 0.5)
+    np.testing.assert_allclose(binned["y"], np.arange(7) * 3 + 1)
+    np.testing.assert_allclose(binned[0, 0], data[:2, :3].mean())
+
+    # counts are kept by sum, the remainder goes to a smaller last bin
+    binned, weights = da.bin(method="sum", boundary="pad", weights=True, x=4)
+    assert binned.sizes["x"] == 3
+    np.testing.assert_allclose(binned.sum("x"), da.sum("x"))
+    np.testing.assert_allclose(binned["x"], [1.5, 5.5, 8.5])
+    np.testing.assert_allclose(weights[:, 0], [0.5, 0.5, 1 / np.sqrt(2)])
+
+    binned, weights = da.bin(method="mean", weights=xr.full_like(da, 2.0), x=2)
+    np.testing.assert_allclose(weights, 2 * np.sqrt(2))
+
+    with pytest.raises(ValueError, match="coarsen"):
+        da.bin(method="mean", boundary="exact", x=3)
+
+
+def test_bin_dask():
+    pytest.importorskip("dask")
+    rng = np.random.default_rng(seed=0)
+    da = xr.DataArray(
+        rng.random((12, 8)),
+        coords={"x": np.arange(12.0), "y": np.arange(8.0)},
+        dims=["x", "y"],
+    )
+
+    binned = da.chunk(x=4).bin(method="mean", x=2, y=2)
+    assert binned.chunks is not None
+    xr.testing.assert_allclose(binned.compute(), da.bin(method="mean", x=2, y=2))
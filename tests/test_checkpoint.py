@@ -0,0 +1,106 @@
+import lmfit as lf
+import numpy as np
+import pytest
+from lmfit.models import ConstantModel, LorentzianModel
+
+from xrfit.checkpoint import _Checkpoint
+
+
+@pytest.fixture
+def fits(monkeypatch):
+    """Count the fits of every pixel and crash once `fail_after` is reached."""
+    state = {"n_fits": 0, "fail_after": None}
+    fit = lf.model.ModelResult.fit
+
+    def counting_fit(self, *args, **kws):
+        if state["fail_after"] is not None and state["n_fits"] >= state["fail_after"]:
+            raise RuntimeError("crash")
+        state["n_fits"] += 1
+        return fit(self, *args, **kws)
+
+    monkeypatch.setattr(lf.model.ModelResult, "fit", counting_fit)
+    return state
+
+
+def test_fit_resume(data_array, tmp_path, fits):
+    path = tmp_path / "fit"
+    model = LorentzianModel() + ConstantModel()
+    expected = data_array.fit(model=model)
+
+    fits.update(n_fits=0, fail_after=4)
+    with pytest.raises(RuntimeError):
+        data_array.fit(model=model, checkpoint=path, checkpoint_every=1)
+    assert np.load(path / "fit.n_done.npy") == 4
+
+    fits.update(n_fits=0, fail_after=None)
+    result = data_array.fit(model=model, checkpoint=path, resume=True)
+    assert fits["n_fits"] == 2
+    # the resumed run continues the completion order of the crashed one
+    order = np.load(path / "fit.order.npy")
+    assert sorted(order) == list(range(order.size))
+    assert isinstance(result.isel(y=0).item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        result.params.get("center"), expected.params.get("center")
+    )
+    ds = data_array.fit(model=model, checkpoint=path, resume=True, output="dataset")
+    assert fits["n_fits"] == 2
+    np.testing.assert_allclose(ds.params.get("center"), expected.params.get("center"))
+
+
+def test_fit_with_corr_resume(data_array, tmp_path, fits):
+    path = tmp_path / "corr"
+    model = LorentzianModel() + ConstantModel()
+    start_dict = {"y": 2}
+    expected = data_array.fit.fit_with_corr(model=model, start_dict=start_dict)
+
+    # the initial fit takes 6 fits, crash after 3 of the refits
+    fits.update(n_fits=0, fail_after=9)
+    with pytest.raises(RuntimeError):
+        data_array.fit.fit_with_corr(
+            model=model, start_dict=start_dict, checkpoint=path, checkpoint_every=1
+        )
+    assert np.load(path / "fit.n_done.npy") == data_array.sizes["y"]
+    assert np.load(path / "corr.n_done.npy") == 3
+
+    fits.update(n_fits=0, fail_after=None)
+    result = data_array.fit.fit_with_corr(model=model, checkpoint=path, resume=True)
+    assert fits["n_fits"] == 3
+    np.testing.assert_allclose(
+        result.params.get("center"), expected.params.get("center"), rtol=1e-6
+    )
+
+
+def test_checkpoint_flush(data_array, tmp_path):
+    path = tmp_path / "fit"
+    results = data_array.fit(model=LorentzianModel()).values
+    param_names = list(results[0].params.keys())
+    checkpoint = _Checkpoint(path, every=2)
+    checkpoint.stage("fit", results.size, param_names, [""] * len(param_names))
+    for i in range(2):
+        checkpoint.record("fit", i, results[i])
+    assert np.load(path / "fit.n_done.npy") == 2
+
+    # a flush only writes the rows completed since the previous one
+    value = np.load(path / "fit.value.npy", mmap_mode="r+")
+    value[0] = 42.0
+    value.flush()
+    for i in range(2, 4):
+        checkpoint.record("fit", i, results[i])
+    assert (np.load(path / "fit.value.npy")[0] == 42.0).all()
+
+    # rows written but not committed by a crashed flush are not done
+    order = np.load(path / "fit.order.npy", mmap_mode="r+")
+    order[4] = 4
+    order.flush()
+    resumed = _Checkpoint(path, resume=True)
+    np.testing.assert_array_equal(
+        resumed.done("fit"), [True, True, True, True, False, False]
+    )
+    resumed.stage("fit", results.size, param_names, [""] * len(param_names))
+    resumed.record("fit", 5, results[5])
+    resumed.flush()
+    np.testing.assert_array_equal(np.load(path / "fit.order.npy"), [0, 1, 2, 3, -1, 4])
+    np.testing.assert_allclose(
+        resumed.columns("fit")[0][5],
+        [results[5].params[name].value for name in param_names],
+    )
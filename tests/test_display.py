@@ -2,7 +2,7 @@ import lmfit as lf
 import numpy as np
 import pytest
 import xarray as xr
-from qtpy import QtWidgets
+from qtpy import QtCore, QtWidgets
 
 
 @pytest.fixture
@@ -27,6 +27,185 @@ def app(qtbot):
     return app
 
 
+def test_main_window_slider(qtbot, app, sample_data):
+    from xrfit.window import MainWindow
+
+    main_window = MainWindow(sample_data)
+    qtbot.addWidget(main_window)
+
+    # rapid slider events are coalesced into a single redraw
+    main_window.sliders[0].setValue(1)
+    main_window.sliders[0].setValue(0)
+    main_window.sliders[0].setValue(1)
+    index = (1,)
+    qtbot.waitUntil(
+        lambda: (
+            main_window.fit_stat_label.text()
+            == f"Current Fit Stat: {sample_data[index].item().rsquared}"
+        )
+    )
+    assert main_window.slider_labels[0].text() == "z: 1"
+    np.testing.assert_allclose(
+        main_window.curve.getData()[1], sample_data[index].item().best_fit
+    )
+    np.testing.assert_allclose(
+        main_window.data_curve.getData()[1], sample_data[index].item().data
+    )
+
+    main_window.fit_stat_dropdown.setCurrentText("nfev")
+    assert (
+        main_window.fit_stat_label.text()
+        == f"Current Fit Stat: {sample_data[index].item().nfev}"
+    )
+    main_window.close()
+
+
+def test_main_window_drag(qtbot, app, sample_data):
+    from xrfit.window import MainWindow
+
+    main_window = MainWindow(sample_data)
+    qtbot.addWidget(main_window)
+    redraws = []
+    main_window._redraw_timer.timeout.connect(lambda: redraws.append(1))
+
+    # slider events arriving faster than a frame still redraw while dragging
+    for i in range(40):
+        main_window.sliders[0].setValue(i % 2)
+        qtbot.wait(5)
+    assert len(redraws) > 0
+    main_window.close()
+
+
+def test_main_window_heatmap(qtbot, app):
+    from xrfit.window import MainWindow
+
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-5, 5, 50)
+    model = lf.models.LorentzianModel()
+    results = [
+        [
+            model.fit(
+                model.eval(x=x, amplitude=1, center=0, sigma=sigma)
+                + rng.normal(size=x.size) * 0.01,
+                model.make_params(amplitude=1, center=0, sigma=1),
+                x=x,
+            )
+            for sigma in [0.5, 1.0, 1.5]
+        ]
+        for _ in range(2)
+    ]
+    xarr = xr.DataArray(results, dims=["y", "z"])
+
+    main_window = MainWindow(xarr)
+    qtbot.addWidget(main_window)
+    np.testing.assert_allclose(
+        main_window.heatmap_image.image, xarr.assess.fit_stats("rsquared")
+    )
+
+    main_window.heatmap_dropdown.setCurrentText("param: sigma")
+    main_window.heatmap_dims[0].setCurrentText("z")
+    main_window.heatmap_dims[1].setCurrentText("-")
+    sigma = xarr.params.get("sigma").squeeze()
+    np.testing.assert_allclose(main_window.heatmap_image.image, sigma[:1].T)
+
+    # clicking a pixel moves the sliders there
+    main_window.show()
+    qtbot.waitExposed(main_window)
+    qtbot.wait(100)
+
+    class Click:
+        def scenePos(self):
+            return main_window.heatmap.vb.mapViewToScene(QtCore.QPointF(2.5, 0.5))
+
+    main_window._heatmap_clicked(Click())
+    assert main_window.slider_values == [0, 2]
+    main_window.close()
+
+
+def test_main_window_lazy(qtbot, app, monkeypatch):
+    pytest.importorskip("dask")
+    from xrfit.window import MainWindow
+
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-5, 5, 50)
+    model = lf.models.LorentzianModel()
+    data = xr.DataArray(
+        np.stack(
+            [
+                model.eval(x=x, amplitude=1, center=0, sigma=sigma)
+                for sigma in np.linspace(0.5, 1.5, 6)
+            ]
+        )
+        + rng.normal(size=(6, x.size)) * 0.01,
+        coords={"y": np.arange(6), "x": x},
+        dims=("y", "x"),
+    )
+    result = data.chunk(y=1).fit(model=model)
+
+    n_fits = [0]
+    fit = lf.model.ModelResult.fit
+
+    def counting_fit(self, *args, **kws):
+        n_fits[0] += 1
+        return fit(self, *args, **kws)
+
+    monkeypatch.setattr(lf.model.ModelResult, "fit", counting_fit)
+
+    # only the chunk of the initial pixel is computed
+    main_window = MainWindow(result)
+    qtbot.addWidget(main_window)
+    assert n_fits[0] == 1
+    main_window.update_fit_stat_label()
+    assert main_window.fit_stat_label.text().startswith("Current Fit Stat: 0.9")
+
+    main_window.heatmap_dropdown.setCurrentText("param: sigma")
+    np.testing.assert_allclose(
+        main_window.heatmap_image.image.squeeze(),
+        result.params.get("sigma").squeeze(),
+    )
+    main_window.close()
+
+
+def test_pixel_cache_lazy(monkeypatch):
+    pytest.importorskip("dask")
+    from xrfit.window import _PixelCache
+
+    x = np.linspace(-5, 5, 50)
+    model = lf.models.LorentzianModel()
+    data = xr.DataArray(
+        np.stack(
+            [
+                model.eval(x=x, amplitude=1, center=0, sigma=sigma)
+                for sigma in np.linspace(0.5, 1.5, 6)
+            ]
+        ),
+        coords={"y": np.arange(6), "x": x},
+        dims=("y", "x"),
+    )
+    result = data.chunk(y=3).fit(model=model)
+
+    n_fits = [0]
+    fit = lf.model.ModelResult.fit
+
+    def counting_fit(self, *args, **kws):
+        n_fits[0] += 1
+        return fit(self, *args, **kws)
+
+    monkeypatch.setattr(lf.model.ModelResult, "fit", counting_fit)
+
+    # every chunk is computed once, however its pixels are visited
+    pixels = _PixelCache(result, tolerance=1e-4)
+    pixels.get((1,))
+    assert n_fits[0] == 3
+    pixels.prefetch([(0,), (2,)])
+    pixels.prefetch([(3,), (4,), (5,)])
+    assert n_fits[0] == 6
+    np.testing.assert_allclose(
+        [pixels.get((i,))["model_result"].params["sigma"].value for i in range(6)],
+        result.params.get("sigma").squeeze(),
+    )
+
+
 # def test_display_accessor(qtbot, app, sample_data):
 # Create the MainWindow instance using the display accessor
 # main_window = sample_data.display(return_window=True)
@@ -0,0 +1,32 @@
+import lmfit as lf
+import numpy as np
+import pytest
+
+from xrfit.executor import _map_chunks
+
+x = np.linspace(0, 5, 50)
+
+
+def evaluate(model, values):
+    return model.eval(model.make_params(**values), x=x)
+
+
+@pytest.mark.parametrize(
+    ("model", "values"),
+    [
+        (lf.models.ConstantModel(prefix="c_"), {"c_c": 2.0}),
+        (lf.models.PolynomialModel(degree=2), {"c0": 1.0, "c1": 2.0, "c2": 3.0}),
+        (
+            lf.models.SplineModel(xknots=np.linspace(0, 5, 6), prefix="s_"),
+            {f"s_s{i}": float(i) for i in range(6)},
+        ),
+        (lf.models.ExpressionModel("a * x + b"), {"a": 2.0, "b": 1.0}),
+        (
+            lf.models.LorentzianModel() + lf.models.ConstantModel(),
+            {"amplitude": 1.0, "center": 2.0, "sigma": 0.5, "c": 0.1},
+        ),
+    ],
+)
+def test_map_chunks_local_functions(model, values):
+    (result,) = _map_chunks(evaluate, [(model, values)], n_workers=1)
+    np.testing.assert_allclose(result, evaluate(model, values))
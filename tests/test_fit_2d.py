@@ -1,7 +1,8 @@
 import lmfit as lf
 import numpy as np
+import pytest
 import xarray as xr
-from lmfit.models import LorentzianModel
+from lmfit.models import ConstantModel, LorentzianModel
 
 
 def get_test_data_2d():
@@ -61,3 +62,130 @@ def test_fit_2d():
     result.params.assign(center, "p0center")
     center = result.params.get("p0center")
     assert np.all(center == 0.0)
+
+
+def test_fit_2d_n_workers():
+    data = get_test_data_2d()
+
+    model = LorentzianModel(prefix="p0")
+    guess = data.fit.guess(model=model, n_workers=2)
+    assert guess.dims == ("y",)
+    assert isinstance(guess[0].item(), lf.Parameters)
+    composite_guess = data.fit.guess(
+        model=model + ConstantModel(prefix="c"), n_workers=2
+    )
+    assert "cc" in composite_guess[0].item()
+
+    result = data.fit(model=model, params=guess, n_workers=2)
+    expected = data.fit(model=model, params=guess)
+    assert result.dims == expected.dims
+    assert isinstance(result[0].item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        result.params.get("center"), expected.params.get("center")
+    )
+    np.testing.assert_allclose(
+        result.assess.fit_stats("rsquared"), expected.assess.fit_stats("rsquared")
+    )
+
+
+def test_fit_2d_dask():
+    dask = pytest.importorskip("dask")
+    data = get_test_data_2d()
+
+    model = LorentzianModel(prefix="p0")
+    result = data.chunk(y=3).fit(model=model)
+    assert result.chunks is not None
+
+    center = result.params.get("center")
+    rsquared = result.assess.fit_stats("rsquared")
+    best_fit = result.get_arr("best_fit")
+    assert center.chunks is not None
+    assert rsquared.chunks is not None
+    assert best_fit.chunks is not None
+
+    expected = data.fit(model=model)
+    np.testing.assert_allclose(center.compute(), expected.params.get("center"))
+    np.testing.assert_allclose(rsquared.compute(), expected.assess.fit_stats())
+    np.testing.assert_allclose(best_fit.compute(), expected.get_arr("best_fit"))
+
+    with dask.config.set(scheduler="processes"):
+        computed = result.compute()
+    assert isinstance(computed[0].item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        computed.params.get("center"), expected.params.get("center")
+    )
+
+
+def test_fit_2d_where():
+    data = get_test_data_2d()
+
+    model = LorentzianModel(prefix="p0") + LorentzianModel(prefix="p1")
+    result = data.fit(model=model)
+    rsquared = result.assess.fit_stats("rsquared")
+    worst = int(np.argmin(rsquared.values))
+
+    mask = xr.zeros_like(rsquared, dtype=bool)
+    mask[worst] = True
+    refit = data.fit(model=model, where=mask, previous=result)
+    assert refit.attrs["n_refit"] == 1
+    assert refit.attrs["n_reused"] == data.sizes["y"] - 1
+    assert refit.attrs["time_saved"] == pytest.approx(
+        refit.attrs["refit_time"] * (data.sizes["y"] - 1)
+    )
+    for i in range(data.sizes["y"]):
+        if i == worst:
+            assert refit[i].item() is not result[i].item()
+        else:
+            assert refit[i].item() is result[i].item()
+
+    # a predicate on the previous results, seeded from the given params
+    params = result.params.parse()
+    refit = data.fit(
+        model=model,
+        params=params,
+        where=lambda r: r.assess.fit_stats("rsquared") < 0,
+        previous=result,
+    )
+    assert refit.attrs["n_refit"] == 0
+    assert refit.attrs["time_saved"] == 0.0
+    refit = data.fit(
+        model=model,
+        params=params,
+        where=lambda r: r.assess.fit_stats("rsquared") <= rsquared.max(),
+        previous=result,
+        output="dataset",
+    )
+    assert isinstance(refit, xr.Dataset)
+    assert refit.attrs["n_reused"] == 0
+    assert np.all(refit["rsquared"] >= rsquared - 1e-6)
+
+    with pytest.raises(ValueError, match="previous"):
+        data.fit(model=model, where=mask)
+
+
+def test_fit_with_corr_iter_max():
+    data = get_test_data_2d()
+    model = LorentzianModel(prefix="p0") + LorentzianModel(prefix="p1")
+    with pytest.raises(ValueError, match="iter_max"):
+        data.fit.fit_with_corr(model=model, set_bound=True, iter_max=0)
+
+    result = data.fit.fit_with_corr(
+        model=model, start_dict={"y": 3}, set_bound=True, iter_max=1
+    )
+    assert isinstance(result[0].item(), lf.model.ModelResult)
+
+
+def test_fit_with_corr_2d_dask():
+    pytest.importorskip("dask")
+    data = get_test_data_2d()
+
+    model = LorentzianModel(prefix="p0")
+    initial = data.fit(model=model).params.get("center")
+    expected = data.fit.fit_with_corr(model=model, start_dict={"y": 3})
+    result = data.chunk(y=3).fit.fit_with_corr(model=model, start_dict={"y": 3})
+    assert result.chunks is None
+
+    # the refits land in the returned result
+    center = result.params.get("center")
+    assert not np.allclose(center, initial)
+    np.testing.assert_allclose(center, expected.params.get("center"), rtol=1e-5)
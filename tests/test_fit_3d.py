@@ -43,3 +43,111 @@ def test_fit_3d():
     result = data.fit.fit_with_corr(model=model, params=guess)
     assert isinstance(result, xr.DataArray)
     assert isinstance(result[0, 0].item(), lf.model.ModelResult)
+
+
+def test_fit_3d_along():
+    data = get_test_data_3d()
+    model = LorentzianModel()
+    start_dict = {"y": 0, "z": 1}
+
+    serial = data.fit.fit_with_corr(model=model, start_dict=start_dict, along="z")
+    assert serial.dims == ("y", "z")
+    parallel = data.fit.fit_with_corr(
+        model=model, start_dict=start_dict, along="z", n_workers=2
+    )
+    assert isinstance(parallel[1, 2].item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        parallel.params.get("sigma"), serial.params.get("sigma"), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        serial.params.get("sigma").squeeze(),
+        data.fit(model=model).params.get("sigma").squeeze(),
+        rtol=1e-3,
+    )
+
+
+def test_fit_3d_seed():
+    data = get_test_data_3d()
+    model = LorentzianModel()
+    start_dict = {"y": 1, "z": 1}
+
+    raster = data.fit.fit_with_corr(model=model, start_dict=start_dict)
+    assert raster.attrs["nfev"] > 0
+    for seed in ["neighbor", "mean", "best"]:
+        result = data.fit.fit_with_corr(
+            model=model, start_dict=start_dict, traversal="bfs", seed=seed
+        )
+        assert result.attrs["nfev"] > 0
+        np.testing.assert_allclose(
+            result.params.get("sigma"), raster.params.get("sigma"), rtol=1e-4
+        )
+
+    # the baseline walks copies of the initial fit in raster order
+    result = data.fit.fit_with_corr(
+        model=model,
+        start_dict=start_dict,
+        traversal="bfs",
+        seed="mean",
+        raster_baseline=True,
+    )
+    assert result.attrs["raster_nfev"] == raster.attrs["nfev"]
+    assert result.attrs["nfev_saved"] == raster.attrs["nfev"] - result.attrs["nfev"]
+    np.testing.assert_array_equal(
+        result.params.get("sigma"),
+        data.fit.fit_with_corr(
+            model=model, start_dict=start_dict, traversal="bfs", seed="mean"
+        ).params.get("sigma"),
+    )
+    raster = data.fit.fit_with_corr(
+        model=model, start_dict=start_dict, raster_baseline=True
+    )
+    assert raster.attrs["raster_nfev"] == raster.attrs["nfev"]
+    assert raster.attrs["nfev_saved"] == 0
+
+
+def test_fit_3d_pyramid():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    y, z = np.meshgrid(np.linspace(-1, 1, 12), np.linspace(-1, 1, 12), indexing="ij")
+    model = LorentzianModel()
+    data = xr.DataArray(
+        np.stack(
+            [
+                model.eval(x=x, amplitude=1, center=center, sigma=sigma)
+                for center, sigma in zip(
+                    (y + 0.5 * z).flat, (0.8 + 0.3 * y).flat, strict=True
+                )
+            ]
+        ).reshape(*y.shape, x.size)
+        + rng.normal(size=(*y.shape, x.size)) * 0.01,
+        coords={"y": y[:, 0], "z": z[0], "x": x},
+        dims=("y", "z", "x"),
+    )
+
+    expected = data.fit(model=model, output="dataset")
+    result = data.fit.pyramid(model=model, levels=2, output="dataset")
+    assert result["value"].dims == expected["value"].dims
+    np.testing.assert_allclose(result["value"], expected["value"], atol=1e-5)
+    np.testing.assert_allclose(result["rsquared"], expected["rsquared"], rtol=1e-8)
+    assert len(result.attrs["level_nfev"]) == 2
+    assert result.attrs["level_nfev"][-1] == result["nfev"].sum()
+    assert result.attrs["nfev"] == sum(result.attrs["level_nfev"])
+
+    # from a seed shared by all pixels, the coarse levels save evaluations in
+    # total over a direct fit
+    seeds = np.empty(y.shape, dtype=object)
+    for index in np.ndindex(seeds.shape):
+        seeds[index] = model.make_params(amplitude=1, center=0, sigma=1)
+    params = xr.DataArray(seeds, coords={"y": y[:, 0], "z": z[0]}, dims=("y", "z"))
+    direct = data.fit(model=model, params=params, output="dataset")
+    result = data.fit.pyramid(model=model, params=params, levels=2, output="dataset")
+    np.testing.assert_allclose(result["value"], direct["value"], atol=1e-5)
+    assert result.attrs["nfev"] < direct["nfev"].sum()
+
+    result = data.fit.pyramid(model=model, levels=3, dims=["y"])
+    assert isinstance(result[0, 0].item(), lf.model.ModelResult)
+    np.testing.assert_allclose(
+        result.params.get("center").squeeze("params_dim"),
+        expected["value"].sel(param="center"),
+        atol=1e-5,
+    )
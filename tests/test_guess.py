@@ -0,0 +1,58 @@
+import lmfit as lf
+import numpy as np
+import pytest
+import xarray as xr
+from lmfit.models import (
+    ConstantModel,
+    ExponentialModel,
+    LinearModel,
+    LorentzianModel,
+    VoigtModel,
+)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        LorentzianModel(prefix="p0_") + ConstantModel(prefix="c_"),
+        VoigtModel(prefix="p0_") + LinearModel(prefix="l_"),
+        ExponentialModel(prefix="e_") + LorentzianModel(prefix="p0_"),
+    ],
+)
+def test_guess_dataset(data_array, model):
+    expected = data_array.fit.guess(model=model)
+    ds = data_array.fit.guess(model=model, output="dataset")
+
+    assert isinstance(ds, xr.Dataset)
+    assert ds["value"].dims == ("y", "param")
+    params = ds.fit.to_parameters()
+    for i in range(data_array.sizes["y"]):
+        expected_params = expected.isel(y=i).item()
+        assert list(params.isel(y=i).item()) == list(expected_params)
+        for name, par in params.isel(y=i).item().items():
+            expected_par = expected_params[name]
+            np.testing.assert_allclose(par.value, expected_par.value, rtol=1e-10)
+            assert (par.min, par.max, par.vary) == (
+                expected_par.min,
+                expected_par.max,
+                expected_par.vary,
+            )
+            assert par.expr == expected_par.expr
+
+
+def test_fit_guess_dataset(data_array):
+    model = LorentzianModel(prefix="p0_")
+    guess = data_array.fit.guess(model=model, output="dataset")
+    assert isinstance(guess.fit.parameters(y=0), lf.Parameters)
+
+    result = data_array.fit(model=model, params=guess)
+    np.testing.assert_allclose(
+        result.params.get("center"),
+        data_array.fit(model=model).params.get("center"),
+    )
+    ds = data_array.fit(
+        model=model, params=guess, output="dataset", method="batched_lm"
+    )
+    np.testing.assert_allclose(
+        ds.params.get("center"), result.params.get("center"), rtol=1e-4
+    )
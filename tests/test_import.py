@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import xrfit
+
+
+def test_import_headless():
+    # fitting should not load Qt, OpenGL or matplotlib, e.g. in worker processes
+    code = (
+        "import sys\n"
+        "import xrfit\n"
+        "print(sorted({name.split('.')[0] for name in sys.modules} & "
+        "{'qtpy', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'pyqtgraph', "
+        "'OpenGL', 'matplotlib'}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_lazy_attributes():
+    assert xrfit.ModelResultWrapper.__name__ == "ModelResultWrapper"
+    assert xrfit.display.MainWindow.__name__ == "MainWindow"
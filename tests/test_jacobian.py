@@ -0,0 +1,130 @@
+import lmfit as lf
+import numpy as np
+import xarray as xr
+from lmfit.models import (
+    ConstantModel,
+    GaussianModel,
+    LinearModel,
+    LorentzianModel,
+    VoigtModel,
+)
+
+from xrfit.jacobian import _Jacobian, _untied, _with_jacobian
+
+
+def _finite_difference(model, params, data, x):
+    names = [name for name, par in params.items() if par.vary and not par.expr]
+    residual = model._residual(params, data, None, x=x)
+    jac = np.empty((x.size, len(names)))
+    for i, name in enumerate(names):
+        shifted = params.copy()
+        step = 1e-7 * max(abs(shifted[name].value), 1e-3)
+        shifted[name].value += step
+        shifted.update_constraints()
+        jac[:, i] = (model._residual(shifted, data, None, x=x) - residual) / step
+    return jac
+
+
+def test_jacobian():
+    x = np.linspace(-10, 10, 300)
+    data = np.zeros_like(x)
+    model = (
+        VoigtModel(prefix="v0")
+        + LorentzianModel(prefix="l0") * GaussianModel(prefix="g0")
+        - LinearModel()
+    ) / ConstantModel()
+    params = model.make_params(
+        v0amplitude=2,
+        v0center=-3,
+        v0sigma=0.7,
+        l0amplitude=1,
+        l0center=2,
+        l0sigma=1.2,
+        g0amplitude=3,
+        g0center=1,
+        g0sigma=2.5,
+        slope=0.1,
+        intercept=0.2,
+        c=1.5,
+    )
+    # constraints are differentiated through
+    params["l0sigma"].expr = "0.5 * g0sigma + v0sigma"
+    params.update_constraints()
+
+    jac = _Jacobian(model)(params, data, None, x=x)
+    expected = _finite_difference(model, params, data, x)
+    np.testing.assert_allclose(jac, expected, atol=1e-5 * np.abs(expected).max())
+
+    weights = np.linspace(1, 2, x.size)
+    np.testing.assert_allclose(
+        _Jacobian(model)(params, data, weights, x=x), jac * weights[:, None]
+    )
+
+
+def test_untied():
+    x = np.linspace(-10, 10, 300)
+    model = LorentzianModel(prefix="p0") + LorentzianModel(prefix="p1")
+    kws = _with_jacobian(model, {"x": x})
+    # identical components started from the same guess
+    params = model.make_params(
+        p0amplitude=2, p0center=0, p0sigma=3, p1amplitude=2, p1center=0, p1sigma=3
+    )
+    assert "Dfun" not in _untied(kws, params, x)["fit_kws"]
+    params["p1center"].set(value=1)
+    assert _untied(kws, params, x) is kws
+    custom = {"fit_kws": {"Dfun": None}}
+    assert _untied(custom, params, x) is custom
+
+
+def test_with_jacobian():
+    model = LorentzianModel()
+    assert isinstance(_with_jacobian(model, {})["fit_kws"]["Dfun"], _Jacobian)
+    assert _with_jacobian(model, {"method": "nelder"}) == {"method": "nelder"}
+    assert _with_jacobian(model, {"fit_kws": {"Dfun": None}}) == {
+        "fit_kws": {"Dfun": None}
+    }
+    custom = lf.Model(lambda x, a: a * x)
+    assert _with_jacobian(custom, {}) == {}
+
+
+def test_fit_jacobian():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    model = VoigtModel(prefix="p0") + VoigtModel(prefix="p1")
+    data = xr.DataArray(
+        np.stack(
+            [
+                model.eval(
+                    x=x,
+                    p0amplitude=1,
+                    p0center=-3,
+                    p0sigma=sigma,
+                    p0gamma=sigma,
+                    p1amplitude=2,
+                    p1center=3,
+                    p1sigma=sigma,
+                    p1gamma=sigma,
+                )
+                for sigma in [0.5, 0.8, 1.1]
+            ]
+        )
+        + rng.normal(size=(3, x.size)) * 0.01,
+        coords={"y": [0, 1, 2], "x": x},
+        dims=("y", "x"),
+    )
+    params = model.make_params(
+        p0amplitude=1, p0center=-2, p0sigma=1, p1amplitude=1, p1center=2, p1sigma=1
+    )
+    seeds = np.empty(3, dtype=object)
+    for i in range(3):
+        seeds[i] = params.copy()
+    params = xr.DataArray(seeds, dims=["y"])
+
+    result = data.fit(model=model, params=params)
+    expected = data.fit(model=model, params=params, fit_kws={"Dfun": None})
+    np.testing.assert_allclose(
+        result.params.get("p1sigma"), expected.params.get("p1sigma"), rtol=1e-5
+    )
+    assert (
+        result.assess.fit_stats("nfev").sum() < expected.assess.fit_stats("nfev").sum()
+    )
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from lmfit.models import (
+    ConstantModel,
+    GaussianModel,
+    LinearModel,
+    LorentzianModel,
+    VoigtModel,
+)
+
+from xrfit import kernels, lineshapes
+
+
+def _model_values():
+    model = (
+        LorentzianModel(prefix="l0")
+        + GaussianModel(prefix="g0") * ConstantModel()
+        - LinearModel()
+    ) / ConstantModel(prefix="n")
+    rng = np.random.default_rng(seed=0)
+    values = {
+        "l0amplitude": rng.uniform(1, 2, (2, 3, 1)),
+        "l0center": rng.uniform(-1, 1, (2, 3, 1)),
+        "l0sigma": rng.uniform(0.5, 1, (2, 3, 1)),
+        "g0amplitude": rng.uniform(1, 2, (3, 1)),
+        "g0center": np.array([0.5]),
+        # g0sigma and slope are left to their defaults
+        "c": rng.uniform(1, 2, (2, 3, 1)),
+        "intercept": 0.1,
+        "nc": np.array([2.0]),
+    }
+    return model, values
+
+
+def test_fused_eval():
+    model, values = _model_values()
+    x = np.linspace(-5, 5, 20)
+    assert kernels._is_fusable(model)
+    expected = lineshapes._eval(model, values, x)
+    # the kernel run by the interpreter, as compiled by numba where installed
+    fused = kernels._fused_eval(
+        model,
+        {name: np.atleast_1d(value) for name, value in values.items()},
+        x,
+        kernel=kernels._fused,
+    )
+    assert fused.shape == expected.shape == (2, 3, 20)
+    np.testing.assert_allclose(fused, expected, rtol=1e-12)
+
+
+def test_eval():
+    model, values = _model_values()
+    x = np.linspace(-5, 5, 20)
+    np.testing.assert_allclose(
+        kernels._eval(model, values, x), lineshapes._eval(model, values, x)
+    )
+
+    # other lineshapes are evaluated by numpy
+    voigt = VoigtModel() + ConstantModel()
+    assert not kernels._is_fusable(voigt)
+    values = {"amplitude": 1.0, "center": 0.0, "sigma": 1.0, "gamma": 0.5, "c": 0.1}
+    np.testing.assert_allclose(
+        kernels._eval(voigt, values, x), lineshapes._eval(voigt, values, x)
+    )
+
+
+def test_fused_kernel():
+    pytest.importorskip("numba")
+    model, values = _model_values()
+    x = np.linspace(-5, 5, 200)
+    np.testing.assert_allclose(
+        kernels._fused_eval(
+            model, {name: np.atleast_1d(value) for name, value in values.items()}, x
+        ),
+        lineshapes._eval(model, values, x),
+        rtol=1e-12,
+    )
+    # the interpreted kernel is left serial
+    assert kernels.prange is range
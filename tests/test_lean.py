@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import xarray as xr
+from lmfit.models import LorentzianModel
+
+
+def get_test_data():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    model = LorentzianModel()
+    data = np.stack(
+        [
+            np.stack(
+                [
+                    model.eval(x=x, amplitude=1, center=0.5 * (i - j), sigma=0.5 + i)
+                    for j in range(2)
+                ]
+            )
+            for i in range(3)
+        ]
+    )
+    return xr.DataArray(
+        data + rng.normal(size=data.shape) * 0.01,
+        coords={"y": np.arange(3), "z": np.arange(2), "x": x},
+        dims=("y", "z", "x"),
+    )
+
+
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_lean(n_workers):
+    data = get_test_data()
+    model = LorentzianModel()
+    result = data.fit(model=model, n_workers=n_workers)
+    lean = data.fit(model=model, n_workers=n_workers, lean=True)
+
+    before = result.fit.memory_report()
+    after = lean.fit.memory_report()
+    assert after["curves"] == 0
+    assert after["total"] < before["total"]
+
+    first, other = lean.values[0, 0], lean.values[2, 1]
+    assert first.userkws["x"] is other.userkws["x"]
+    assert not first.userkws["x"].flags.writeable
+    assert np.shares_memory(first.data, data.values)
+    assert not first.data.flags.writeable
+    assert data.values.flags.writeable
+
+    for name in ["best_fit", "init_fit", "residual"]:
+        np.testing.assert_allclose(
+            getattr(lean.values[1, 0], name), getattr(result.values[1, 0], name)
+        )
+    np.testing.assert_allclose(lean.get_arr("residual"), result.get_arr("residual"))
+
+    # refitting keeps the result lean
+    first.fit(params=first.params)
+    assert "best_fit" not in vars(first)
+    np.testing.assert_allclose(first.best_fit, result.values[0, 0].best_fit, rtol=1e-5)
+
+
+def test_lean_invalid():
+    data = get_test_data()
+    model = LorentzianModel()
+    with pytest.raises(ValueError, match="lean"):
+        data.fit(model=model, output="dataset", lean=True)
+    with pytest.raises(ValueError, match="lean"):
+        data.chunk({"y": 1}).fit(model=model, lean=True)
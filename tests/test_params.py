@@ -61,3 +61,103 @@ def test_sort(data_array):
     result = data_array.params.get(params_name="amplitude")
     assert result.size > 0  # Check if result is not empty
     assert result.shape == (2, 1)  # Check if sorting was applied
+
+
+def test_get_many():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    model = (
+        lf.models.LorentzianModel(prefix="p0_")
+        + lf.models.LorentzianModel(prefix="p1_")
+        + lf.models.ConstantModel()
+    )
+    params = model.make_params(
+        p0_amplitude=1, p0_center=-3, p0_sigma=1, p1_amplitude=1, p1_center=3, c=0
+    )
+    params["p1_sigma"].set(value=1, min=0)
+    results = [
+        model.fit(model.eval(params, x=x) + rng.normal(size=x.size) * 0.01, params, x=x)
+        for _ in range(3)
+    ]
+    data_array = xr.DataArray(results, dims=["z"])
+
+    center = data_array.params.get("center")
+    assert center.dims == ("z", "params_dim")
+    assert list(center["param"].values) == ["p0_", "p1_"]
+
+    table = data_array.params.get(["center", "c"], ["value", "stderr", "min"])
+    assert isinstance(table, xr.Dataset)
+    assert table["center"].dims == ("z", "attr", "params_dim")
+    assert list(table["param"].values) == ["p0_", "p1_", ""]
+    np.testing.assert_allclose(
+        table["center"].sel(attr="value").isel(params_dim=[0, 1]),
+        center,
+    )
+    np.testing.assert_allclose(
+        table["center"].sel(attr="stderr", params_dim=1),
+        [result.params["p1_center"].stderr for result in results],
+    )
+    assert np.isnan(table["center"].sel(attr="value", params_dim=2)).all()
+    np.testing.assert_allclose(
+        table["c"].sel(attr="value", params_dim=2),
+        [result.params["c"].value for result in results],
+    )
+
+    ds = data_array.fit.to_dataset()
+    xr.testing.assert_allclose(
+        ds.params.get(["center", "c"], ["value", "stderr", "min"]), table
+    )
+
+
+def test_assign_keeps_bounds(data_array):
+    data_array.params.set_bounds(bound_ratio=0.5)
+    bounds = data_array.params.get("sigma", ["min", "max"])
+    sigma = data_array.params.get("sigma")
+
+    data_array.params.assign(sigma * 1.1, "sigma")
+    np.testing.assert_allclose(data_array.params.get("sigma"), sigma * 1.1)
+    np.testing.assert_allclose(data_array.params.get("sigma", ["min", "max"]), bounds)
+
+    # values beyond the bounds widen them instead of being clipped
+    data_array.params.assign(sigma * 2, "sigma")
+    np.testing.assert_allclose(data_array.params.get("sigma"), sigma * 2)
+    np.testing.assert_allclose(data_array.params.get("sigma", "max"), sigma * 2)
+
+
+def test_table_update(data_array):
+    table = data_array.params.table()
+    assert table["value"].dims == ("z", "param")
+    np.testing.assert_allclose(
+        table["value"].sel(param="center"), data_array.params.get("center").squeeze()
+    )
+
+    table["min"].loc[{"param": "center"}] = 4.0
+    table["vary"].loc[{"param": "amplitude"}] = False
+    data_array.params.update(table)
+    for model_result in data_array.values:
+        assert model_result.params["center"].min == 4.0
+        assert not model_result.params["amplitude"].vary
+
+
+def test_sort_peaks():
+    x = np.linspace(-10, 10, 200)
+    model = lf.models.LorentzianModel(prefix="p0_") + lf.models.LorentzianModel(
+        prefix="p1_"
+    )
+    results = []
+    for center in [3.0, -3.0]:
+        params = model.make_params(
+            p0_amplitude=1, p0_center=center, p0_sigma=0.5, p1_center=-center
+        )
+        params["p1_amplitude"].set(value=2)
+        params["p1_sigma"].set(value=1, min=0)
+        results.append(model.fit(model.eval(params, x=x), params, x=x))
+    data_array = xr.DataArray(results, dims=["z"])
+
+    data_array.params.sort("center", ["center", "sigma"])
+    center = data_array.params.get("center")
+    np.testing.assert_allclose(center, [[-3.0, 3.0], [-3.0, 3.0]], atol=1e-6)
+    # the widths follow their peaks
+    np.testing.assert_allclose(
+        data_array.params.get("sigma"), [[1.0, 0.5], [0.5, 1.0]], atol=1e-6
+    )
@@ -0,0 +1,57 @@
+import lmfit as lf
+import numpy as np
+import xarray as xr
+from lmfit.models import GaussianModel, LorentzianModel
+
+
+def test_fit_dataset(data_array):
+    model = LorentzianModel(prefix="p0_") + GaussianModel(prefix="p1_")
+    guess = data_array.fit.guess(model=model)
+    ds = data_array.fit(model=model, params=guess, output="dataset")
+    result = data_array.fit(model=model, params=guess)
+
+    assert isinstance(ds, xr.Dataset)
+    assert ds["value"].dims == ("y", "param")
+    assert "p0_center" in ds["param"].values
+
+    np.testing.assert_allclose(ds.params.get("center"), result.params.get("center"))
+    assert list(ds.params.get("center")["param"].values) == ["p0_", "p1_"]
+    np.testing.assert_allclose(
+        ds.assess.fit_stats("rsquared"), result.assess.fit_stats("rsquared")
+    )
+    assert ds.assess.best_fit_stat() == result.assess.best_fit_stat()
+    for attr_name in ["best_fit", "init_fit", "residual", "data"]:
+        np.testing.assert_allclose(
+            ds.get_arr(attr_name), result.get_arr(attr_name), atol=1e-12
+        )
+
+    model_result = ds.fit.modelresult(y=1)
+    assert isinstance(model_result, lf.model.ModelResult)
+    assert model_result.nfev == result[1].item().nfev
+    np.testing.assert_allclose(model_result.best_fit, result[1].item().best_fit)
+    assert isinstance(ds.fit.to_dataarray()[0].item(), lf.model.ModelResult)
+
+
+def test_to_dataset(data_array):
+    model = LorentzianModel()
+    result = data_array.fit(model=model)
+    ds = result.fit.to_dataset()
+
+    np.testing.assert_allclose(ds.params.get("sigma"), result.params.get("sigma"))
+    np.testing.assert_allclose(ds["data"], data_array.transpose("y", "x"))
+    np.testing.assert_allclose(ds.get_arr("best_fit"), result.get_arr("best_fit"))
+
+
+def test_modelresult_residual(data_array):
+    model = LorentzianModel()
+    pixel = data_array.isel(y=1)
+    weights = np.linspace(0.5, 2.0, pixel.size)
+    expected = model.fit(pixel.values, x=pixel["x"].values, weights=weights)
+
+    ds = data_array.fit(
+        model=model,
+        weights=xr.DataArray(weights, dims=["x"]),
+        output="dataset",
+    )
+    model_result = ds.fit.modelresult(y=1)
+    np.testing.assert_allclose(model_result.residual, expected.residual, atol=1e-5)
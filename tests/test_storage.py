@@ -0,0 +1,62 @@
+import lmfit as lf
+import numpy as np
+import xarray as xr
+from lmfit.models import ConstantModel, LorentzianModel
+
+import xrfit
+
+
+class PeakModel(LorentzianModel):
+    pass
+
+
+def get_test_data():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-5, 5, 100)
+    y = np.linspace(1, 2, 4)
+    model = LorentzianModel() + ConstantModel()
+    return xr.DataArray(
+        model.eval(x=x, amplitude=1, center=0, sigma=0.5, c=0.1)[None, :] * y[:, None]
+        + rng.normal(size=(y.size, x.size)) * 0.01,
+        coords={"y": y, "x": x},
+        dims=("y", "x"),
+    )
+
+
+def test_save_open(tmp_path):
+    data = get_test_data()
+    model = LorentzianModel() + ConstantModel()
+    result = data.fit(model=model)
+    result.fit.save(tmp_path / "result.nc")
+
+    ds = xrfit.open_result(tmp_path / "result.nc")
+    assert isinstance(ds.attrs["model"], lf.model.CompositeModel)
+    assert isinstance(ds.attrs["model"].left, LorentzianModel)
+    assert isinstance(ds.attrs["model"].right, ConstantModel)
+    assert ds["vary"].dtype == bool
+    np.testing.assert_allclose(
+        ds["value"].sel(param="sigma"), result.params.get("sigma").squeeze()
+    )
+
+    model_result = ds.fit.modelresult(y=1)
+    expected = result[1].item()
+    assert isinstance(model_result, lf.model.ModelResult)
+    np.testing.assert_allclose(model_result.redchi, expected.redchi)
+    np.testing.assert_allclose(model_result.best_fit, expected.best_fit)
+
+    ds.fit.save(tmp_path / "again.nc")
+    again = xrfit.open_result(tmp_path / "again.nc")
+    xr.testing.assert_equal(again["value"], ds["value"])
+
+
+def test_save_open_custom_model(tmp_path):
+    data = get_test_data()
+    model = PeakModel(prefix="p_")
+    result = data.fit(model=model)
+    result.fit.save(tmp_path / "result.nc")
+
+    ds = xrfit.open_result(tmp_path / "result.nc")
+    assert ds.attrs["model"].prefix == "p_"
+    np.testing.assert_allclose(
+        ds.fit.modelresult(y=2).best_fit, result[2].item().best_fit
+    )
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+import xarray as xr
+from lmfit.models import LorentzianModel
+
+from xrfit import Telemetry
+
+
+def get_test_data():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    y = np.arange(3)
+    z = np.arange(2)
+    model = LorentzianModel()
+    data = np.stack(
+        [
+            np.stack(
+                [
+                    model.eval(x=x, amplitude=1, center=0.5 * (i - j), sigma=0.5 + i)
+                    for j in z
+                ]
+            )
+            for i in y
+        ]
+    )
+    return xr.DataArray(
+        data + rng.normal(size=data.shape) * 0.01,
+        coords={"y": y, "z": z, "x": x},
+        dims=("y", "z", "x"),
+    )
+
+
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_telemetry(n_workers, capsys):
+    data = get_test_data()
+    model = LorentzianModel()
+    events = []
+    telemetry = Telemetry(progress=True, interval=0)
+    telemetry.register(lambda event, info: events.append((event, info)))
+
+    result = data.fit(model=model, n_workers=n_workers, telemetry=telemetry)
+    ds = telemetry.dataset
+    assert ds["nfev"].dims == ("y", "z")
+    np.testing.assert_array_equal(ds["nfev"], result.assess.fit_stats("nfev"))
+    assert (ds["wall_time"] > 0).all()
+    assert (ds["bound_iter"] == 0).all()
+    assert {"guess", "fit"} <= set(telemetry.stages)
+    assert ds.attrs["fit_time"] == telemetry.stages["fit"]
+
+    pixels = [info["index"] for event, info in events if event == "pixel"]
+    assert sorted(pixels) == list(range(data[..., 0].size))
+    assert "6/6 pixels" in capsys.readouterr().out
+    # the timings are taken off the ModelResults once recorded
+    assert not hasattr(result.values.flat[0], "_telemetry")
+
+    # the instance adds up the calls it is passed to
+    table = data.fit(model=model, output="dataset", telemetry=telemetry)
+    assert isinstance(table, xr.Dataset)
+    np.testing.assert_array_equal(telemetry.dataset["nfev"], 2 * ds["nfev"])
+
+
+def test_telemetry_fit_with_corr(capsys):
+    data = get_test_data()
+    model = LorentzianModel()
+    events = []
+    telemetry = Telemetry(callbacks=[lambda *args: events.append(args)])
+
+    result = data.fit.fit_with_corr(
+        model=model, set_bound=True, iter_max=3, telemetry=telemetry
+    )
+    ds = telemetry.dataset
+    assert "corr" in telemetry.stages
+    assert (ds["bound_iter"] >= 1).all()
+    assert int(ds["nfev"].sum()) >= result.attrs["nfev"]
+    names = [event for event, _ in events]
+    assert "start_estimated" in names
+    assert {"bound_tol_reached", "bound_iter_max"} & set(names)
+    assert ("corr_done", {"nfev": result.attrs["nfev"]}) in events
+    assert capsys.readouterr().out == ""
+
+    with pytest.raises(ValueError, match="dask"):
+        data.chunk({"y": 1}).fit(model=model, telemetry=Telemetry())
+
+
+def test_fit_with_corr_dask_without_telemetry(capsys):
+    data = get_test_data().chunk({"y": 1})
+    result = data.fit.fit_with_corr(
+        model=LorentzianModel(), start_dict={"y": 0, "z": 0}
+    )
+    assert result.attrs["nfev"] > 0
+    assert capsys.readouterr().out == ""
+
+
+def test_fit_with_corr_messages(capsys):
+    data = get_test_data()
+    model = LorentzianModel()
+    # without telemetry, only the messages printed before there were events
+    result = data.fit.fit_with_corr(model=model, set_bound=True, iter_max=3)
+    out = capsys.readouterr().out
+    assert "⚡️ Estimate used :" in out
+    assert "iter_tol :  " in out
+    assert "nfev" not in out
+
+    data.fit.fit_with_corr(
+        model=model, start_dict={"y": 0, "z": 0}, telemetry=Telemetry(verbose=True)
+    )
+    assert "⚡️ fit_with_corr nfev :" in capsys.readouterr().out
+
+    data.fit(
+        model=model,
+        where=lambda r: r.assess.fit_stats("rsquared") < 0.5,
+        previous=result,
+    )
+    assert capsys.readouterr().out == ""